@@ -1,41 +1,61 @@
 # backend/app.py
 from __future__ import annotations
-import os, re, json, random, string
-import requests
+import os, re, json, random, string, base64, gzip, hmac, threading, time, atexit
 from datetime import datetime, timezone 
 from typing import Any, Dict, List, Tuple
 
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from ml.pre_llm_filter_functions import ParsingFunctionsPreLLM
-from ml.cover_letter_generator import CoverLetterGenerator
+from ml import docx_extractor
+from ml.cover_letter_generator import CoverLetterGenerator, context_cache
+from ml.lazy import lazy_module, snapshot as lazy_snapshot, warm as warm_imports
+from ml.resilience import CircuitOpenError, add_observer, get_caller, snapshot_all
+from backend import metrics
+from backend.profiling import profiler
+from backend.conversations import clipped_transcript, store as conversations, transcript
+from backend.rate_limit import limiter
+from backend.singleflight import adzuna_flight, gemini_flight, make_key
+from backend.json_provider import FastJSONProvider
+from backend.job_catalog import SORTS, memory_catalog, mysql_search
+from backend.search_cache import query_class, search_cache, search_key
+from backend.catalog_refresher import refresher
+from backend.job_dedup import closest, dedup_index, fingerprint, simhash
+from backend.auth_tokens import TokenCache
+from backend.memory_store import MemoryStore
+from backend.password_hasher import PoolSaturated, password_hasher
+from backend.uploads import BATCH_ENDPOINTS, DOCX, PDF, UPLOAD_MAX_BYTES, UploadRejected, UploadRequest, resolve_type, spooled
+from backend.skills import BASE_SKILLS, json_list, skill_extractor, skill_label, skill_match, term_vector
 
 from pathlib import Path
-import mammoth
-import pdfplumber
-from io import BytesIO
 import html as _html
 
-from flask import Flask, request, jsonify, make_response
+from flask import Flask, g, request, jsonify, make_response
 from flask_cors import CORS
 from dotenv import load_dotenv
 
-# Optional MySQL
-import mysql.connector
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import HTTPException
 
-# Gemini
-import google.generativeai as genai
-import bcrypt
-import jwt
-from datetime import timedelta
+try:  # optional: br is preferred over gzip when the client accepts it
+    import brotli
+except ImportError:
+    brotli = None
+
+# Heavy dependencies load on first use (ml/lazy.py); genai alone is ~0.5 s of import
+requests = lazy_module("requests")
+mammoth = lazy_module("mammoth")
+mysql_connector = lazy_module("mysql.connector")  # optional MySQL
+genai = lazy_module("google.generativeai")  # Gemini
 
 # -----------------------------
 # Env & app
 # -----------------------------
 load_dotenv()
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+# multipart files stream into hashed, size-bounded spools (backend/uploads.py)
+app.request_class = UploadRequest
 
 # Config: allow configuring how many characters of job description to return
 JOB_DESCRIPTION_MAX_CHARS = int(os.getenv("JOB_DESCRIPTION_MAX_CHARS", "2000"))
@@ -61,10 +81,12 @@ if not origins:
 JWT_SECRET = os.getenv("JWT_SECRET", "super-secret-key")
 JWT_ALGO = "HS256"
 JWT_EXPIRE_MINUTES = 30     # access token duartion
+# verified token -> claims, until each token's exp
+token_cache = TokenCache(JWT_SECRET, JWT_ALGO, max_entries=int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024")))
 
 @app.errorhandler(413)
 def too_large(e):
-    return bad("File too large (max 5MB)", 413)
+    return bad(f"File too large (max {(request.max_content_length or 0) // (1024 * 1024)}MB)", 413)
 
 @app.errorhandler(Exception)
 def handle_uncaught(e):
@@ -75,6 +97,118 @@ def handle_uncaught(e):
 
 CORS(app, origins=origins, supports_credentials=True)
 
+# -----------------------------
+# Metrics (GET /metrics, see backend/metrics.py)
+# -----------------------------
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+def _route_label():
+    # the rule ("/api/resumes/<int:rid>"), not the path, so ids don't become series
+    return request.url_rule.rule if request.url_rule is not None else None
+
+
+if METRICS_ENABLED:
+    # registered before compress_json, so the timing includes compression (after_request runs in reverse)
+    @app.before_request
+    def start_request_metrics():
+        metrics.begin_request()
+
+    @app.after_request
+    def record_request_metrics(resp):
+        metrics.end_request(request.method, _route_label(), resp.status_code)
+        return resp
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        # only still pending when the response never got through after_request
+        metrics.end_request(request.method, _route_label(), 500)
+
+    add_observer(metrics.observe_upstream)
+
+# -----------------------------
+# Per-request profiling (opt-in, see backend/profiling.py)
+# -----------------------------
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+# rules the sample rate applies to (empty: every route); the X-Profile header works anywhere
+PROFILE_ROUTES = {r.strip() for r in os.getenv("PROFILE_ROUTES", "").split(",") if r.strip()}
+
+
+def _profile_requested() -> bool:
+    header = request.headers.get("X-Profile")
+    if header:
+        if PROFILE_TOKEN and hmac.compare_digest(header, PROFILE_TOKEN):
+            return True
+        user = _current_user()
+        return header == "1" and bool(user) and user.get("role") == "admin"
+    if PROFILE_SAMPLE_RATE > 0 and (not PROFILE_ROUTES or _route_label() in PROFILE_ROUTES):
+        return random.random() < PROFILE_SAMPLE_RATE
+    return False
+
+
+# also before compress_json, so compression is in the profile
+@app.before_request
+def start_request_profile():
+    if _profile_requested():
+        g.profile = profiler.start(f"{request.method} {_route_label() or request.path}")
+
+
+@app.after_request
+def finish_request_profile(resp):
+    session = g.pop("profile", None)
+    if session is not None:
+        name = profiler.stop(session)
+        if name:
+            resp.headers["X-Profile-Id"] = name
+    return resp
+
+
+@app.teardown_request
+def abandon_request_profile(exc):
+    # the response never got through after_request; keep what was sampled
+    session = g.pop("profile", None)
+    if session is not None:
+        profiler.stop(session)
+
+# -----------------------------
+# Response compression
+# -----------------------------
+JSON_COMPRESS_MIN_BYTES = int(os.getenv("JSON_COMPRESS_MIN_BYTES", "1024"))
+
+
+@app.after_request
+def compress_json(resp):
+    """gzip/br JSON bodies above JSON_COMPRESS_MIN_BYTES when the client accepts it."""
+    if (
+        resp.mimetype != "application/json"
+        or resp.status_code < 200 or resp.status_code >= 300
+        or resp.direct_passthrough
+        or "Content-Encoding" in resp.headers
+    ):
+        return resp
+    body = resp.get_data()
+    if len(body) < JSON_COMPRESS_MIN_BYTES:
+        return resp
+
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        resp.set_data(brotli.compress(body, quality=5))
+        resp.headers["Content-Encoding"] = "br"
+    elif accepted["gzip"]:
+        resp.set_data(gzip.compress(body, compresslevel=6))
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        return resp
+
+    resp.vary.add("Accept-Encoding")
+    etag, _ = resp.get_etag()
+    if etag:
+        # encoded bytes differ from the identity body the ETag was computed on
+        resp.set_etag(etag, weak=True)
+    return resp
+
 # -----------------------------
 # Gemini config
 # -----------------------------
@@ -82,7 +216,7 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 
 if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+    genai.after_import(lambda m: m.configure(api_key=GEMINI_API_KEY))
     app.logger.info(f"Gemini model set to {GEMINI_MODEL}")
 else:
     app.logger.warning("GEMINI_API_KEY not set; /api/chat will return an error")
@@ -91,17 +225,18 @@ else:
 # DB helpers (uses your global connection style, but with safe fallback)
 # -----------------------------
 USE_DB = all(os.getenv(k) for k in ["DB_HOST", "DB_USER", "DB_NAME"])
-_db = None
-_cursor = None
+# one connection per thread: request threads, asyncio.to_thread workers and the
+# background refresh threads each get their own, never a shared cursor
+_conn = threading.local()
 
 
 def get_db():
-    global _db, _cursor
     if not USE_DB:
         return None, None
     try:
-        if _db is None or not _db.is_connected():
-            _db = mysql.connector.connect(
+        db = getattr(_conn, "db", None)
+        if db is None or not db.is_connected():
+            db = mysql_connector.connect(
                 host=os.getenv("DB_HOST"),
                 user=os.getenv("DB_USER"),
                 password=os.getenv("DB_PASSWORD"),
@@ -109,8 +244,8 @@ def get_db():
                 autocommit=True,
                 use_pure=True,
             )
-            _cursor = _db.cursor(dictionary=True)
-        return _db, _cursor
+            _conn.db, _conn.cursor = db, metrics.TimedCursor(db.cursor(dictionary=True))
+        return _conn.db, _conn.cursor
     except Exception as e:
         app.logger.warning(f"MySQL unavailable, using memory store. Error: {e}")
         return None, None
@@ -123,8 +258,9 @@ def get_db():
 # Resume Upload Helpers
 # -----------------------------
 
-# Define a max file size of 5MB
-app.config["MAX_CONTENT_LENGTH"] = 5 * 1024 * 1024
+# Define a max file size (UPLOAD_MAX_MB, default 5MB; batch endpoints allow UPLOAD_BATCH_MAX_MB)
+app.config["MAX_CONTENT_LENGTH"] = UPLOAD_MAX_BYTES
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("UPLOAD_BATCH_MAX_FILES", "20"))
 
 # Only allow PDFs, Open XML, and TXT files 
 ALLOWED_MIME = {
@@ -133,41 +269,101 @@ ALLOWED_MIME = {
     "text/plain",
 }
 
-# *** CHANGE LATER IF NEEDED ***
-def _get_user_id():
+def _resolve_auth() -> Dict[str, Any] | None:
     """
-    Grab user id for the authenticated user.
+    Who is calling: {"user_id", "name", "role", "verified"} or None. `verified`
+    is True only for a valid JWT, not for the X-User-Id dev header.
     """
     # Prefer Authorization: Bearer <token> (JWT). Fall back to X-User-Id header (dev/testing).
     auth = request.headers.get("Authorization") or request.headers.get("authorization")
     if auth and auth.startswith("Bearer "):
         token = auth.split(None, 1)[1].strip()
-        try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGO])
-            uid = payload.get("user_id")
+        claims = token_cache.claims(token)
+        if claims is not None:
             try:
-                return int(uid) if uid is not None else None
+                uid = int(claims["user_id"])
             except Exception:
                 return None
-        except Exception:
-            # invalid token — fall back to X-User-Id below
-            pass
+            return {"user_id": uid, "name": claims.get("name"), "role": claims.get("role"), "verified": True}
+        # invalid token — fall back to X-User-Id below
 
     h = request.headers.get("X-User-Id")
     try:
-        return int(h) if h is not None else None
+        return {"user_id": int(h), "name": None, "role": None, "verified": False} if h is not None else None
     except Exception:
         return None
 
+
+@app.before_request
+def load_auth_context():
+    """Resolve the caller once per request; handlers read it via _get_user_id()/_current_user()."""
+    g.auth = _resolve_auth()
+
+
+def _current_user() -> Dict[str, Any] | None:
+    if "auth" not in g:
+        g.auth = _resolve_auth()
+    return g.auth
+
+
+def _get_user_id():
+    """
+    Grab user id for the authenticated user.
+    """
+    user = _current_user()
+    return user["user_id"] if user else None
+
+def _client_key():
+    """Rate-limit identity: the JWT-verified user, else the client IP."""
+    user = _current_user()
+    # X-User-Id is client-controlled: a new value per request would mean a fresh bucket each time
+    if user and user.get("verified"):
+        return f"user:{user['user_id']}"
+    # remote_addr only: X-Forwarded-For is client-controlled unless a proxy rewrites it
+    return f"ip:{request.remote_addr}"
+
 # -----------------------------
 # In-memory fallback store
 # -----------------------------
-MEM = {
-    "resumes": {},     # resume_id -> {"user_id":..., "text":..., "file_name":..., "name":..., "skills":[...]}
-    "jobs": {},        # job_id -> job dict
-    "next_resume_id": 1,
-    "next_job_id": 1,
-}
+# Bounded per collection (LRU by count and approximate bytes); see backend/memory_store.py
+_MEM_MAX_BYTES = int(os.getenv("MEM_MAX_MB_PER_COLLECTION", "64")) * 1024 * 1024
+MEM = MemoryStore(
+    {
+        "resumes": (int(os.getenv("MEM_MAX_RESUMES", "500")), _MEM_MAX_BYTES),  # resume_id -> {"user_id":..., "text":..., "file_name":..., "name":..., "skills":[...]}
+        "jobs": (int(os.getenv("MEM_MAX_JOBS", "5000")), _MEM_MAX_BYTES),       # job_id -> job dict
+        "job_keys": (int(os.getenv("MEM_MAX_JOBS", "5000")), _MEM_MAX_BYTES),   # (title, company, location, url) -> job_id
+        "users": (int(os.getenv("MEM_MAX_USERS", "10000")), _MEM_MAX_BYTES),    # user_id -> user row
+        "user_profiles": (int(os.getenv("MEM_MAX_USERS", "10000")), _MEM_MAX_BYTES),
+    },
+    {"job_recommendations": int(os.getenv("MEM_MAX_RECOMMENDATIONS", "1000"))},
+)
+
+
+def _forget_job(jid: int, _job: Dict[str, Any]) -> None:
+    """Evicted jobs leave the memory-mode search index and the repost index too."""
+    memory_catalog.delete(jid)
+    dedup_index.discard(jid)
+
+
+MEM["jobs"].on_evict = _forget_job
+
+# Set by backend/gunicorn.conf.py: the app is imported once in the master and
+# forked, so per-process startup (threads, snapshot saving) waits for init_worker()
+PREFORK = os.getenv("APP_PREFORK", "0") == "1"
+
+MEM_SNAPSHOT_PATH = os.getenv("MEM_SNAPSHOT_PATH", "")
+
+
+def _load_mem_snapshot() -> None:
+    if MEM.load(MEM_SNAPSHOT_PATH):
+        for jid, job in MEM["jobs"].items():
+            memory_catalog.upsert(jid, job)
+
+
+if MEM_SNAPSHOT_PATH and not USE_DB:
+    _load_mem_snapshot()
+    if not PREFORK:
+        atexit.register(MEM.save, MEM_SNAPSHOT_PATH)
 
 
 def _gen_id(prefix="J", n=6):
@@ -189,19 +385,11 @@ def _normalize_ws(s: str) -> str:
 
 
 # Simple skill extraction / scoring utilities
-_BASE_SKILLS = {
-    "python", "sql", "excel", "power bi", "tableau", "snowflake", "pandas", "numpy", "r",
-    "java", "javascript", "react", "node", "api", "rest", "fastapi", "flask",
-    "dashboards", "kpi", "etl", "data pipeline", "airflow", "docker", "kubernetes",
-    "git", "jira", "experimentation", "a b testing", "a/b testing", "statistics",
-    "forecast", "supply chain", "sap", "ibp", "ml", "machine learning", "genai",
-}
-
-
+# (job skills: the whole-word `skill_extractor` from backend/skills.py, run once per job at upsert)
 def _extract_resume_skills(text: str, user_list: List[str] | None = None) -> List[str]:
     text_l = text.lower()
     hits = []
-    for sk in _BASE_SKILLS.union({s.lower() for s in (user_list or [])}):
+    for sk in BASE_SKILLS.union({s.lower() for s in (user_list or [])}):
         if sk and sk in text_l:
             hits.append(sk)
     hits.sort(key=lambda k: text_l.find(k))
@@ -249,12 +437,16 @@ def _make_cover_letter(
         f"Thank you for your time and consideration.\nSincerely,\n{who}"
     )
 
-def _parse_pdf_with_pre_llm(content: bytes):
+def _parse_pdf_with_pre_llm(source):
     """
-    Use ParsingFunctionsPreLLM to get clean text + sections + contacts from PDF.
+    Use ParsingFunctionsPreLLM to get clean text + sections + contacts from PDF
+    (bytes or a seekable binary file object, e.g. a spooled upload).
     """
     parser = ParsingFunctionsPreLLM(path="<in-memory>")
-    raw_text = parser.extract_text_from_pdf_bytes(content)
+    if isinstance(source, (bytes, bytearray)):
+        raw_text = parser.extract_text_from_pdf_bytes(source)
+    else:
+        raw_text = parser.extract_text_from_pdf_file(source)
     cleaned_text = parser.clean_up_text(raw_text)
     sections = parser.define_sections(cleaned_text)
     contacts = parser.gather_contact_info_from_text(cleaned_text)
@@ -281,32 +473,77 @@ def _parse_plain_text_with_pre_llm(text: str):
         "contacts": contacts,
     }
 
-def _get_resume_record(resume_id: int):
-    """Fetch resume text, parsed sections, and parsed contacts."""
-    db, cursor = get_db()
-    if db:
+
+def _parse_docx_with_pre_llm(fileobj):
+    """
+    DOCX: paragraphs and their styles streamed from word/document.xml, with
+    heading styles used as section boundaries. mammoth is the fallback for
+    documents the streaming extractor can't read.
+    """
+    parser = ParsingFunctionsPreLLM(path="<in-memory>")
+    try:
+        paragraphs = docx_extractor.extract(fileobj)
+    except docx_extractor.DocxError as e:
+        app.logger.info(f"DOCX extractor fell back to mammoth: {e}")
+        fileobj.seek(0)
         try:
-            cursor.execute("""
-                SELECT id, user_id, resume_text, parsed_sections, parsed_contacts
-                FROM resumes WHERE id=%s
-            """, (resume_id,))
-            row = cursor.fetchone()
-            if row:
-                # Normalize database data into json for consistency
-                def _as_json(v):
-                    if v is None: return None
-                    if isinstance(v, (dict, list)): return v
-                    try: return json.loads(v)
-                    except Exception: return None
-                return {
-                    "resume_id": row["id"],
-                    "user_id": row.get("user_id"),
-                    "text": row.get("resume_text") or "",
-                    "sections": _as_json(row.get("parsed_sections")),
-                    "contacts": _as_json(row.get("parsed_contacts")),
-                }
+            raw = mammoth.extract_raw_text(fileobj).value or ""
         except Exception as e:
-            app.logger.exception(e)
+            raise UploadRejected("Could not read the DOCX file") from e
+        return _parse_plain_text_with_pre_llm(raw.strip())
+    raw_text = docx_extractor.to_text(paragraphs).strip()
+    cleaned_text = parser.clean_up_text(raw_text)
+    return {
+        "raw_text": raw_text,
+        "cleaned_text": cleaned_text,
+        "sections": parser.define_sections_from_paragraphs(paragraphs),
+        "contacts": parser.gather_contact_info_from_text(cleaned_text),
+    }
+
+
+_PARSE_FORMATS = {PDF: "pdf", DOCX: "docx", "text/plain": "text"}
+
+
+def _parse_resume_upload(f) -> Dict[str, Any]:
+    """
+    Parse an uploaded resume straight from its spooled file: the type comes
+    from the file's bytes (UploadRejected if not PDF/DOCX/TXT or not what the
+    client declared). Returns the parsed text/sections/contacts plus mime, size and sha256.
+    """
+    upload = spooled(f)
+    mime = resolve_type(f.mimetype, upload, ALLOWED_MIME)
+    with metrics.RESUME_PARSE_SECONDS.time(_PARSE_FORMATS[mime]):
+        if mime == PDF:
+            parsed = _parse_pdf_with_pre_llm(upload.open())
+        elif mime == DOCX:
+            parsed = _parse_docx_with_pre_llm(upload.open())
+        else:  # text/plain
+            parsed = _parse_plain_text_with_pre_llm(upload.text())
+    parsed.update(mime=mime, size=upload.size, sha256=upload.sha256)
+    return parsed
+
+_RESUME_RECORD_SQL = """
+    SELECT id, user_id, resume_text, parsed_sections, parsed_contacts
+    FROM resumes WHERE id=%s
+"""
+
+
+def _resume_record(resume_id: int, row: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Resume text, parsed sections and contacts from a _RESUME_RECORD_SQL row, else memory."""
+    if row:
+        # Normalize database data into json for consistency
+        def _as_json(v):
+            if v is None: return None
+            if isinstance(v, (dict, list)): return v
+            try: return json.loads(v)
+            except Exception: return None
+        return {
+            "resume_id": row["id"],
+            "user_id": row.get("user_id"),
+            "text": row.get("resume_text") or "",
+            "sections": _as_json(row.get("parsed_sections")),
+            "contacts": _as_json(row.get("parsed_contacts")),
+        }
 
     r = MEM["resumes"].get(resume_id) or {}
     return {
@@ -317,6 +554,19 @@ def _get_resume_record(resume_id: int):
         "contacts": r.get("parsed_contacts"),
     }
 
+
+def _get_resume_record(resume_id: int):
+    """Fetch resume text, parsed sections, and parsed contacts."""
+    db, cursor = get_db()
+    row = None
+    if db:
+        try:
+            cursor.execute(_RESUME_RECORD_SQL, (resume_id,))
+            row = cursor.fetchone()
+        except Exception as e:
+            app.logger.exception(e)
+    return _resume_record(resume_id, row)
+
     
 def _null_if_blank(v):
     """
@@ -388,10 +638,56 @@ def health():
         "time": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         "use_db": bool(db),
         "env": os.getenv("FLASK_ENV", "unknown"),
+        # breaker state, timeouts and fallback rates per upstream LLM
+        "llm": snapshot_all(),
+        # cached-context hits and prompt tokens saved per cover letter
+        "prompt_cache": context_cache.snapshot(),
+        "lazy_imports": lazy_snapshot(),
+        "rate_limits": limiter.snapshot(),
+        "single_flight": {"adzuna": adzuna_flight.snapshot(), "gemini": gemini_flight.snapshot()},
+        "password_hashing": password_hasher.snapshot(),
+        "auth_tokens": token_cache.snapshot(),
+        "memory_store": MEM.snapshot(),
+        "profiling": profiler.snapshot(),
     }
     return ok(info)
 
 
+def _cache_stats() -> Dict[str, Tuple[int, int, float]]:
+    """cache -> (hits, misses, hit ratio) from the cache snapshots."""
+    search, tokens, prompt = search_cache.snapshot(), token_cache.snapshot(), context_cache.snapshot()
+    return {
+        "search": (search["hits"] + search["stale_hits"], search["misses"], search["hit_rate"]),
+        "auth_tokens": (tokens["hits"], tokens["misses"], tokens["hit_rate"]),
+        "prompt_context": (prompt["cached_letters"], prompt["letters"] - prompt["cached_letters"], prompt["hit_rate"]),
+    }
+
+
+metrics.register_callback("jobhunter_cache_hits_total", "counter", "Cache hits (search includes stale hits).",
+                          ("cache",), lambda: {(k,): v[0] for k, v in _cache_stats().items()})
+metrics.register_callback("jobhunter_cache_misses_total", "counter", "Cache misses.",
+                          ("cache",), lambda: {(k,): v[1] for k, v in _cache_stats().items()})
+metrics.register_callback("jobhunter_cache_hit_ratio", "gauge", "Cache hit ratio since start.",
+                          ("cache",), lambda: {(k,): v[2] for k, v in _cache_stats().items()})
+metrics.register_callback("jobhunter_upstream_in_flight", "gauge", "Distinct Adzuna/Gemini calls in flight (single-flight leaders).",
+                          ("upstream",), lambda: {("adzuna",): adzuna_flight.snapshot()["in_flight"],
+                                                  ("gemini",): gemini_flight.snapshot()["in_flight"]})
+metrics.register_callback("jobhunter_password_hash_pending", "gauge", "Password hashes queued or running.",
+                          (), lambda: {(): password_hasher.snapshot()["pending"]})
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus text format; needs `Authorization: Bearer $METRICS_TOKEN` when that is set."""
+    if not METRICS_ENABLED:
+        return bad("Metrics are disabled", 404)
+    if METRICS_TOKEN and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {METRICS_TOKEN}"):
+        return bad("Unauthorized", 401)
+    resp = make_response(metrics.render())
+    resp.headers["Content-Type"] = metrics.CONTENT_TYPE
+    return resp
+
+
 # POST /api/resumes  JSON {"text": "...", "meta":{"name":"...", "skills":[...], "experience":"..."}}
 # or multipart 'file'
 @app.post("/api/resumes")
@@ -420,10 +716,9 @@ def upload_resume():
                 )
                 cursor.execute("SELECT LAST_INSERT_ID() AS id")
                 resume_id = cursor.fetchone()["id"]
-                # keep meta in memory even if DB does not have columns
+                # keep meta in memory even if DB does not have columns (the text is in the DB)
                 MEM["resumes"][resume_id] = {
                     "user_id": uid,
-                    "text": text_to_store,
                     "file_name": None,
                     "name": name,
                     "skills": u_skills,
@@ -433,8 +728,7 @@ def upload_resume():
             except Exception as e:
                 app.logger.exception(e)
 
-        rid = MEM["next_resume_id"]
-        MEM["next_resume_id"] += 1
+        rid = MEM.next_id("resume")
         MEM["resumes"][rid] = {
             "user_id": uid,
             "text": text_to_store,
@@ -450,32 +744,23 @@ def upload_resume():
         return bad("No file part. Use 'file' field for upload or send JSON with 'text'")
     file = request.files["file"]
     fname = secure_filename(file.filename or "resume.pdf")
-    mime = file.mimetype or ""
-    if mime not in ALLOWED_MIME:
-        return bad("Only PDF, DOCX, or TXT allowed")
-
-    content = file.read() or b""
-
-    parsed = None
-    if mime == "application/pdf":
-        parsed = _parse_pdf_with_pre_llm(content)
-        text = parsed["cleaned_text"]
-    elif mime == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        result = mammoth.extract_raw_text(BytesIO(content))
-        raw = (result.value or "").strip()
-        parsed = _parse_plain_text_with_pre_llm(raw)
-        text = parsed["cleaned_text"]
-    else:  # text/plain
-        raw = content.decode("utf-8", errors="ignore")
-        parsed = _parse_plain_text_with_pre_llm(raw)
-        text = parsed["cleaned_text"]
-
-    meta_blob = {}
-    if parsed:
-        meta_blob = {
-            "sections": parsed["sections"],
-            "contacts": parsed["contacts"],
-        }
+    try:
+        parsed = _parse_resume_upload(file)
+    except UploadRejected as e:
+        return bad(str(e))
+
+    rid = _store_uploaded_resume(db, cursor, uid, fname, parsed)
+    app.logger.info(f"Upload: name={fname}, mime={parsed['mime']}, size={parsed['size']}, sha256={parsed['sha256'][:12]}")
+    return ok({"resume_id": rid, "sha256": parsed["sha256"]})
+
+
+def _store_uploaded_resume(db, cursor, uid, fname: str, parsed: Dict[str, Any]) -> int:
+    """Insert a parsed upload into `resumes` (memory store if MySQL is off or the insert fails); returns its id."""
+    text = parsed["cleaned_text"]
+    meta_blob = {
+        "sections": parsed["sections"],
+        "contacts": parsed["contacts"],
+    }
 
     if db:
         try:
@@ -491,25 +776,12 @@ def upload_resume():
                 ),
             )
             cursor.execute("SELECT LAST_INSERT_ID() AS id")
-            resume_id = cursor.fetchone()["id"]
-
-            MEM["resumes"][resume_id] = {
-                "user_id": uid,
-                "text": text,
-                "file_name": fname,
-                "name": "",
-                "skills": [],
-                "experience": "",
-                "parsed_sections": meta_blob.get("sections"),
-                "parsed_contacts": meta_blob.get("contacts"),
-            }
-            return ok({"resume_id": resume_id})
+            return cursor.fetchone()["id"]
         except Exception as e:
             app.logger.exception(e)
 
     # memory fallback
-    rid = MEM["next_resume_id"]
-    MEM["next_resume_id"] += 1
+    rid = MEM.next_id("resume")
     MEM["resumes"][rid] = {
         "user_id": uid,
         "text": text,
@@ -519,11 +791,42 @@ def upload_resume():
         "experience": "",
         "parsed_sections": meta_blob.get("sections"),
         "parsed_contacts": meta_blob.get("contacts"),
+        "sha256": parsed["sha256"],
     }
+    return rid
+
+
+# POST /api/resumes/batch  multipart 'files' (repeated); allowed UPLOAD_BATCH_MAX_MB in total
+@app.post("/api/resumes/batch")
+def upload_resume_batch():
+    db, cursor = get_db()
+    uid = _get_user_id()
+
+    files = request.files.getlist("files")
+    if not files:
+        return bad("No files. Use repeated 'files' fields in form-data")
+    if len(files) > UPLOAD_BATCH_MAX_FILES:
+        return bad(f"At most {UPLOAD_BATCH_MAX_FILES} files per batch")
+
+    results = []
+    for f in files:
+        fname = secure_filename(f.filename or "resume")
+        try:
+            parsed = _parse_resume_upload(f)
+        except UploadRejected as e:
+            results.append({"file_name": fname, "error": str(e)})
+            continue
+        except Exception as e:
+            # a corrupt file fails on its own; the rest of the batch is still stored
+            app.logger.warning(f"Batch upload: could not parse {fname}: {e!r}")
+            results.append({"file_name": fname, "error": "Could not read this file"})
+            continue
+        rid = _store_uploaded_resume(db, cursor, uid, fname, parsed)
+        results.append({"file_name": fname, "resume_id": rid, "sha256": parsed["sha256"]})
+    return ok({"results": results})
 
-    app.logger.info(f"Upload: name={fname}, mime={mime}, size={len(content)}")
 
-    return ok({"resume_id": rid})
+BATCH_ENDPOINTS.add("upload_resume_batch")
 
 @app.get("/api/resumes")
 def resume_get_latest_meta():
@@ -553,12 +856,13 @@ def resume_get_latest_meta():
             "uploaded_at": (row["created_at"].isoformat() if row.get("created_at") else datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"))
         })
 
-    # Find most recent by insertion order.
-    if not MEM["resumes"]:
+    # Find most recent (ids only grow).
+    items = sorted(MEM["resumes"].items(), key=lambda kv: kv[0])
+    if not items:
         return bad("No resume", 404)
     # Prefer last created for the same user if present; else any last.
-    user_items = [(rid, r) for rid, r in MEM["resumes"].items() if r.get("user_id") == uid]
-    rid, r = (user_items[-1] if user_items else list(MEM["resumes"].items())[-1])
+    user_items = [(rid, r) for rid, r in items if r.get("user_id") == uid]
+    rid, r = (user_items[-1] if user_items else items[-1])
     return ok({
         "resume_id": rid,
         "name": r.get("file_name") or "pasted-text",
@@ -580,25 +884,11 @@ def resume_replace_existing(rid: int):
     if not f or not f.filename:
         return bad("Empty file")
 
-    mime = f.mimetype or ""
-    if mime not in ALLOWED_MIME:
-        return bad("Only PDF, DOCX, or TXT allowed")
-
-    content = f.read() or b""
-
-    parsed = None
-    if mime == "application/pdf":
-        parsed = _parse_pdf_with_pre_llm(content)
-        text = parsed["cleaned_text"]
-    elif mime == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        result = mammoth.extract_raw_text(BytesIO(content))
-        raw = (result.value or "").strip()
-        parsed = _parse_plain_text_with_pre_llm(raw)
-        text = parsed["cleaned_text"]
-    else:  # text/plain
-        raw = content.decode("utf-8", errors="ignore")
-        parsed = _parse_plain_text_with_pre_llm(raw)
-        text = parsed["cleaned_text"]
+    try:
+        parsed = _parse_resume_upload(f)
+    except UploadRejected as e:
+        return bad(str(e))
+    text = parsed["cleaned_text"]
 
     safe_name = secure_filename(f.filename)
 
@@ -618,8 +908,8 @@ def resume_replace_existing(rid: int):
             (
                 text,
                 safe_name,
-                json.dumps(parsed["sections"]) if parsed else None,
-                json.dumps(parsed["contacts"]) if parsed else None,
+                json.dumps(parsed["sections"]),
+                json.dumps(parsed["contacts"]),
                 rid,
                 uid,
             ),
@@ -637,16 +927,15 @@ def resume_replace_existing(rid: int):
             "uploaded_at": fresh["created_at"].isoformat()
         })
 
-    if rid not in MEM["resumes"] or MEM["resumes"][rid].get("user_id") != uid:
+    r = MEM["resumes"].get(rid)
+    if r is None or r.get("user_id") != uid:
         # Accept null user match in dev if uid is None and record has None
-        if not (rid in MEM["resumes"] and MEM["resumes"][rid].get("user_id") is None and uid is None):
+        if not (r is not None and r.get("user_id") is None and uid is None):
             return bad("Not found", 404)
-    MEM["resumes"][rid]["text"] = text
-    MEM["resumes"][rid]["file_name"] = safe_name
-
-    if parsed:
-        MEM["resumes"][rid]["parsed_sections"] = parsed["sections"]
-        MEM["resumes"][rid]["parsed_contacts"] = parsed["contacts"]
+    # store a new dict so the collection re-measures its size
+    r = dict(r, text=text, file_name=safe_name, sha256=parsed["sha256"],
+             parsed_sections=parsed["sections"], parsed_contacts=parsed["contacts"])
+    MEM["resumes"][rid] = r
 
     return ok({
         "resume_id": rid,
@@ -682,7 +971,7 @@ def resume_delete_existing(rid: int):
         return bad("Not found", 404)
     if not (r.get("user_id") == uid or (r.get("user_id") is None and uid is None)):
         return bad("Not found", 404)
-    del MEM["resumes"][rid]
+    MEM["resumes"].pop(rid, None)
     return "", 204
 
 @app.get("/api/resumes/<int:rid>/parsed")
@@ -855,6 +1144,31 @@ def _canonicalize_experience_input(s: str) -> str:
 # -----------------------------
 # Authentication endpoints
 # -----------------------------
+def _auth_busy(e: PoolSaturated):
+    resp = jsonify({"error": "Too many sign-in attempts right now, please retry shortly"})
+    resp.headers["Retry-After"] = str(max(1, int(e.retry_after + 0.999)))
+    return resp, 503
+
+
+def _rehash_password(user_row: Dict[str, Any], password: str) -> None:
+    """Re-hash at the current BCRYPT_ROUNDS after a successful login (best effort)."""
+    try:
+        new_hash = password_hasher.hash(password)
+    except Exception as e:
+        app.logger.info(f"Skipping password rehash: {e}")
+        return
+    db, cursor = get_db()
+    if db:
+        try:
+            cursor.execute("UPDATE users SET password_hash=%s WHERE id=%s", (new_hash, user_row["id"]))
+        except Exception as e:
+            app.logger.warning(f"Password rehash not saved: {e}")
+            return
+    else:
+        MEM["users"][user_row["id"]] = dict(user_row, password_hash=new_hash)
+    password_hasher.count_rehash()
+
+
 @app.post("/api/auth/register")
 def auth_register():
     data = request.get_json(force=True) or {}
@@ -882,15 +1196,16 @@ def auth_register():
             app.logger.exception(e)
 
     else:
-        MEM.setdefault("users", {})
         # case-insensitive check
         for u in MEM["users"].values():
             if (u.get("email") or "").lower() == email:
                 return bad("Email already registered", 409)
 
-    # Hash password with bcrypt
+    # Hash password with bcrypt (on the bounded hashing pool)
     try:
-        hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed = password_hasher.hash(password)
+    except PoolSaturated as e:
+        return _auth_busy(e)
     except Exception as e:
         app.logger.exception(e)
         return bad("Failed to hash password", 500)
@@ -913,19 +1228,15 @@ def auth_register():
             app.logger.exception(e)
             return bad("Failed to create user", 500)
     else:
-        uid = MEM.get("next_user_id", 1)
-        MEM["next_user_id"] = uid + 1
-        MEM.setdefault("users", {})
+        uid = MEM.next_id("user")
         MEM["users"][uid] = {"id": uid, "full_name": full_name, "email": email, "password_hash": hashed, "role": "jobseeker"}
         # create profile placeholder
-        MEM.setdefault("user_profiles", {})
         MEM["user_profiles"][uid] = {"user_id": uid}
         user_obj = {"user_id": uid, "name": full_name, "email": email, "role": "jobseeker"}
 
     # Issue JWT (7 day expiry)
     try:
-        exp = datetime.now(timezone.utc) + timedelta(days=7)
-        token = jwt.encode({"user_id": user_obj.get("user_id"), "exp": int(exp.timestamp())}, JWT_SECRET, algorithm=JWT_ALGO)
+        token = token_cache.issue(user_obj.get("user_id"), user_obj.get("name"), user_obj.get("role"))
     except Exception as e:
         app.logger.exception(e)
         return bad("Failed to create token", 500)
@@ -956,7 +1267,7 @@ def auth_login():
             app.logger.exception(e)
             return bad("Error during authentication", 500)
     else:
-        for uid, u in (MEM.get("users") or {}).items():
+        for uid, u in MEM["users"].items():
             if (u.get("email") or "").lower() == email:
                 user_row = u
                 stored = u.get("password_hash")
@@ -966,16 +1277,20 @@ def auth_login():
 
     # Verify password
     try:
-        if not stored or not bcrypt.checkpw(password.encode('utf-8'), stored.encode('utf-8')):
+        if not stored or not password_hasher.verify(password, stored):
             return bad("Invalid credentials", 401)
+    except PoolSaturated as e:
+        return _auth_busy(e)
     except Exception:
         return bad("Invalid credentials", 401)
 
+    if password_hasher.needs_rehash(stored):
+        _rehash_password(user_row, password)
+
     user_obj = {"user_id": user_row.get("id") or user_row.get("user_id"), "name": user_row.get("full_name") or user_row.get("full_name"), "email": user_row.get("email"), "role": user_row.get("role")}
 
     try:
-        exp = datetime.now(timezone.utc) + timedelta(days=7)
-        token = jwt.encode({"user_id": user_obj.get("user_id"), "exp": int(exp.timestamp())}, JWT_SECRET, algorithm=JWT_ALGO)
+        token = token_cache.issue(user_obj.get("user_id"), user_obj.get("name"), user_obj.get("role"))
     except Exception as e:
         app.logger.exception(e)
         return bad("Failed to create token", 500)
@@ -983,36 +1298,221 @@ def auth_login():
     return ok({"token": token, "user": user_obj})
 
 
-# POST /api/jobs/search { "inputs": ["https://...", "data analyst chicago", ...] }
-@app.post("/api/jobs/search")
-def jobs_search():
-    ## Read search inputs
-    data = request.get_json(force=True) or {}
-    query = (data.get("query") or "").strip()
-    location = (data.get("location") or "").strip()
-    # Optional filters (type and experience now provided by frontend)
-    job_type_filter = (data.get("type") or "").strip()
-    experience_filter = (data.get("experience") or "").strip()
-    page = int(data.get("page", 1))
-    # Enforce a single allowed page size for Adzuna results: 30 per user requirement
-    # Ignore any client-provided value and always request 30 results per page
-    results_per_page = 30
-    salary_min = data.get("salaryMin")
-    salary_max = data.get("salaryMax")
+# Response views for job lists. `summary` is what list UIs need; the detail
+# modal fetches the rest lazily from GET /api/jobs/<id>.
+JOB_VIEWS = {
+    "summary": (
+        "job_id", "title", "company", "location", "url", "description",
+        "salary_min", "salary_max", "category", "type", "experience_level", "posted_at",
+    ),
+    "detail": (
+        "job_id", "title", "company", "location", "url", "description", "full_description",
+        "salary_min", "salary_max", "category", "type", "experience", "experience_level", "posted_at",
+        "skills",
+    ),
+    "debug": None,  # everything, including the provider's `raw` object
+}
+
+
+def _shape_job(job: Dict[str, Any], view: str) -> Dict[str, Any]:
+    fields = JOB_VIEWS[view]
+    if fields is None:
+        return job
+    return {k: job.get(k) for k in fields}
+
+
+# request threads and the refresh/revalidation threads both ingest pages
+_remember_lock = threading.Lock()
+
+
+def _remember_job(job: Dict[str, Any], fp: str | None = None, sig: int | None = None) -> int:
+    """Memory mode: give a searched job a stable id so GET /api/jobs/<id> can serve its detail."""
+    key = (job.get("title"), job.get("company"), job.get("location"), job.get("url"))
+    ids = MEM["job_keys"]
+    # lookup-then-assign must be atomic or two threads give one job two ids
+    with _remember_lock:
+        jid = ids.get(key)
+        if jid is None and fp is not None:
+            # a repost under a new tracking url keeps the id of the original
+            jid = dedup_index.match(fp, sig)
+        if jid is None:
+            jid = MEM.next_id("job")
+        ids[key] = jid
+        MEM["jobs"][jid] = {k: v for k, v in job.items() if k != "raw"}
+        memory_catalog.upsert(jid, job)
+        if fp is not None:
+            dedup_index.add(fp, sig, jid)
+    return jid
+
+
+# Local catalog answers are used by source=hybrid while this fresh
+CATALOG_FRESH_SECONDS = int(os.getenv("CATALOG_FRESH_SECONDS", str(6 * 3600)))
+
+
+def _adzuna_posted_at(job: Dict[str, Any]) -> datetime | None:
+    """Adzuna's `created` ("2024-05-01T12:34:56Z") as a naive UTC datetime."""
+    created = job.get("created")
+    if not created:
+        return None
+    try:
+        return datetime.fromisoformat(str(created).replace("Z", "+00:00")).astimezone(timezone.utc).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _salary_range(lo, hi) -> str | None:
+    if lo is None and hi is None:
+        return None
+    return f"{int(lo) if lo is not None else ''}-{int(hi) if hi is not None else ''}"
 
-    if not query:
-        return bad("Provide 'query' as a non-empty string")
 
+def _catalog_row_to_job(row: Dict[str, Any]) -> Dict[str, Any]:
+    description = row.get("description") or ""
+    posted_at = row.get("posted_at")
+    return {
+        "job_id": row.get("job_id"),
+        "title": row.get("title"),
+        "company": row.get("company"),
+        "location": row.get("location"),
+        "url": row.get("url"),
+        "description": description[:JOB_DESCRIPTION_MAX_CHARS],
+        "full_description": description,
+        "salary_min": row.get("salary_min"),
+        "salary_max": row.get("salary_max"),
+        "category": row.get("category"),
+        "type": row.get("job_type") or "",
+        "experience": row.get("experience_level") or "unknown",
+        "experience_level": row.get("experience_level") or "unknown",
+        "posted_at": posted_at.isoformat() if isinstance(posted_at, datetime) else posted_at,
+        "skills": json_list(row.get("skills")),
+    }
+
+
+def _search_catalog(query: str, location: str, job_type: str, experience: str,
+                    salary_min, salary_max, page: int, per_page: int, sort: str = "relevance"):
+    """Search stored jobs (MySQL FULLTEXT, or the in-process FTS5 index in memory mode)."""
+    filters = dict(
+        location=location,
+        job_type=_canonicalize_type_input(job_type),
+        experience=_canonicalize_experience_input(experience),
+        salary_min=salary_min,
+        salary_max=salary_max,
+        page=page,
+        per_page=per_page,
+        sort=sort,
+    )
+    db, cursor = get_db()
+    if db:
+        try:
+            return mysql_search(cursor, query, **filters)
+        except Exception as e:
+            app.logger.warning(f"Local catalog search failed: {e}")
+            return [], 0, None
+    return memory_catalog.search(query, **filters)
+
+
+def _job_type_from_adzuna(job: Dict[str, Any], title: str, description: str) -> str:
+    """Normalized `type` label for one Adzuna result."""
+    # Normalize contract/type and include raw fields so clients can rely on a consistent `type` value
+    # Prefer Adzuna's structured contract fields when present. Only fall back to
+    # our heuristic `_normalize_contract_type` when Adzuna provides no useful value.
+    adz_contract_time = job.get("contract_time")
+    adz_contract_type = job.get("contract_type")
+    adz_type_raw = None
+    for k in ("type", "employment_type"):
+        v = job.get(k)
+        if v:
+            adz_type_raw = str(v).strip()
+            break
+
+    # Map common Adzuna contract_time values to our labels
+    if adz_contract_time:
+        act = str(adz_contract_time).lower()
+        if act in {"full_time", "full-time", "full time", "permanent", "fte"}:
+            job_type = "Full-time"
+        elif act in {"part_time", "part-time", "part time"}:
+            job_type = "Part-time"
+        elif act in {"contract", "temporary", "temp"}:
+            job_type = "Contract"
+        elif act in {"internship", "intern"}:
+            job_type = "Internship"
+        else:
+            # use fallback normalization on the raw value
+            job_type = _normalize_contract_type(job, title, description)
+    elif adz_contract_type:
+        # contract_type can be values like 'permanent' or 'contract'
+        act = str(adz_contract_type).lower()
+        if act in {"permanent", "permanent contract", "permanent-hire"}:
+            job_type = "Full-time"
+        elif act in {"contract", "temporary", "temp"}:
+            job_type = "Contract"
+        else:
+            job_type = _normalize_contract_type(job, title, description)
+    elif adz_type_raw:
+        # Map textual type/employment_type values
+        s = adz_type_raw.lower()
+        if re.search(r"(full[\s_-]*time|fte|permanent|full time|fulltime)", s):
+            job_type = "Full-time"
+        elif re.search(r"(part[\s_-]*time|part time|parttime)", s):
+            job_type = "Part-time"
+        elif re.search(r"(contract|temporary|temp|c2h|c2c|contract-to-hire|contract to hire)", s):
+            job_type = "Contract"
+        elif re.search(r"(intern(ship)?|intern)", s):
+            job_type = "Internship"
+        elif re.search(r"\bremote\b", s):
+            job_type = "Remote"
+        elif re.search(r"\bhybrid\b", s):
+            job_type = "Hybrid"
+        else:
+            job_type = str(adz_type_raw).replace("_", " ").replace("-", " ").title()
+    else:
+        # No Adzuna-provided type info — run our heuristic on title/description
+        job_type = _normalize_contract_type(job, title, description)
+    return job_type
+
+
+ADZUNA_API_BASE = os.getenv("ADZUNA_API_BASE", "https://api.adzuna.com/v1/api").rstrip("/")
+
+
+def _adzuna_get(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """GET an Adzuna search page; identical concurrent requests share one upstream call."""
+    def fetch():
+        with metrics.track_upstream("adzuna"):
+            res = requests.get(url, params=params, timeout=10)
+            res.raise_for_status()
+            return res.json()
+
+    key = make_key(url, {k: v for k, v in params.items() if k not in ("app_id", "app_key")})
+    return adzuna_flight.do(key, fetch, timeout=15)
+
+
+def _adzuna_search(query: str, location: str, job_type_filter: str, experience_filter: str,
+                   page: int, salary_min, salary_max, sort: str = "relevance",
+                   results_per_page: int = 30) -> Dict[str, Any]:
+    """
+    Fetch one Adzuna page, upsert its jobs into the catalog and build the
+    search response payload (results unshaped, with `raw`).
+    Raises ValueError for missing credentials, anything else for provider errors.
+    """
+    url, params = _adzuna_request(query, location, experience_filter, page, salary_min, salary_max,
+                                  sort, results_per_page)
+    return _ingest_adzuna_page(_adzuna_get(url, params), url, params, query, location, job_type_filter,
+                               experience_filter, page, salary_min, salary_max, sort, results_per_page)
+
+
+def _adzuna_request(query: str, location: str, experience_filter: str, page: int, salary_min, salary_max,
+                    sort: str, results_per_page: int) -> Tuple[str, Dict[str, Any]]:
+    """URL and query params for one Adzuna search page (ValueError without credentials)."""
     ## Load Adzuna credentials
     app_id = os.getenv("ADZUNA_APP_ID")
     app_key = os.getenv("ADZUNA_APP_KEY")
     country = os.getenv("ADZUNA_COUNTRY", "us")
 
     if not app_id or not app_key:
-        return bad("Missing Adzuna credentials")
+        raise ValueError("Missing Adzuna credentials")
 
     ## Build Adzuna request
-    url = f"https://api.adzuna.com/v1/api/jobs/{country}/search/{page}"
+    url = f"{ADZUNA_API_BASE}/jobs/{country}/search/{page}"
 
     # Build 'what' by appending textual qualifiers so Adzuna performs a best-effort filtered search.
     # NOTE: Do NOT append the client's `type` filter here — Appending literal labels
@@ -1039,22 +1539,24 @@ def jobs_search():
         params["salary_min"] = salary_min
     if salary_max:
         params["salary_max"] = salary_max
+    if sort != "relevance":
+        params["sort_by"] = {"newest": "date", "salary": "salary"}[sort]
+    return url, params
 
-    try:
-        res = requests.get(url, params=params, timeout=10)
-        res.raise_for_status()
-        data = res.json()
-    except Exception as e:
-        app.logger.exception(f"Adzuna API error: {e}")
-        return bad("Failed to fetch jobs from Adzuna")
 
+def _ingest_adzuna_page(data: Dict[str, Any], url: str, params: Dict[str, Any], query: str, location: str,
+                        job_type_filter: str, experience_filter: str, page: int, salary_min, salary_max,
+                        sort: str, results_per_page: int) -> Dict[str, Any]:
+    """Normalize, dedup and upsert the jobs of a fetched Adzuna page; returns the search payload."""
     ## Database connection
     db, cursor = get_db()
-    results, job_ids = [], []
+    results, rows = [], []
+    # near-duplicate detection (backend/job_dedup.py): fingerprint -> [(index, simhash)] on this page
+    page_sigs: Dict[str, List[Tuple[int, int]]] = {}
+    dupes_in_page = dupes_in_catalog = 0
 
     ## Iterate over each job result
     for job in data.get("results", []):
-        job_id = None
         title = job.get("title")
         company = job.get("company", {}).get("display_name")
         location_name = job.get("location", {}).get("display_name")
@@ -1071,87 +1573,26 @@ def jobs_search():
         # Infer experience level from title+description
         exp_text = f"{title or ''} {description or ''}"
         experience_level = extract_experience_level_helper(exp_text)
+        job_type = _job_type_from_adzuna(job, title, description)
+        posted_at = _adzuna_posted_at(job)
+
+        skills = skill_extractor.extract(title, description)
+        terms = term_vector(f"{title or ''} {description}")
+        fp, sig = fingerprint(title, company, location_name), simhash(description)
+        if closest(page_sigs.get(fp, ()), sig, dedup_index.max_distance) is not None:
+            # the same posting twice on one page (different tracking urls)
+            dupes_in_page += 1
+            continue
+        page_sigs.setdefault(fp, []).append((len(results), sig))
 
-        ## UPSERT (insert or update existing)
-        if db:
-            try:
-                cursor.execute(
-                    '''
-                    INSERT INTO jobs (title, company_name, industry, description, location, salary_range, source, url)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ON DUPLICATE KEY UPDATE
-                        description = VALUES(description),
-                        salary_range = VALUES(salary_range),
-                        posted_at = CURRENT_TIMESTAMP
-                    ''',
-                    (title, company, category, description, location_name, f"{salary_min}-{salary_max}", source, url_job)
-                )
-                cursor.execute("SELECT job_id FROM jobs WHERE title=%s AND company_name=%s AND location=%s AND url=%s",
-                               (title, company, location_name, url_job))
-                job_id = cursor.fetchone()["job_id"]
-                job_ids.append(job_id)
-            except Exception as e:
-                app.logger.warning(f"Job UPSERT failed: {e}")
-
-        # Normalize contract/type and include raw fields so clients can rely on a consistent `type` value
-        # Prefer Adzuna's structured contract fields when present. Only fall back to
-        # our heuristic `_normalize_contract_type` when Adzuna provides no useful value.
-        adz_contract_time = job.get("contract_time")
-        adz_contract_type = job.get("contract_type")
-        adz_type_raw = None
-        for k in ("type", "employment_type"):
-            v = job.get(k)
-            if v:
-                adz_type_raw = str(v).strip()
-                break
-
-        # Map common Adzuna contract_time values to our labels
-        if adz_contract_time:
-            act = str(adz_contract_time).lower()
-            if act in {"full_time", "full-time", "full time", "permanent", "fte"}:
-                job_type = "Full-time"
-            elif act in {"part_time", "part-time", "part time"}:
-                job_type = "Part-time"
-            elif act in {"contract", "temporary", "temp"}:
-                job_type = "Contract"
-            elif act in {"internship", "intern"}:
-                job_type = "Internship"
-            else:
-                # use fallback normalization on the raw value
-                job_type = _normalize_contract_type(job, title, description)
-        elif adz_contract_type:
-            # contract_type can be values like 'permanent' or 'contract'
-            act = str(adz_contract_type).lower()
-            if act in {"permanent", "permanent contract", "permanent-hire"}:
-                job_type = "Full-time"
-            elif act in {"contract", "temporary", "temp"}:
-                job_type = "Contract"
-            else:
-                job_type = _normalize_contract_type(job, title, description)
-        elif adz_type_raw:
-            # Map textual type/employment_type values
-            s = adz_type_raw.lower()
-            if re.search(r"(full[\s_-]*time|fte|permanent|full time|fulltime)", s):
-                job_type = "Full-time"
-            elif re.search(r"(part[\s_-]*time|part time|parttime)", s):
-                job_type = "Part-time"
-            elif re.search(r"(contract|temporary|temp|c2h|c2c|contract-to-hire|contract to hire)", s):
-                job_type = "Contract"
-            elif re.search(r"(intern(ship)?|intern)", s):
-                job_type = "Internship"
-            elif re.search(r"\bremote\b", s):
-                job_type = "Remote"
-            elif re.search(r"\bhybrid\b", s):
-                job_type = "Hybrid"
-            else:
-                job_type = str(adz_type_raw).replace("_", " ").replace("-", " ").title()
-        else:
-            # No Adzuna-provided type info — run our heuristic on title/description
-            job_type = _normalize_contract_type(job, title, description)
+        rows.append((title, company, category, description, location_name,
+                     _salary_range(job_salary_min, job_salary_max), source, url_job,
+                     job_type, experience_level, job_salary_min, job_salary_max, posted_at, fp, sig,
+                     json.dumps(skills), json.dumps(terms)))
 
         ## Return clean job JSON
         results.append({
-            "job_id": job_id,
+            "job_id": None,
             "title": title,
             "company": company,
             "location": location_name,
@@ -1166,9 +1607,112 @@ def jobs_search():
             # Provide both keys so frontend can consume either one
             "experience": experience_level,
             "experience_level": experience_level,
+            "posted_at": posted_at.isoformat() if posted_at else None,
+            # canonical skills and term weights, extracted once here (backend/skills.py)
+            "skills": skills,
+            "term_vector": terms,
             "raw": job,
         })
+        if not db:
+            known = dedup_index.match(fp, sig)
+            if known is not None and MEM["jobs"].get(known, {}).get("url") != url_job:
+                dupes_in_catalog += 1
+            results[-1]["job_id"] = _remember_job(results[-1], fp, sig)
+
+    ## Reposts of stored jobs (same fingerprint, near-identical description,
+    ## different url) update the stored row instead of adding another one
+    pending = list(zip(results, rows))
+    if db and pending:
+        try:
+            fps = sorted({r[13] for r in rows})
+            cursor.execute(
+                "SELECT job_id, url, fingerprint, simhash FROM jobs WHERE fingerprint IN ("
+                + ", ".join(["%s"] * len(fps)) + ")",
+                tuple(fps),
+            )
+            stored: Dict[str, List[Dict[str, Any]]] = {}
+            for r in cursor.fetchall():
+                stored.setdefault(r["fingerprint"], []).append(r)
+            new_rows, reposts = [], []
+            for result, row in pending:
+                candidates = stored.get(row[13], [])
+                match = None
+                if not any(c["url"] == row[7] for c in candidates):
+                    match = closest(((c["job_id"], c["simhash"]) for c in candidates), row[14],
+                                    dedup_index.max_distance)
+                if match is None:
+                    new_rows.append((result, row))
+                    continue
+                result["job_id"] = match
+                # description, salary_range, job_type .. posted_at, simhash, skills, term_vector
+                reposts.append((row[3], row[5], *row[8:13], *row[14:17], match))
+            dupes_in_catalog = len(reposts)
+            if reposts:
+                cursor.executemany(
+                    '''
+                    UPDATE jobs SET description = %s, salary_range = %s, job_type = %s, experience_level = %s,
+                                    salary_min = %s, salary_max = %s, posted_at = COALESCE(%s, posted_at),
+                                    simhash = %s, skills = %s, term_vector = %s, fetched_at = NOW()
+                    WHERE job_id = %s
+                    ''',
+                    reposts,
+                )
+            pending = new_rows
+        except Exception as e:
+            app.logger.warning(f"Job dedup lookup failed: {e}")
 
+    ## Bulk UPSERT (insert or update existing), then look the ids up in one query
+    if db and pending:
+        try:
+            cursor.executemany(
+                '''
+                INSERT INTO jobs (title, company_name, industry, description, location, salary_range, source, url,
+                                  job_type, experience_level, salary_min, salary_max, posted_at,
+                                  fingerprint, simhash, skills, term_vector, fetched_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                        %s, %s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE
+                    description = VALUES(description),
+                    salary_range = VALUES(salary_range),
+                    job_type = VALUES(job_type),
+                    experience_level = VALUES(experience_level),
+                    salary_min = VALUES(salary_min),
+                    salary_max = VALUES(salary_max),
+                    posted_at = COALESCE(VALUES(posted_at), posted_at),
+                    fingerprint = VALUES(fingerprint),
+                    simhash = VALUES(simhash),
+                    skills = VALUES(skills),
+                    term_vector = VALUES(term_vector),
+                    fetched_at = NOW()
+                ''',
+                [row for _, row in pending],
+            )
+            keys = [(row[0], row[1], row[4], row[7]) for _, row in pending]
+            cursor.execute(
+                "SELECT job_id, title, company_name, location, url FROM jobs "
+                "WHERE (title, company_name, location, url) IN ("
+                + ", ".join(["(%s, %s, %s, %s)"] * len(keys)) + ")",
+                tuple(v for k in keys for v in k),
+            )
+            # the unique key compares case-insensitively, so match the same way
+            fold = lambda k: tuple(str(v).casefold() if v is not None else None for v in k)
+            ids = {fold((r["title"], r["company_name"], r["location"], r["url"])): r["job_id"]
+                   for r in cursor.fetchall()}
+            for (result, _), k in zip(pending, keys):
+                result["job_id"] = ids.get(fold(k))
+            # a new job without a provider date is dated by its first fetch; an
+            # existing one kept its stored date through the COALESCE above
+            undated = [r["job_id"] for r, row in pending if row[12] is None and r["job_id"] is not None]
+            if undated:
+                cursor.execute(
+                    "UPDATE jobs SET posted_at = fetched_at WHERE posted_at IS NULL AND job_id IN ("
+                    + ", ".join(["%s"] * len(undated)) + ")",
+                    tuple(undated),
+                )
+        except Exception as e:
+            app.logger.warning(f"Job UPSERT failed: {e}")
+    job_ids = [r["job_id"] for r in results if r["job_id"] is not None] if db else []
+    dedup_index.record(len(data.get("results", [])), dupes_in_page, dupes_in_catalog)
 
     # Deterministic post-filtering: apply server-side filters for type and
     # experience so the returned result set strictly matches requested filters.
@@ -1198,9 +1742,7 @@ def jobs_search():
             # Build params without qualifiers (just the base query)
             params_no_qual = params.copy()
             params_no_qual["what"] = query
-            res2 = requests.get(url, params=params_no_qual, timeout=10)
-            res2.raise_for_status()
-            data2 = res2.json()
+            data2 = _adzuna_get(url, params_no_qual)
             unfiltered_total = data2.get("count", 0)
             filter_applied_but_no_results = True if (unfiltered_total and unfiltered_total > 0) else False
         except Exception as e:
@@ -1231,8 +1773,8 @@ def jobs_search():
     # (deterministic). Otherwise, return the raw results from Adzuna.
     results_to_return = post_filtered_results if want_label or want_exp else results
 
-    ## Return API response
-    return ok({
+    ## Response payload (unshaped; the caller applies the view)
+    return {
         "query": query,
         "location": location,
         "type": job_type_filter,
@@ -1253,38 +1795,233 @@ def jobs_search():
         "count": len(results_to_return),
         "persisted": len(job_ids),
         "job_ids": job_ids,
+        # reposts dropped from this page or merged into an already stored job
+        "duplicates_collapsed": dupes_in_page + dupes_in_catalog,
+        "sort": sort,
         "results": results_to_return,
+    }
+
+
+def _refresh_search(what: str, where: str) -> None:
+    """Refresher callback: re-fetch a popular search, upserting its jobs and re-warming the cache."""
+    payload = _adzuna_search(what, where, "", "", 1, None, None)
+    search_cache.put(search_key(what, where), payload)
+
+
+def start_background_jobs() -> None:
+    """Start this process's background threads (threads don't survive a fork)."""
+    if os.getenv("CATALOG_REFRESH_ENABLED", "0") == "1":
+        refresher.start(_refresh_search)
+
+
+if not PREFORK:
+    start_background_jobs()
+
+
+def _search_params(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated /api/jobs/search inputs (ValueError with the message for a 400)."""
+    query = (data.get("query") or "").strip()
+    location = (data.get("location") or "").strip()
+    # Optional filters (type and experience now provided by frontend)
+    job_type_filter = (data.get("type") or "").strip()
+    experience_filter = (data.get("experience") or "").strip()
+    page = int(data.get("page", 1))
+    # Enforce a single allowed page size for Adzuna results: 30 per user requirement
+    # Ignore any client-provided value and always request 30 results per page
+    results_per_page = 30
+    salary_min = data.get("salaryMin")
+    salary_max = data.get("salaryMax")
+    view = (data.get("view") or "summary").strip().lower()
+    # adzuna: provider only (default) | local: stored catalog only |
+    # hybrid: catalog when it has a fresh full page, else the provider
+    source = (data.get("source") or "adzuna").strip().lower()
+    sort = (data.get("sort") or "relevance").strip().lower()
+
+    if not query:
+        raise ValueError("Provide 'query' as a non-empty string")
+    if view not in JOB_VIEWS:
+        raise ValueError(f"'view' must be one of: {', '.join(JOB_VIEWS)}")
+    if source not in ("adzuna", "local", "hybrid"):
+        raise ValueError("'source' must be one of: adzuna, local, hybrid")
+    if sort not in SORTS:
+        raise ValueError(f"'sort' must be one of: {', '.join(SORTS)}")
+
+    return {
+        "query": query, "location": location, "type": job_type_filter, "experience": experience_filter,
+        "page": page, "results_per_page": results_per_page, "salary_min": salary_min,
+        "salary_max": salary_max, "view": view, "source": source, "sort": sort,
+        "key": search_key(query, location, job_type_filter, experience_filter, page, salary_min, salary_max, sort),
+        "cls": query_class(page, job_type_filter, experience_filter, salary_min, salary_max, sort),
+    }
+
+
+def _provider_args(p: Dict[str, Any]) -> Tuple[Any, ...]:
+    """_adzuna_search / _ingest_adzuna_page arguments for validated search params."""
+    return (p["query"], p["location"], p["type"], p["experience"], p["page"],
+            p["salary_min"], p["salary_max"], p["sort"], p["results_per_page"])
+
+
+def _local_search(p: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Response body from the stored catalog, or None when the provider should be asked."""
+    results_per_page = p["results_per_page"]
+    rows, total, newest = _search_catalog(
+        p["query"], p["location"], p["type"], p["experience"],
+        p["salary_min"], p["salary_max"], p["page"], results_per_page, p["sort"],
+    )
+    fresh = newest is not None and time.time() - newest < CATALOG_FRESH_SECONDS
+    if not (p["source"] == "local" or (fresh and len(rows) == results_per_page)):
+        return None
+    results = [_shape_job(_catalog_row_to_job(r), p["view"]) for r in rows]
+    return {
+        "query": p["query"],
+        "location": p["location"],
+        "type": p["type"],
+        "experience": p["experience"],
+        "page": p["page"],
+        "results_per_page": results_per_page,
+        "salary_min": p["salary_min"],
+        "salary_max": p["salary_max"],
+        # filters ran in SQL over the whole catalog, so this total is exact
+        "total_results": total,
+        "total_pages": (total + results_per_page - 1) // results_per_page,
+        "provider_total_results": None,
+        "filtered_total_results": total,
+        "unfiltered_total_results": None,
+        "filter_applied_but_no_results": False,
+        "count": len(results),
+        "persisted": 0,
+        "job_ids": [r.get("job_id") for r in rows],
+        "view": p["view"],
+        "sort": p["sort"],
+        "source": "local",
+        "results": results,
+    }
+
+
+def _provider_response(p: Dict[str, Any], payload: Dict[str, Any], cached: bool, age: float,
+                       stale: bool) -> Dict[str, Any]:
+    if p["cls"] == "plain":
+        refresher.track(p["query"], p["location"], fetched=not cached)
+    return {
+        **payload,
+        "results": [_shape_job(r, p["view"]) for r in payload["results"]],
+        "view": p["view"],
+        "source": "adzuna",
+        "cached": cached,
+        "stale": stale,
+        "cache_age_seconds": round(age, 1),
+    }
+
+
+def _revalidate_fetch(p: Dict[str, Any], client_key: str):
+    """Fetch for a stale-entry refresh; it spends the caller's Adzuna token, and fails (keeping the stale entry) without one."""
+    def fetch():
+        admitted, _ = limiter.check("adzuna", client_key)
+        if not admitted:
+            raise RuntimeError("over the Adzuna rate limit")
+        return _adzuna_search(*_provider_args(p))
+    return fetch
+
+
+# POST /api/jobs/search { "inputs": ["https://...", "data analyst chicago", ...] }
+# Only the paths that call Adzuna take a rate-limit token; catalog and cache hits are free.
+@app.post("/api/jobs/search")
+def jobs_search():
+    ## Read search inputs
+    try:
+        p = _search_params(request.get_json(force=True) or {})
+    except ValueError as e:
+        return bad(str(e))
+
+    if p["source"] != "adzuna":
+        local = _local_search(p)
+        if local is not None:
+            return ok(local)
+
+    key, cls = p["key"], p["cls"]
+    client_key = _client_key()
+
+    cached = search_cache.get(key)
+    if cached is None:
+        # nothing usable cached: this request waits for the provider
+        admitted, retry_after = limiter.check("adzuna", client_key)
+        if not admitted:
+            return limiter.rejection(retry_after)
+        try:
+            payload = _adzuna_search(*_provider_args(p))
+        except ValueError as e:
+            return bad(str(e))
+        except Exception as e:
+            app.logger.exception(f"Adzuna API error: {e}")
+            return bad("Failed to fetch jobs from Adzuna")
+        search_cache.put(key, payload, cls)
+        age, stale = 0.0, False
+    else:
+        payload, age, stale = cached
+        if stale:
+            # serve it now, refresh behind the response
+            search_cache.revalidate(key, _revalidate_fetch(p, client_key), cls)
+
+    ## Return API response
+    return ok(_provider_response(p, payload, cached is not None, age, stale))
+
+
+@app.get("/api/catalog/metrics")
+def catalog_metrics():
+    """Popular searches, their freshness and the refresher's quota use (admins or METRICS_TOKEN only)."""
+    # the refresher snapshot lists other users' search terms
+    user = _current_user()
+    is_admin = bool(user) and user.get("verified") and user.get("role") == "admin"
+    has_token = METRICS_TOKEN and hmac.compare_digest(request.headers.get("Authorization", ""),
+                                                      f"Bearer {METRICS_TOKEN}")
+    if not (is_admin or has_token):
+        return bad("Unauthorized", 401 if user is None else 403)
+    return ok({
+        "refresher": refresher.snapshot(),
+        "search_cache": search_cache.snapshot(),
+        "dedup": dedup_index.snapshot(),
     })
 
 
-# POST /api/recommend { "resume_id": int, "job_ids": [int] }
-@app.post("/api/recommend")
-def recommend():
-    data = request.get_json(force=True) or {}
-    resume_id = data.get("resume_id")
-    job_ids = data.get("job_ids", [])
+def _matching_jobs_query(ids: List[int]) -> Tuple[str, Tuple[int, ...]]:
+    return (
+        "SELECT job_id, title, company_name AS company, location, skills, "
+        "CASE WHEN skills IS NULL THEN description END AS description "
+        "FROM jobs WHERE job_id IN (" + ", ".join(["%s"] * len(ids)) + ")",
+        tuple(ids),
+    )
 
-    if not resume_id:
-        return bad("Missing 'resume_id'")
-    if not job_ids:
-        return bad("Provide non-empty 'job_ids' array")
 
-    # fetch resume text (from DB if available, else memory)
-    db, cursor = get_db()
-    resume_text = ""
-    candidate_name = ""
-    user_listed_skills: List[str] = []
+def _matching_jobs(ids: List[int], rows: List[Dict[str, Any]] | None) -> Dict[int, Dict[str, Any]]:
+    """Jobs keyed by id from _matching_jobs_query rows, or from memory when rows is None."""
+    if rows is not None:
+        return {r["job_id"]: dict(r, skills=json_list(r["skills"])) for r in rows}
+    found = {jid: MEM["jobs"].get(jid) for jid in ids}
+    return {jid: j for jid, j in found.items() if j is not None}
 
-    if db:
+
+def _jobs_for_matching(job_ids: List[Any]) -> Dict[int, Dict[str, Any]]:
+    """Title/company/location and precomputed skills of the given jobs (MySQL, else memory)."""
+    db, cursor = get_db()
+    ids = [j for j in job_ids if isinstance(j, int)]
+    if db and ids:
         try:
-            cursor.execute(
-                "SELECT resume_text FROM resumes WHERE id=%s", (resume_id,)
-            )
-            row = cursor.fetchone()
-            if row:
-                resume_text = row.get("resume_text") or ""
+            cursor.execute(*_matching_jobs_query(ids))
+            return _matching_jobs(ids, cursor.fetchall())
         except Exception as e:
-            app.logger.exception(e)
+            app.logger.warning(f"Loading jobs for matching failed: {e}")
+    return _matching_jobs(ids, None)
+
+
+_RESUME_TEXT_SQL = "SELECT resume_text FROM resumes WHERE id=%s"
+
+
+def _recommendations(resume_id: Any, job_ids: List[Any], db_resume_text: str,
+                     jobs: Dict[int, Dict[str, Any]]):
+    """Score the jobs against the resume (DB text, else the memory copy); returns a response."""
+    resume_text = db_resume_text
+    candidate_name = ""
+    user_listed_skills: List[str] = []
 
     if not resume_text:
         r = MEM["resumes"].get(resume_id, {})
@@ -1296,14 +2033,23 @@ def recommend():
         return bad("Resume not found")
 
     derived = _extract_resume_skills(resume_text, user_listed_skills)
+    # listed skills go through the extractor too, so "PowerBI" and "Python3" match "power bi" and "python"
+    listed = (skill_extractor.canonical(s) or " ".join(s.lower().split()) for s in user_listed_skills if isinstance(s, str))
+    resume_skills = set(skill_extractor.extract(resume_text)) | set(listed)
 
     results = []
     for jid in job_ids:
-        job = MEM["jobs"].get(jid)
+        job = jobs.get(jid)
         if not job:
             continue
-        score, gaps = _match_score(resume_text, job["skills"])
-        matched = [s for s in job["skills"] if s.lower() in resume_text.lower()] or derived[:3]
+        job_skills = job.get("skills")
+        if job_skills is None:
+            # stored before skills were extracted at upsert time
+            job_skills = skill_extractor.extract(job.get("title"), job.get("full_description") or job.get("description"))
+        # precomputed canonical skills on both sides: matching is a set intersection
+        score, matched_keys, gap_keys = skill_match(job_skills, resume_skills)
+        gaps = [skill_label(s) for s in gap_keys]
+        matched = [skill_label(s) for s in matched_keys] or derived[:3]
         bullets = _make_bullets(job["title"], job["company"], matched)
         cover = _make_cover_letter(
             candidate_name, job["title"], job["company"], matched, gaps
@@ -1326,6 +2072,33 @@ def recommend():
     return ok({"results": results})
 
 
+# POST /api/recommend { "resume_id": int, "job_ids": [int] }
+@app.post("/api/recommend")
+def recommend():
+    data = request.get_json(force=True) or {}
+    resume_id = data.get("resume_id")
+    job_ids = data.get("job_ids", [])
+
+    if not resume_id:
+        return bad("Missing 'resume_id'")
+    if not job_ids:
+        return bad("Provide non-empty 'job_ids' array")
+
+    # fetch resume text (from DB if available, else memory)
+    db, cursor = get_db()
+    resume_text = ""
+    if db:
+        try:
+            cursor.execute(_RESUME_TEXT_SQL, (resume_id,))
+            row = cursor.fetchone()
+            if row:
+                resume_text = row.get("resume_text") or ""
+        except Exception as e:
+            app.logger.exception(e)
+
+    return _recommendations(resume_id, job_ids, resume_text, _jobs_for_matching(job_ids))
+
+
 # POST /api/jobs/recommend { "job_title": "...", "skills": [...], "location": "..." }
 @app.post("/api/jobs/recommend")
 def job_recommend_mock():
@@ -1356,7 +2129,8 @@ def get_job(job_id: int):
     if db:
         try:
             cursor.execute(
-                "SELECT job_id, title, company_name AS company, description, location, url, salary_range, source, type FROM jobs WHERE job_id=%s",
+                "SELECT job_id, title, company_name AS company, description, location, url, salary_range, source, "
+                "job_type, experience_level, salary_min, salary_max, posted_at FROM jobs WHERE job_id=%s",
                 (job_id,),
             )
             row = cursor.fetchone()
@@ -1371,14 +2145,18 @@ def get_job(job_id: int):
                     "full_description": row.get("description") or "",
                     "url": row.get("url"),
                     "salary_range": row.get("salary_range"),
-                    "type": row.get("type") or "",
+                    "salary_min": row.get("salary_min"),
+                    "salary_max": row.get("salary_max"),
+                    "type": row.get("job_type") or "",
+                    "experience_level": row.get("experience_level") or "unknown",
+                    "posted_at": row["posted_at"].isoformat() if row.get("posted_at") else None,
                     "source": row.get("source"),
                 })
         except Exception as e:
             app.logger.exception(e)
 
     # memory fallback
-    j = MEM.get("jobs", {}).get(job_id)
+    j = MEM["jobs"].get(job_id)
     if j:
         return ok({
             "job_id": job_id,
@@ -1388,8 +2166,12 @@ def get_job(job_id: int):
             "description": (j.get("description") or "")[:JOB_DESCRIPTION_MAX_CHARS],
             "full_description": j.get("full_description") or j.get("description") or "",
             "url": j.get("url"),
-            "salary_range": j.get("salary_range"),
+            "salary_range": j.get("salary_range") or _salary_range(j.get("salary_min"), j.get("salary_max")),
+            "salary_min": j.get("salary_min"),
+            "salary_max": j.get("salary_max"),
             "type": j.get("type") or "",
+            "experience_level": j.get("experience_level") or "unknown",
+            "posted_at": j.get("posted_at"),
             "source": j.get("source") or "",
         })
 
@@ -1399,55 +2181,102 @@ def get_job(job_id: int):
 # -----------------------------
 # Chat endpoint for landing page
 # -----------------------------
-@app.post("/api/chat")
-def chat():
-    """Simple chat endpoint for the landing-page assistant."""
+_SUMMARY_PROMPT = (
+    "You keep the running summary of a chat between a job seeker and a career assistant. "
+    "Rewrite the summary so it also covers the new messages. Keep what matters for later turns: "
+    "the user's target roles, skills, experience, location and preferences, documents discussed, "
+    "decisions made and open questions. Plain text, at most {max_chars} characters.\n\n"
+    "Current summary:\n{summary}\n\nNew messages:\n{turns}\n\nUpdated summary:"
+)
+
+
+def _summarize_turns(summary: str, evicted: List[Dict[str, str]], max_chars: int) -> str:
+    """Conversation summarizer: Gemini folds older turns into the summary; clipped transcript if it can't."""
     if not GEMINI_API_KEY:
-        return bad("Gemini API key is not configured on the server")
+        return clipped_transcript(summary, evicted, max_chars)
+    caller = get_caller("gemini")
+    prompt = _SUMMARY_PROMPT.format(max_chars=max_chars, summary=summary or "(none yet)",
+                                    turns=transcript(evicted, clip=2000))
+    try:
+        response = caller.call(
+            genai.GenerativeModel(GEMINI_MODEL).generate_content,
+            prompt,
+            generation_config={"temperature": 0.0, "max_output_tokens": max(64, max_chars // 3)},
+            request_options={"timeout": caller.timeout_seconds},
+        )
+        text = (response.text or "").strip()
+    except Exception as e:
+        app.logger.info(f"Chat summary fell back to the clipped transcript: {e}")
+        caller.record_fallback()
+        return clipped_transcript(summary, evicted, max_chars)
+    return text[:max_chars] if text else clipped_transcript(summary, evicted, max_chars)
 
-    body = request.get_json(force=True) or {}
-    messages = body.get("messages") or []
+
+conversations.summarizer = _summarize_turns
+
+
+def _chat_turn(body: Dict[str, Any]):
+    """(conversation, message, prompt history) for a chat request; ValueError on bad input."""
     user_text = (body.get("message") or "").strip()
 
     if not user_text:
-        return bad("Missing 'message'")
+        raise ValueError("Missing 'message'")
+
+    uid = _get_user_id()
+    conv = None
+    if body.get("conversation_id"):
+        conv = conversations.get(str(body["conversation_id"]), uid)
+    if conv is None:
+        # unknown/expired id or first turn: start fresh
+        conv = conversations.create(uid, seed=(body.get("messages") or [])[-10:])
+
+    # Build prompt history: rolling summary + recent turns + new message
+    return conv, user_text, conversations.history(conv, user_text)
 
-    # Build prompt history
-    history = []
-    for m in messages[-10:]:
-        role = m.get("role", "user")
-        content = m.get("content", "")
-        history.append({"role": role, "parts": [content]})
 
-    history.append({"role": "user", "parts": [user_text]})
+def _chat_unavailable(caller):
+    caller.record_fallback()
+    resp, code = bad("Chat service temporarily unavailable", 503)
+    resp.headers["Retry-After"] = str(caller.breaker.retry_after())
+    return resp, code
+
+
+@app.post("/api/chat")
+@limiter.limit("gemini", key_func=_client_key)
+def chat():
+    """Simple chat endpoint for the landing-page assistant.
+
+    Body: {"conversation_id": "...", "message": "..."}. History lives on the
+    server; omit `conversation_id` to start a new conversation (a legacy
+    `messages` list, if sent, seeds it). The reply carries the id to reuse.
+    """
+    if not GEMINI_API_KEY:
+        return bad("Gemini API key is not configured on the server")
 
+    try:
+        conv, user_text, history = _chat_turn(request.get_json(force=True) or {})
+    except ValueError as e:
+        return bad(str(e))
+
+    caller = get_caller("gemini")
     try:
         model = genai.GenerativeModel(GEMINI_MODEL)
-        response = model.generate_content(history)
+        response = caller.call(
+            model.generate_content,
+            history,
+            request_options={"timeout": caller.timeout_seconds},
+        )
         reply = (response.text or "").strip()
+    except CircuitOpenError:
+        return _chat_unavailable(caller)
     except Exception as e:
         app.logger.exception(f"Gemini chat error: {e}")
         return bad("Chat service failed")
 
-    return ok({"reply": reply})
+    conversations.append(conv, user_text, reply)
+    return ok({"reply": reply, "conversation_id": conv.conversation_id})
 
 ## User Profile Endpoints (GET / PUT)
-def _get_current_user_id():
-    """Helper to extract the current user ID from headers (temporary mock auth).
-
-    NOTE: legacy helper — routes should prefer `_get_user_id()` which supports
-    Authorization: Bearer <token> (JWT) and falls back to X-User-Id. We keep this
-    function for backward compatibility but prefer `_get_user_id()` in new code.
-    """
-    uid = request.headers.get("X-User-Id")
-    if not uid:
-        return None
-    try:
-        return int(uid)
-    except ValueError:
-        return None
-
-
 @app.get("/api/users/me")
 def get_user_profile():
     """Fetch current user's profile data (names mapped for UI).
@@ -1579,6 +2408,116 @@ def update_user_profile():
         app.logger.exception(e)
         return bad("Error updating profile", 500)
 
+# -----------------------------
+# Saved / applied list helpers (keyset pagination + field projection)
+# -----------------------------
+SAVED_JOB_COLUMNS = {
+    "saved_job_id": "sj.saved_job_id",
+    "date_saved": "sj.date_saved",
+    "notes": "sj.notes",
+    "job_id": "j.job_id",
+    "title": "j.title",
+    "company_name": "j.company_name",
+    "location": "j.location",
+    "industry": "j.industry",
+    "salary_range": "j.salary_range",
+    "url": "j.url",
+    "source": "j.source",
+    "description": "j.description",
+}
+
+APPLIED_JOB_COLUMNS = {
+    "applied_id": "aj.applied_id",
+    "applied_at": "aj.applied_at",
+    "job_id": "j.job_id",
+    "title": "j.title",
+    "company_name": "j.company_name",
+    "location": "j.location",
+    "salary_range": "j.salary_range",
+    "url": "j.url",
+    "source": "j.source",
+}
+
+LIST_PAGE_MAX = 100
+
+
+def _encode_cursor(ts, row_id: int) -> str:
+    raw = json.dumps([ts.isoformat() if isinstance(ts, datetime) else str(ts), row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    """Returns (datetime, id) or None if the cursor is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts, row_id = json.loads(raw)
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception:
+        return None
+
+
+def _list_user_jobs(user_id: int, columns: Dict[str, str], from_sql: str,
+                    user_col: str, ts_key: str, id_key: str):
+    """
+    Shared body of the saved/applied list endpoints.
+
+    Query params:
+      fields=title,company_name,...  project columns (the ordering keys are always included)
+      limit=N&cursor=...             keyset page on (ts DESC, id DESC); the response is then
+                                     {"items": [...], "next_cursor": "..."|null}
+    Without limit/cursor the full list is returned as a plain array, as before.
+    Responses carry an ETag so unchanged lists answer If-None-Match with 304.
+    """
+    db, cursor = get_db()
+    if not db:
+        return ok([])
+
+    wanted = [f.strip() for f in (request.args.get("fields") or "").split(",") if f.strip()]
+    unknown = [f for f in wanted if f not in columns]
+    if unknown:
+        return bad(f"Unknown field(s): {', '.join(unknown)}")
+    keys = list(dict.fromkeys([ts_key, id_key] + wanted)) if wanted else list(columns)
+    select = ", ".join(f"{columns[k]} AS {k}" for k in keys)
+
+    paginate = "limit" in request.args or "cursor" in request.args
+    sql = f"SELECT {select} {from_sql} WHERE {user_col} = %s"
+    params: List[Any] = [user_id]
+
+    if request.args.get("cursor"):
+        after = _decode_cursor(request.args["cursor"])
+        if not after:
+            return bad("Invalid cursor")
+        ts_col, id_col = columns[ts_key], columns[id_key]
+        sql += f" AND ({ts_col} < %s OR ({ts_col} = %s AND {id_col} < %s))"
+        params += [after[0], after[0], after[1]]
+
+    sql += f" ORDER BY {columns[ts_key]} DESC, {columns[id_key]} DESC"
+    if paginate:
+        try:
+            limit = max(1, min(LIST_PAGE_MAX, int(request.args.get("limit", 20))))
+        except ValueError:
+            return bad("'limit' must be an integer")
+        sql += " LIMIT %s"
+        params.append(limit + 1)  # one extra row tells us whether there is a next page
+
+    cursor.execute(sql, tuple(params))
+    rows = cursor.fetchall()
+
+    if paginate:
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1][ts_key], rows[-1][id_key])
+        body = {"items": rows, "next_cursor": next_cursor}
+    else:
+        body = rows
+
+    resp = jsonify(body)
+    resp.headers["Cache-Control"] = "private, no-cache"
+    resp.add_etag()
+    return resp.make_conditional(request)
+
+
 # Saved Jobs endpoints
 @app.get("/api/users/me/saved-jobs")
 def get_saved_jobs():
@@ -1586,21 +2525,14 @@ def get_saved_jobs():
     if not user_id:
         return bad("Unauthorized", 401)
 
-    db, cursor = get_db()
-    if not db:
-        return ok([])
-
-    cursor.execute("""
-        SELECT sj.saved_job_id, sj.date_saved, sj.notes,
-               j.job_id, j.title, j.company_name, j.location,
-               j.industry, j.salary_range, j.url, j.source, j.description
-        FROM saved_jobs sj
-        JOIN jobs j ON sj.job_id = j.job_id
-        WHERE sj.user_id = %s
-        ORDER BY sj.date_saved DESC
-    """, (user_id,))
-    rows = cursor.fetchall()
-    return ok(rows)
+    return _list_user_jobs(
+        user_id,
+        SAVED_JOB_COLUMNS,
+        "FROM saved_jobs sj JOIN jobs j ON sj.job_id = j.job_id",
+        user_col="sj.user_id",
+        ts_key="date_saved",
+        id_key="saved_job_id",
+    )
 
 
 @app.post("/api/users/me/saved-jobs")
@@ -1627,7 +2559,7 @@ def save_job():
         """, (user_id, job_id, notes))
         db.commit()
         return ok({"message": "Job saved"})
-    except mysql.connector.IntegrityError:
+    except mysql_connector.IntegrityError:
         return bad("Job already saved", 409)
 
 
@@ -1673,7 +2605,7 @@ def apply_to_job():
 
         db.commit()
         return ok({"message": "Job marked as applied"})
-    except mysql.connector.IntegrityError:
+    except mysql_connector.IntegrityError:
         return bad("You already applied to this job", 409)
 
 @app.get("/api/users/me/applied-jobs")
@@ -1682,135 +2614,197 @@ def get_applied_jobs():
     if not user_id:
         return bad("Unauthorized", 401)
 
-    db, cursor = get_db()
+    return _list_user_jobs(
+        user_id,
+        APPLIED_JOB_COLUMNS,
+        "FROM applied_jobs aj JOIN jobs j ON aj.job_id = j.job_id",
+        user_col="aj.user_id",
+        ts_key="applied_at",
+        id_key="applied_id",
+    )
 
-    cursor.execute("""
-        SELECT aj.applied_id, aj.applied_at,
-            j.job_id, j.title, j.company_name, j.location,
-            j.salary_range, j.url, j.source
-        FROM applied_jobs aj
-        JOIN jobs j ON aj.job_id = j.job_id
-        WHERE aj.user_id = %s
-        ORDER BY aj.applied_at DESC
-    """, (user_id,))
 
-    return ok(cursor.fetchall())
+_LETTER_JOB_SQL = """
+  SELECT job_id, title, company_name, description, location, url
+  FROM jobs WHERE job_id=%s
+"""
 
+_PERSIST_LETTER_SQL = """
+    INSERT INTO job_recommendations
+      (user_id, job_id, match_score, generated_resume, generated_cover_letter, recommended_at)
+    VALUES
+      (%s, %s, %s, %s, %s, NOW())
+"""
 
-@app.post("/api/cover_letter")
-def generate_cover_letter_api():
+
+def _letter_request(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Cover-letter inputs from the request body; job fields may still be missing."""
+    job_obj = body.get("job") or {} #atleast job_id or job_obj should exist
+    # Pulls job data from payload 'job' as 1st priority and fall back on data from database
+    return {
+        "persist": body.get("persist", True),
+        "job_id": body.get("job_id"),
+        "job_board": job_obj.get("job_board") or None,
+        "resume_id": body.get("resume_id"),
+        "match_score": body.get("match_score"),
+        "candidate_name": (body.get("candidate_name") or "").strip(),
+        "contacts": None,
+        "sections": None,
+        "resume_text": "",
+        "user_id": _get_user_id(),
+        "title": job_obj.get("title"),
+        "company": job_obj.get("company") or job_obj.get("company_name"),
+        "description": job_obj.get("full_description") or job_obj.get("description"),
+        "location": job_obj.get("location"),
+        "url": job_obj.get("url"),
+    }
+
+
+def _letter_needs_job(req: Dict[str, Any]) -> bool:
+    return bool((not req["title"] or not req["company"] or not req["description"]) and req["job_id"])
+
+
+def _letter_fill_job(req: Dict[str, Any], row: Dict[str, Any] | None) -> None:
+    """Fill missing job fields from a _LETTER_JOB_SQL row, then from the in-memory store."""
+    if row:
+        req["title"] = req["title"] or row.get("title")
+        req["company"] = req["company"] or row.get("company_name")
+        req["description"] = req["description"] or row.get("description")
+        req["location"] = req["location"] or row.get("location")
+        req["url"] = req["url"] or row.get("url")
+    # fall back to in-memory store
+    if not req["description"]:
+        j = MEM["jobs"].get(req["job_id"])
+        if j:
+            req["title"] = req["title"] or j.get("title")
+            req["company"] = req["company"] or j.get("company")
+            req["description"] = req["description"] or j.get("description") or j.get("full_description")
+            req["location"] = req["location"] or j.get("location")
+            req["url"] = req["url"] or j.get("url")
+
+
+def _letter_fill_resume(req: Dict[str, Any], r: Dict[str, Any]) -> None:
+    req["resume_text"] = r.get("text") or ""
+    req["contacts"] = r.get("contacts")
+    req["sections"] = r.get("sections")
+    if r.get("user_id") is not None:
+        req["user_id"] = r.get("user_id")
+
+
+def _letter_gen_args(req: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(
+        contacts=req["contacts"],
+        sections=req["sections"],
+        tone="professional",
+        job_title=req["title"],
+        company=req["company"],
+        job_description=req["description"],
+        job_board=req["job_board"],
+    )
+
+
+def _letter_result(req: Dict[str, Any], cover_letter_text: str | None, use_gemini: bool):
     """
-    Generates a cover letter according to a resume and job listing input.
+    Template fallback when generation failed, then the response payload and
+    the job_recommendations row to store in MySQL (None when nothing is stored
+    there; memory mode records it here).
     """
-    body = request.get_json(force=True) or {}
-    persist = body.get("persist", True)
+    used_fallback = not cover_letter_text
+    if used_fallback:
+        # Template letter built from keyword overlap between resume and job text
+        job_skills = _extract_resume_skills(req["description"] or "")
+        _, gaps = _match_score(req["resume_text"], job_skills)
+        matched = [s for s in job_skills if s not in gaps]
+        cover_letter_text = _make_cover_letter(
+            req["candidate_name"] or (req["contacts"] or {}).get("name") or "",
+            req["title"] or "open",
+            req["company"] or "your company",
+            matched,
+            gaps,
+        )
+        if use_gemini:
+            get_caller("gemini").record_fallback()
 
-    job_id = body.get("job_id")
-    job_obj = body.get("job") or {} #atleast job_id or job_obj should exist
-    resume_id = body.get("resume_id")
-    match_score = body.get("match_score")
-    candidate_name = (body.get("candidate_name") or "").strip()
+    # Optionally persist to job_recommendations
+    persist_row = None
+    if req["persist"]:
+        if USE_DB and req["user_id"] and req["job_id"]:
+            match_score = req["match_score"]
+            persist_row = (
+                req["user_id"],
+                int(req["job_id"]),
+                float(match_score) if match_score is not None else None,
+                None,  # we don't generate resumes here, it happens in another function
+                cover_letter_text,
+            )
+        else:
+            # memory fallback
+            MEM.append("job_recommendations", {
+                "user_id": req["user_id"],
+                "job_id": req["job_id"],
+                "match_score": req["match_score"],
+                "generated_cover_letter": cover_letter_text,
+                "ts": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            })
 
-    contacts = None
-    sections = None
-    user_id_for_rec = _get_user_id()
+    return {
+        "cover_letter": cover_letter_text,
+        "resume_bullets": [],
+        "fallback": used_fallback,
+    }, persist_row
 
-    # Pulls job data from payload 'job' as 1st priority and fall back on data from database
-    title = job_obj.get("title")
-    company = job_obj.get("company") or job_obj.get("company_name")
-    description = job_obj.get("full_description") or job_obj.get("description")
-    location = job_obj.get("location")
-    url = job_obj.get("url")
 
-    if (not title or not company or not description) and job_id:
+@app.post("/api/cover_letter")
+@limiter.limit("gemini", key_func=_client_key)
+def generate_cover_letter_api():
+    """
+    Generates a cover letter according to a resume and job listing input.
+    """
+    req = _letter_request(request.get_json(force=True) or {})
+
+    if _letter_needs_job(req):
         db, cursor = get_db()
+        row = None
         if db:
             try:
-                cursor.execute("""
-                  SELECT job_id, title, company_name, description, location, url
-                  FROM jobs WHERE job_id=%s
-                """, (job_id,))
+                cursor.execute(_LETTER_JOB_SQL, (req["job_id"],))
                 row = cursor.fetchone()
-                if row:
-                    title = title or row.get("title")
-                    company = company or row.get("company_name")
-                    description = description or row.get("description")
-                    location = location or row.get("location")
-                    url = url or row.get("url")
             except Exception as e:
                 app.logger.exception(e)
-        # fall back to in-memory store
-        if not description:
-            j = MEM["jobs"].get(job_id)
-            if j:
-                title = title or j.get("title")
-                company = company or j.get("company")
-                description = description or j.get("description") or j.get("full_description")
-                location = location or j.get("location")
-                url = url or j.get("url")
-
-    if resume_id:
-        r = _get_resume_record(resume_id)
-        resume_text = r.get("text") or ""
-        contacts = r.get("contacts")
-        sections = r.get("sections")
-        if r.get("user_id") is not None:
-            user_id_for_rec = r.get("user_id")
+        _letter_fill_job(req, row)
+
+    if req["resume_id"]:
+        _letter_fill_resume(req, _get_resume_record(req["resume_id"]))
 
     # Generate the cover letter
     use_gemini = bool(GEMINI_API_KEY)
     cover_letter_text = None
-    resume_bullets = []
 
     if use_gemini:
+        gen_args = _letter_gen_args(req)
         try:
-            generator = CoverLetterGenerator()
-            cover_letter_text = generator.generate_cover_letter(
-                contacts=contacts,
-                sections=sections,
-                tone="professional",
-                job_title=title,
-                company=company,
-                job_description=description,
-                job_board=(job_obj.get("job_board") or None),
+            # double-clicks / duplicate tabs for the same letter share one generation
+            cover_letter_text = gemini_flight.do(
+                make_key("cover_letter", gen_args),
+                lambda: CoverLetterGenerator().generate_cover_letter(**gen_args),
+                timeout=get_caller("gemini").timeout_seconds + 5,
             )
+        except CircuitOpenError:
+            app.logger.info("Gemini circuit open, using template cover letter")
         except Exception as e:
             app.logger.exception(f"Gemini generation failed, falling back: {e}")
 
-    # Optionally persist to job_recommendations
-    if persist:
+    payload, persist_row = _letter_result(req, cover_letter_text, use_gemini)
+    if persist_row is not None:
         db, cursor = get_db()
-        if db and user_id_for_rec and job_id:
+        if db:
             try:
-                cursor.execute("""
-                    INSERT INTO job_recommendations
-                      (user_id, job_id, match_score, generated_resume, generated_cover_letter, recommended_at)
-                    VALUES
-                      (%s, %s, %s, %s, %s, NOW())
-                """, (
-                    user_id_for_rec,
-                    int(job_id),
-                    float(match_score) if match_score is not None else None,
-                    None,  # we don't generate resumes here, it happens in another function
-                    cover_letter_text,
-                ))
+                cursor.execute(_PERSIST_LETTER_SQL, persist_row)
                 db.commit()
             except Exception as e:
                 app.logger.exception(f"Failed to persist job_recommendation: {e}")
-        else:
-            # memory fallback
-            MEM.setdefault("job_recommendations", []).append({
-                "user_id": user_id_for_rec,
-                "job_id": job_id,
-                "match_score": match_score,
-                "generated_cover_letter": cover_letter_text,
-                "ts": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-            })
 
-    return ok({
-        "cover_letter": cover_letter_text,
-        "resume_bullets": resume_bullets
-    })
+    return ok(payload)
 
 
 @app.post("/api/ai/cover-letter")
@@ -1822,6 +2816,46 @@ def api_ai_cover_letter():
     # Delegate to the existing implementation which reads from request.json
     return generate_cover_letter_api()
 
+# -----------------------------
+# Prefork workers (backend/gunicorn.conf.py)
+# -----------------------------
+_WARM_UP_RESUME = (
+    "Jane Doe\njane@example.com  (555) 123-4567  linkedin.com/in/janedoe\n"
+    "EXPERIENCE\nData analyst: Python, SQL and Tableau dashboards; ETL with Airflow.\n"
+    "EDUCATION\nB.S. Statistics\nSKILLS\nPython, SQL, Excel, Power BI, machine learning\n"
+)
+
+
+def warm_up() -> Dict[str, Any]:
+    """
+    Import the lazy dependencies and run the resume parse and skill match once,
+    so a preloading master hands warm code to its workers.
+    """
+    started = time.perf_counter()
+    imports = warm_imports()
+    parsed = _parse_plain_text_with_pre_llm(_WARM_UP_RESUME)
+    skills = _extract_resume_skills(parsed["cleaned_text"])
+    term_vector(parsed["cleaned_text"])
+    _normalize_ws(_WARM_UP_RESUME)
+    return {"skills": len(skills), "imports": imports, "ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+def init_worker() -> None:
+    """Per-worker startup after a fork: own DB connection, memory snapshot, background threads."""
+    global _conn
+    # a connection opened before the fork would share its socket with every worker
+    _conn = threading.local()
+    if MEM_SNAPSHOT_PATH and not USE_DB:
+        # pick up what the worker this one replaces saved on exit
+        _load_mem_snapshot()
+        atexit.register(MEM.save, MEM_SNAPSHOT_PATH)
+    start_background_jobs()
+
+
+# pay the imports at startup instead of on the first request that needs them
+if os.getenv("WARM_IMPORTS", "0") == "1" and not PREFORK:
+    warm_up()
+
 # -----------------------------
 # Main
 # -----------------------------
@@ -0,0 +1,383 @@
+# backend/asgi.py
+"""
+ASGI entry point: async serving for the I/O-heavy routes.
+
+    uvicorn backend.asgi:app --host 0.0.0.0 --port 5001
+
+Under the WSGI server a request holds a worker thread for the whole Adzuna
+call (up to 10 s), Gemini generation (5-15 s) or MySQL round-trip, so a
+process serves as many requests at once as it has threads. Here these routes
+run as coroutines on one event loop and only occupy it while computing:
+
+- POST /api/jobs/search     Adzuna through httpx.AsyncClient
+- POST /api/cover_letter    Gemini through generate_content_async
+  (and /api/ai/cover-letter)
+- POST /api/chat            Gemini through generate_content_async
+- POST /api/recommend       MySQL through the aiomysql pool (backend/async_db.py)
+
+They reuse the sync app's helpers, run inside a Flask request context (so
+auth, `ok()`/`bad()`, CORS and compression behave the same) and push
+CPU-heavy or blocking pieces to worker threads: normalizing and upserting a
+fetched Adzuna page, catalog searches, rate-limit waits.
+
+Every other route is the unchanged sync Flask app, run on a bounded thread
+pool (ASGI_SYNC_THREADS). `python backend/app.py` and WSGI servers keep
+working as before.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx  # noqa: E402
+from flask import request  # noqa: E402
+
+from backend import app as sync_app  # noqa: E402  (loads .env first)
+from backend import metrics  # noqa: E402
+from backend.app import app as flask_app, bad, ok  # noqa: E402
+from backend.async_db import async_db  # noqa: E402
+from backend.conversations import store as conversations  # noqa: E402
+from backend.rate_limit import limiter  # noqa: E402
+from backend.search_cache import search_cache  # noqa: E402
+from backend.singleflight import AsyncSingleFlight, make_key  # noqa: E402
+from ml.cover_letter_generator import CoverLetterGenerator  # noqa: E402
+from ml.lazy import lazy_module  # noqa: E402
+from ml.resilience import CircuitOpenError, get_caller  # noqa: E402
+
+log = flask_app.logger
+genai = lazy_module("google.generativeai")
+
+adzuna_flight = AsyncSingleFlight("adzuna-async")
+gemini_flight = AsyncSingleFlight("gemini-async")
+
+_sync_pool = ThreadPoolExecutor(int(os.getenv("ASGI_SYNC_THREADS", "16")), thread_name_prefix="wsgi")
+# without aiomysql: queries run here, each thread on its own connection (sync_app.get_db() is per
+# thread), so gathered queries never share a cursor and the connection count stays bounded
+_db_pool = ThreadPoolExecutor(int(os.getenv("ASGI_DB_THREADS", "8")), thread_name_prefix="mysql")
+_http: httpx.AsyncClient | None = None
+
+
+def _client() -> httpx.AsyncClient:
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(timeout=10, limits=httpx.Limits(max_connections=200))
+    return _http
+
+
+# -----------------------------
+# Upstream / DB helpers
+# -----------------------------
+async def _adzuna_get(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Async twin of app._adzuna_get: identical concurrent requests share one upstream call."""
+    async def fetch():
+        with metrics.track_upstream("adzuna"):
+            res = await _client().get(url, params=params)
+            res.raise_for_status()
+            return res.json()
+
+    key = make_key(url, {k: v for k, v in params.items() if k not in ("app_id", "app_key")})
+    return await adzuna_flight.do(key, fetch, timeout=15)
+
+
+def _sync_query(sql: str, args, many: bool):
+    # this thread's own connection, see _db_pool
+    db, cursor = sync_app.get_db()
+    if not db:
+        return None
+    cursor.execute(sql, args)
+    return cursor.fetchall() if many else cursor.fetchone()
+
+
+async def _fetch(sql: str, args, many: bool = False):
+    """One or all rows: aiomysql when available, a _db_pool thread's connection otherwise, None without MySQL."""
+    try:
+        if async_db.enabled:
+            return await (async_db.fetchall(sql, args) if many else async_db.fetchone(sql, args))
+        if sync_app.USE_DB:
+            return await asyncio.get_running_loop().run_in_executor(_db_pool, _sync_query, sql, args, many)
+    except Exception as e:
+        log.exception(e)
+    return None
+
+
+async def _execute(sql: str, args) -> None:
+    try:
+        if async_db.enabled:
+            await async_db.execute(sql, args)
+        elif sync_app.USE_DB:
+            await asyncio.get_running_loop().run_in_executor(_db_pool, _sync_query, sql, args, False)
+    except Exception as e:
+        log.exception(f"Write failed: {e}")
+
+
+async def _rate_limited(upstream: str):
+    """429 response when the caller is over `upstream`'s budget, else None."""
+    # may sleep up to RATE_LIMIT_MAX_WAIT_SECONDS, so not on the loop
+    admitted, retry_after = await asyncio.to_thread(limiter.check, upstream, sync_app._client_key())
+    return None if admitted else limiter.rejection(retry_after)
+
+
+# -----------------------------
+# Async routes
+# -----------------------------
+async def jobs_search():
+    try:
+        p = sync_app._search_params(request.get_json(force=True) or {})
+    except ValueError as e:
+        return bad(str(e))
+
+    if p["source"] != "adzuna":
+        local = await asyncio.to_thread(sync_app._local_search, p)
+        if local is not None:
+            return ok(local)
+
+    key, cls = p["key"], p["cls"]
+    cached = search_cache.get(key)
+    if cached is None:
+        # only a provider call takes a token, as in the sync route
+        busy = await _rate_limited("adzuna")
+        if busy is not None:
+            return busy
+        try:
+            url, params = sync_app._adzuna_request(p["query"], p["location"], p["experience"], p["page"],
+                                                   p["salary_min"], p["salary_max"], p["sort"],
+                                                   p["results_per_page"])
+            data = await _adzuna_get(url, params)
+            # dedup + upsert: CPU and (sync) DB work, off the loop
+            payload = await asyncio.to_thread(sync_app._ingest_adzuna_page, data, url, params,
+                                              *sync_app._provider_args(p))
+        except ValueError as e:
+            return bad(str(e))
+        except Exception as e:
+            log.exception(f"Adzuna API error: {e}")
+            return bad("Failed to fetch jobs from Adzuna")
+        search_cache.put(key, payload, cls)
+        age, stale = 0.0, False
+    else:
+        payload, age, stale = cached
+        if stale:
+            # background refresh on the cache's own thread, as in the sync route
+            search_cache.revalidate(key, sync_app._revalidate_fetch(p, sync_app._client_key()), cls)
+
+    return ok(sync_app._provider_response(p, payload, cached is not None, age, stale))
+
+
+async def recommend():
+    data = request.get_json(force=True) or {}
+    resume_id = data.get("resume_id")
+    job_ids = data.get("job_ids", [])
+
+    if not resume_id:
+        return bad("Missing 'resume_id'")
+    if not job_ids:
+        return bad("Provide non-empty 'job_ids' array")
+
+    ids = [j for j in job_ids if isinstance(j, int)]
+    row, rows = await asyncio.gather(
+        _fetch(sync_app._RESUME_TEXT_SQL, (resume_id,)),
+        _fetch(*sync_app._matching_jobs_query(ids), many=True) if ids else asyncio.sleep(0),
+    )
+    resume_text = (row or {}).get("resume_text") or ""
+    return sync_app._recommendations(resume_id, job_ids, resume_text, sync_app._matching_jobs(ids, rows))
+
+
+async def cover_letter():
+    busy = await _rate_limited("gemini")
+    if busy is not None:
+        return busy
+    req = sync_app._letter_request(request.get_json(force=True) or {})
+
+    job_row, resume_row = await asyncio.gather(
+        _fetch(sync_app._LETTER_JOB_SQL, (req["job_id"],)) if sync_app._letter_needs_job(req) else asyncio.sleep(0),
+        _fetch(sync_app._RESUME_RECORD_SQL, (req["resume_id"],)) if req["resume_id"] else asyncio.sleep(0),
+    )
+    if sync_app._letter_needs_job(req):
+        sync_app._letter_fill_job(req, job_row)
+    if req["resume_id"]:
+        sync_app._letter_fill_resume(req, sync_app._resume_record(req["resume_id"], resume_row))
+
+    use_gemini = bool(sync_app.GEMINI_API_KEY)
+    cover_letter_text = None
+    if use_gemini:
+        gen_args = sync_app._letter_gen_args(req)
+        try:
+            cover_letter_text = await gemini_flight.do(
+                make_key("cover_letter", gen_args),
+                lambda: CoverLetterGenerator().generate_cover_letter_async(**gen_args),
+                timeout=get_caller("gemini").timeout_seconds + 5,
+            )
+        except CircuitOpenError:
+            log.info("Gemini circuit open, using template cover letter")
+        except Exception as e:
+            log.exception(f"Gemini generation failed, falling back: {e}")
+
+    payload, persist_row = sync_app._letter_result(req, cover_letter_text, use_gemini)
+    if persist_row is not None:
+        await _execute(sync_app._PERSIST_LETTER_SQL, persist_row)
+    return ok(payload)
+
+
+async def chat():
+    busy = await _rate_limited("gemini")
+    if busy is not None:
+        return busy
+    if not sync_app.GEMINI_API_KEY:
+        return bad("Gemini API key is not configured on the server")
+
+    try:
+        conv, user_text, history = sync_app._chat_turn(request.get_json(force=True) or {})
+    except ValueError as e:
+        return bad(str(e))
+
+    caller = get_caller("gemini")
+    try:
+        model = genai.GenerativeModel(sync_app.GEMINI_MODEL)
+        response = await caller.call_async(
+            model.generate_content_async,
+            history,
+            request_options={"timeout": caller.timeout_seconds},
+        )
+        reply = (response.text or "").strip()
+    except CircuitOpenError:
+        return sync_app._chat_unavailable(caller)
+    except Exception as e:
+        log.exception(f"Gemini chat error: {e}")
+        return bad("Chat service failed")
+
+    # folding old turns may call Gemini for the summary: keep it off the event loop
+    await asyncio.to_thread(conversations.append, conv, user_text, reply)
+    return ok({"reply": reply, "conversation_id": conv.conversation_id})
+
+
+ROUTES: Dict[Tuple[str, str], Callable[[], Awaitable[Any]]] = {
+    ("POST", "/api/jobs/search"): jobs_search,
+    ("POST", "/api/recommend"): recommend,
+    ("POST", "/api/cover_letter"): cover_letter,
+    ("POST", "/api/ai/cover-letter"): cover_letter,
+    ("POST", "/api/chat"): chat,
+}
+
+
+# -----------------------------
+# ASGI plumbing
+# -----------------------------
+def _environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """WSGI environ for an ASGI http scope (what the Flask request context needs)."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        key = name.decode("latin1").upper().replace("-", "_")
+        value = value.decode("latin1")
+        if key == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif key != "CONTENT_LENGTH":
+            key = f"HTTP_{key}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _read_body(receive) -> bytes:
+    chunks: List[bytes] = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send(send, status: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(k.lower().encode("latin1"), v.encode("latin1")) for k, v in headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _run_async_route(handler, environ: Dict[str, Any]):
+    """Run `handler` in a Flask request context: before/after_request hooks and error handlers apply."""
+    with flask_app.request_context(environ):
+        try:
+            rv = flask_app.preprocess_request()
+            if rv is None:
+                rv = await handler()
+        except Exception as e:
+            rv = flask_app.handle_user_exception(e)
+        resp = flask_app.process_response(flask_app.make_response(rv))
+        return resp.status_code, list(resp.headers.items()), resp.get_data()
+
+
+def _run_wsgi(environ: Dict[str, Any]):
+    started: Dict[str, Any] = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"], started["headers"] = int(status.split(" ", 1)[0]), headers
+
+    result = flask_app(environ, start_response)
+    try:
+        body = b"".join(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return started["status"], started["headers"], body
+
+
+async def _lifespan(receive, send) -> None:
+    global _http
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await async_db.start()
+            except Exception as e:
+                # keep serving through the sync connection / memory store
+                log.warning(f"Async MySQL pool unavailable: {e}")
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await async_db.close()
+            if _http is not None:
+                await _http.aclose()
+                _http = None
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    environ = _environ(scope, await _read_body(receive))
+    handler = ROUTES.get((scope["method"], scope["path"]))
+    if handler is not None:
+        status, headers, body = await _run_async_route(handler, environ)
+    else:
+        status, headers, body = await asyncio.get_running_loop().run_in_executor(_sync_pool, _run_wsgi, environ)
+    await _send(send, status, headers, body)
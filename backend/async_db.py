@@ -0,0 +1,77 @@
+# backend/async_db.py
+"""
+aiomysql connection pool for the ASGI mode (backend/asgi.py).
+
+Queries await the socket on the event loop instead of holding a thread per
+round-trip. The pool is only used when aiomysql is installed and the same
+DB_HOST / DB_USER / DB_NAME settings as the sync app are present; otherwise
+`enabled` stays False and the ASGI routes fall back to the sync connection
+in a worker thread (MySQL configured) or to the memory store.
+"""
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, List, Sequence
+
+from backend import metrics
+
+try:  # optional: async MySQL driver
+    import aiomysql
+except ImportError:
+    aiomysql = None
+
+
+class AsyncDB:
+    def __init__(self, minsize: int = 1, maxsize: int = 10):
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.pool = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.pool is not None
+
+    async def start(self) -> None:
+        if aiomysql is None or not all(os.getenv(k) for k in ("DB_HOST", "DB_USER", "DB_NAME")):
+            return
+        self.pool = await aiomysql.create_pool(
+            host=os.getenv("DB_HOST"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD") or "",
+            db=os.getenv("DB_NAME"),
+            autocommit=True,
+            minsize=self.minsize,
+            maxsize=self.maxsize,
+            cursorclass=aiomysql.DictCursor,
+        )
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    async def _execute(self, cur, sql: str, args: Sequence[Any]) -> int:
+        started = time.perf_counter()
+        try:
+            return await cur.execute(sql, args)
+        finally:
+            metrics.observe_query(sql, time.perf_counter() - started)
+
+    async def fetchone(self, sql: str, args: Sequence[Any] = ()) -> Dict[str, Any] | None:
+        async with self.pool.acquire() as conn, conn.cursor() as cur:
+            await self._execute(cur, sql, args)
+            return await cur.fetchone()
+
+    async def fetchall(self, sql: str, args: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        async with self.pool.acquire() as conn, conn.cursor() as cur:
+            await self._execute(cur, sql, args)
+            return list(await cur.fetchall())
+
+    async def execute(self, sql: str, args: Sequence[Any] = ()) -> int:
+        async with self.pool.acquire() as conn, conn.cursor() as cur:
+            return await self._execute(cur, sql, args)
+
+
+async_db = AsyncDB(maxsize=int(os.getenv("DB_ASYNC_POOL_SIZE", "10")))
@@ -0,0 +1,89 @@
+# backend/auth_tokens.py
+"""
+JWT issue/verify with a small cache of verified tokens.
+
+Every authenticated request used to run `jwt.decode` (HMAC check plus JSON
+parsing) each time a handler asked for the user id, sometimes more than once
+per request. `TokenCache.claims()` verifies a token once and keeps its claims
+in an LRU until the token's own `exp`, so repeat requests with the same
+token skip the signature check. Expired entries are never served: the cache
+checks `exp` on every hit.
+
+Tokens also carry the user's display name and role (`name`, `role` claims)
+so handlers that only need those don't have to read the `users` row.
+Older tokens without them still verify; the claims are simply missing.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Tuple
+
+from ml.lazy import lazy_module
+
+jwt = lazy_module("jwt")
+
+
+class TokenCache:
+    def __init__(self, secret: str, algorithm: str = "HS256", max_entries: int = 1024):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalid": 0, "expired": 0}
+
+    def issue(self, user_id: int, name: str | None = None, role: str | None = None, days: int = 7) -> str:
+        exp = datetime.now(timezone.utc) + timedelta(days=days)
+        payload: Dict[str, Any] = {"user_id": user_id, "exp": int(exp.timestamp())}
+        if name:
+            payload["name"] = name
+        if role:
+            payload["role"] = role
+        return jwt.encode(payload, self.secret, algorithm=self.algorithm)
+
+    def claims(self, token: str) -> Dict[str, Any] | None:
+        """Verified claims of `token`, or None if it is invalid or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(token)
+                    self.stats["hits"] += 1
+                    return entry[1]
+                del self._entries[token]
+                self.stats["expired"] += 1
+                return None
+            self.stats["misses"] += 1
+
+        try:
+            payload = jwt.decode(token, self.secret, algorithms=[self.algorithm])
+        except jwt.ExpiredSignatureError:
+            with self._lock:
+                self.stats["expired"] += 1
+            return None
+        except jwt.InvalidTokenError:
+            with self._lock:
+                self.stats["invalid"] += 1
+            return None
+
+        # tokens without exp are verified every time rather than cached forever
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)) and self.max_entries > 0:
+            with self._lock:
+                self._entries[token] = (float(exp), payload)
+                self._entries.move_to_end(token)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return payload
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self.stats, entries=len(self._entries))
+        lookups = out["hits"] + out["misses"]
+        out["hit_rate"] = round(out["hits"] / lookups, 3) if lookups else 0.0
+        return out
+
@@ -0,0 +1,188 @@
+# backend/benchmarks/async_capacity.py
+"""
+Concurrent /api/jobs/search capacity of one process: sync (WSGI, fixed
+thread pool, like gunicorn --threads) vs async (backend/asgi.py on uvicorn).
+
+A local fake Adzuna answers every search after `--upstream-delay` seconds
+(default 1.0), so requests spend their time waiting on the provider, as in
+production. Each request uses a distinct query so the search cache and
+single-flight never short-circuit it. Runs in memory mode (no MySQL).
+
+    python backend/benchmarks/async_capacity.py [--clients 64] [--requests 256] [--threads 8]
+
+Needs httpx and uvicorn (pip install httpx uvicorn).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ["DB_HOST"] = ""  # always memory mode
+os.environ.setdefault("ADZUNA_APP_ID", "bench")
+os.environ.setdefault("ADZUNA_APP_KEY", "bench")
+os.environ["RATE_LIMIT_ENABLED"] = "0"
+
+logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# -----------------------------
+# Fake Adzuna
+# -----------------------------
+def _page(what: str) -> bytes:
+    results = [{
+        "title": f"{what} analyst {i}",
+        "company": {"display_name": f"Company {i}"},
+        "location": {"display_name": "Austin, TX"},
+        "redirect_url": f"https://example.com/{what.replace(' ', '-')}/{i}",
+        "description": f"{what} role {i}: SQL, Python and dashboards for the analytics team. " * 4,
+        "salary_min": 60000, "salary_max": 90000,
+        "category": {"label": "IT Jobs"},
+        "created": "2026-01-01T00:00:00Z",
+    } for i in range(30)]
+    return json.dumps({"count": 300, "results": results}).encode()
+
+
+def start_fake_adzuna(delay: float) -> int:
+    port = _free_port()
+
+    async def handle(reader, writer):
+        head = await reader.readuntil(b"\r\n\r\n")
+        target = head.split(b" ", 2)[1].decode()
+        what = "data"
+        for part in target.partition("?")[2].split("&"):
+            if part.startswith("what="):
+                what = part[5:].replace("+", " ").replace("%20", " ")
+        await asyncio.sleep(delay)
+        body = _page(what)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nConnection: close\r\n"
+                     + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+        writer.close()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(asyncio.start_server(handle, "127.0.0.1", port, backlog=1024))
+        loop.run_until_complete(server.serve_forever())
+
+    threading.Thread(target=run, daemon=True).start()
+    time.sleep(0.2)
+    return port
+
+
+# -----------------------------
+# Servers under test
+# -----------------------------
+def start_sync(threads: int) -> int:
+    from werkzeug.serving import BaseWSGIServer
+
+    from backend import app as backend_app
+
+    pool = ThreadPoolExecutor(threads)
+
+    class PooledServer(BaseWSGIServer):
+        # a fixed number of request threads, like gunicorn's gthread worker
+        def process_request(self, request, client_address):
+            pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    port = _free_port()
+    server = PooledServer("127.0.0.1", port, backend_app.app)
+    server.request_queue_size = 1024
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return port
+
+
+def start_async() -> int:
+    import uvicorn
+
+    port = _free_port()
+    config = uvicorn.Config("backend.asgi:app", host="127.0.0.1", port=port, log_level="warning",
+                            backlog=1024, lifespan="on")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return port
+
+
+# -----------------------------
+# Load
+# -----------------------------
+async def load(port: int, label: str, clients: int, total: int) -> None:
+    import httpx
+
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker(client):
+        nonlocal errors
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            t0 = time.perf_counter()
+            try:
+                r = await client.post(f"http://127.0.0.1:{port}/api/jobs/search",
+                                      json={"query": f"{label} q{i}", "view": "summary"})
+                if r.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"{label:>6}: {total / elapsed:6.1f} req/s  errors {errors:3d}  "
+          f"p50 {statistics.median(latencies) * 1000:7.0f} ms  p99 {latencies[int(0.99 * (len(latencies) - 1))] * 1000:7.0f} ms  "
+          f"({elapsed:.1f}s for {total})")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=64, help="concurrent requests in flight")
+    ap.add_argument("--requests", type=int, default=256)
+    ap.add_argument("--threads", type=int, default=8, help="request threads of the sync server")
+    ap.add_argument("--upstream-delay", type=float, default=1.0)
+    args = ap.parse_args()
+
+    adzuna_port = start_fake_adzuna(args.upstream_delay)
+    os.environ["ADZUNA_API_BASE"] = f"http://127.0.0.1:{adzuna_port}/v1/api"
+
+    print(f"{args.clients} concurrent clients, {args.requests} searches, upstream {args.upstream_delay:g}s, "
+          f"{os.cpu_count()} CPUs")
+    asyncio.run(load(start_sync(args.threads), "sync", args.clients, args.requests))
+    asyncio.run(load(start_async(), "async", args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
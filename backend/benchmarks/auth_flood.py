@@ -0,0 +1,112 @@
+# backend/benchmarks/auth_flood.py
+"""
+Login throughput under a flood, and whether other endpoints stay responsive.
+
+Runs the app in a threaded werkzeug server (memory mode, no DB), registers
+one user, then hammers /api/auth/login from `--clients` threads while a
+probe thread times GET /api/health. Runs twice: hashing inline on the
+request threads (AUTH_HASH_WORKERS=0, the old behaviour) and on the bounded
+pool from backend/password_hasher.py.
+
+    python backend/benchmarks/auth_flood.py [--clients 32] [--seconds 10] [--rounds 12]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+os.environ["DB_HOST"] = ""  # always memory mode
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from backend import app as backend_app  # noqa: E402
+from backend.password_hasher import PasswordHasher  # noqa: E402
+
+
+logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+
+def _post(url: str, body: dict) -> int:
+    req = urllib.request.Request(url, json.dumps(body).encode(), {"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as r:
+            return r.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def _pct(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+def run(label: str, hasher: PasswordHasher, clients: int, seconds: float) -> None:
+    backend_app.password_hasher = hasher
+    server = make_server("127.0.0.1", 0, backend_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    email = f"flood-{label}@example.com"
+    _post(f"{base}/api/auth/register", {"full_name": "Flood", "email": email, "password": "hunter22"})
+
+    stop = time.monotonic() + seconds
+    codes: dict[int, int] = {}
+    lock = threading.Lock()
+    health_ms: list[float] = []
+
+    def flood() -> None:
+        while time.monotonic() < stop:
+            code = _post(f"{base}/api/auth/login", {"email": email, "password": "hunter22"})
+            with lock:
+                codes[code] = codes.get(code, 0) + 1
+
+    def probe() -> None:
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            urllib.request.urlopen(f"{base}/api/health", timeout=60).read()
+            health_ms.append(time.perf_counter() - t0)
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=flood) for _ in range(clients)] + [threading.Thread(target=probe)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.shutdown()
+
+    ok = codes.get(200, 0)
+    print(f"{label:>7}: logins {ok / seconds:6.1f}/s ok, 503s {codes.get(503, 0):5d}, other {sum(codes.values()) - ok - codes.get(503, 0):3d} | "
+          f"/api/health p50 {_pct(health_ms, 0.5):7.1f} ms  p99 {_pct(health_ms, 0.99):7.1f} ms  (n={len(health_ms)})")
+    if health_ms:
+        print(f"{'':>9}health mean {statistics.mean(health_ms) * 1000:.1f} ms; hasher {hasher.snapshot()}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--rounds", type=int, default=12)
+    ap.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    ap.add_argument("--max-queue", type=int, default=32)
+    args = ap.parse_args()
+
+    print(f"{args.clients} login clients for {args.seconds:.0f}s, bcrypt cost {args.rounds}, {os.cpu_count()} CPUs")
+    run("inline", PasswordHasher(rounds=args.rounds, workers=0), args.clients, args.seconds)
+    run("pool", PasswordHasher(rounds=args.rounds, workers=args.workers, max_queue=args.max_queue),
+        args.clients, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# backend/benchmarks/dedup_signatures.py
+"""
+SimHash signature cost and near-duplicate detection quality (backend/job_dedup.py).
+
+Generates N synthetic descriptions (default 100k, Adzuna-length snippets of
+~80 words plus some full-length ones), times `simhash()` over all of them,
+optionally across worker processes, then checks how lightly edited reposts
+and unrelated postings score against `JOB_DEDUP_MAX_DISTANCE`.
+
+    python backend/benchmarks/dedup_signatures.py [--n 100000] [--workers 4]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.job_dedup import dedup_index, hamming, simhash  # noqa: E402
+
+_VOCAB = [f"w{i}" for i in range(5000)]
+
+
+def _descriptions(n: int, seed: int = 3) -> list[str]:
+    rng = random.Random(seed)
+    # every 10th description is a full posting, the rest are search snippets
+    return [" ".join(rng.choices(_VOCAB, k=600 if i % 10 == 0 else 80)) for i in range(n)]
+
+
+def _repost(text: str, rng: random.Random) -> str:
+    """A repost: a couple of words changed and a line appended."""
+    words = text.split()
+    for _ in range(2):
+        words[rng.randrange(len(words))] = rng.choice(_VOCAB)
+    return " ".join(words) + " apply today"
+
+
+def _sign(chunk: list[str]) -> list[int]:
+    return [simhash(t) for t in chunk]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args()
+
+    docs = _descriptions(args.n)
+    started = time.perf_counter()
+    if args.workers > 1:
+        size = -(-len(docs) // (args.workers * 8))
+        with ProcessPoolExecutor(args.workers) as pool:
+            sigs = [s for part in pool.map(_sign, [docs[i:i + size] for i in range(0, len(docs), size)]) for s in part]
+    else:
+        sigs = _sign(docs)
+    elapsed = time.perf_counter() - started
+    print(f"signatures: {len(sigs)} in {elapsed:.2f}s "
+          f"({elapsed / len(sigs) * 1e6:.0f} us/description, {len(sigs) / elapsed:,.0f}/s, workers={args.workers})")
+
+    rng = random.Random(5)
+    sample = rng.sample(range(len(docs)), min(2000, len(docs)))
+    k = dedup_index.max_distance
+    repost_d = [hamming(sigs[i], simhash(_repost(docs[i], rng))) for i in sample]
+    other_d = [hamming(sigs[i], sigs[j]) for i, j in zip(sample, sample[1:])]
+    print(f"reposts detected (distance <= {k}): {sum(d <= k for d in repost_d) / len(repost_d):.1%}")
+    print(f"unrelated pairs flagged:            {sum(d <= k for d in other_d) / len(other_d):.2%}")
+    print(f"mean distance: reposts {sum(repost_d) / len(repost_d):.1f}, unrelated {sum(other_d) / len(other_d):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# backend/benchmarks/import_time.py
+"""
+Cold-start import cost of the backend, from `python -X importtime`.
+
+Imports each target in a fresh interpreter `--runs` times, parses the
+importtime table (stderr) and reports the median cumulative time of the
+target plus its heaviest direct imports. It also checks that the heavy
+dependencies kept behind ml/lazy.py are not imported eagerly.
+
+Exits 1 when the median is over `--max-ms` or a lazy dependency was
+imported, so it can run as a regression check (e.g. in CI):
+
+    python backend/benchmarks/import_time.py                  # backend.app, 500 ms budget
+    python backend/benchmarks/import_time.py --target backend.catalog_io --max-ms 300
+
+tests/test_import_time.py runs the same `check()` under pytest.
+
+Baseline on the dev box: backend.app took ~940 ms before the lazy imports
+and ~260 ms after (genai alone was ~480 ms).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# must only be imported on first use (see ml/lazy.py)
+LAZY = ["google.generativeai", "pdfplumber", "mammoth", "mysql.connector", "bcrypt", "jwt", "requests", "pyarrow"]
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(target: str) -> Tuple[float, List[Tuple[float, str]], set]:
+    """(cumulative ms of target, [(ms, direct child)], every module imported)."""
+    env = dict(os.environ, PYTHONPATH=ROOT, ADZUNA_APP_ID=os.getenv("ADZUNA_APP_ID", "bench"),
+               ADZUNA_APP_KEY=os.getenv("ADZUNA_APP_KEY", "bench"), WARM_IMPORTS="0")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"importing {target} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((int(m.group(2)) / 1000, len(m.group(3)), m.group(4)))
+    total = next(ms for ms, depth, name in rows if name == target and depth == 1)
+    # direct children of the target are listed (depth 3) just before it
+    children = [(ms, name) for ms, depth, name in rows if depth == 3]
+    return total, children, {name for _, _, name in rows}
+
+
+def check(target: str = "backend.app", runs: int = 5,
+          max_ms: float = 500.0) -> Tuple[float, List[float], Dict[str, List[float]], List[str]]:
+    """(median ms, ms per run, ms per direct child, failure messages); no failures means the check passed."""
+    totals: List[float] = []
+    by_child: Dict[str, List[float]] = {}
+    eager: set = set()
+    for _ in range(runs):
+        total, children, modules = measure(target)
+        totals.append(total)
+        for ms, name in children:
+            by_child.setdefault(name, []).append(ms)
+        eager |= {name for name in LAZY if name in modules}
+
+    median = statistics.median(totals)
+    failures = []
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(sorted(eager))}")
+    if median > max_ms:
+        failures.append(f"{median:.0f} ms is over the {max_ms:.0f} ms budget")
+    return median, totals, by_child, failures
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--target", default="backend.app")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--max-ms", type=float, default=500.0, help="fail above this median")
+    ap.add_argument("--top", type=int, default=8)
+    args = ap.parse_args(argv)
+
+    median, totals, by_child, failures = check(args.target, args.runs, args.max_ms)
+    print(f"{args.target}: median {median:.0f} ms over {args.runs} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}), budget {args.max_ms:.0f} ms")
+    for name, ms in sorted(by_child.items(), key=lambda kv: -statistics.median(kv[1]))[:args.top]:
+        print(f"  {statistics.median(ms):7.1f} ms  {name}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
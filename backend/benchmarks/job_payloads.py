@@ -0,0 +1,49 @@
+# backend/benchmarks/job_payloads.py
+"""
+Bytes on the wire and response time for POST /api/jobs/search per view.
+
+Feeds one synthetic 30-job Adzuna page (benchmarks/payloads.py) through the
+real route with the upstream fetch replaced, so only shaping, JSON encoding
+and compression are measured.
+
+    python backend/benchmarks/job_payloads.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("ADZUNA_APP_ID", "bench")
+os.environ.setdefault("ADZUNA_APP_KEY", "bench")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+from backend import app as backend_app  # noqa: E402
+from backend.benchmarks.payloads import adzuna_page  # noqa: E402
+
+ROUNDS = 50
+
+
+def main() -> None:
+    page = adzuna_page()
+    backend_app._adzuna_get = lambda url, params: page
+    client = backend_app.app.test_client()
+
+    print(f"{'view':<8} {'encoding':<9} {'bytes':>9} {'ms/req':>8}")
+    for view in ("debug", "detail", "summary"):
+        for encoding in ("identity", "gzip", "br"):
+            if encoding == "br" and backend_app.brotli is None:
+                continue
+            body = {"query": "data analyst", "view": view}
+            headers = {"Accept-Encoding": encoding}
+            client.post("/api/jobs/search", json=body, headers=headers)  # warm up
+            started = time.perf_counter()
+            for _ in range(ROUNDS):
+                resp = client.post("/api/jobs/search", json=body, headers=headers)
+            ms = (time.perf_counter() - started) * 1000 / ROUNDS
+            print(f"{view:<8} {encoding:<9} {len(resp.get_data()):>9} {ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# backend/benchmarks/json_serialization.py
+"""
+JSON encoding cost for the two heaviest response shapes:
+
+- a /api/jobs/search body with 30 jobs in the `debug` view (full text + raw)
+- a /api/users/me/saved-jobs list of 300 rows (datetime, Decimal, descriptions)
+
+Compares Flask's stock provider with backend.json_provider.FastJSONProvider
+(orjson when installed, stdlib otherwise).
+
+    python backend/benchmarks/json_serialization.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from backend import json_provider  # noqa: E402
+from backend.benchmarks.payloads import adzuna_page, saved_job_rows  # noqa: E402
+
+ROUNDS = 200
+
+
+def _search_body():
+    results = []
+    for job in adzuna_page()["results"]:
+        results.append({
+            "job_id": None,
+            "title": job["title"],
+            "company": job["company"]["display_name"],
+            "location": job["location"]["display_name"],
+            "url": job["redirect_url"],
+            "description": job["description"][:2000],
+            "full_description": job["description"],
+            "salary_min": job["salary_min"],
+            "salary_max": job["salary_max"],
+            "category": job["category"]["label"],
+            "type": "Full-time",
+            "experience": "mid",
+            "experience_level": "mid",
+            "raw": job,
+        })
+    return {"query": "data analyst", "count": len(results), "results": results}
+
+
+def _time(app: Flask, payload) -> tuple[float, int]:
+    with app.app_context():
+        app.json.response(payload)  # warm up
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            resp = app.json.response(payload)
+        return (time.perf_counter() - started) * 1000 / ROUNDS, len(resp.get_data())
+
+
+def main() -> None:
+    payloads = {"jobs_search(30, debug)": _search_body(), "saved_jobs(300 rows)": saved_job_rows()}
+
+    stock = Flask("stock")
+    stock.json = DefaultJSONProvider(stock)
+    fast = Flask("fast")
+    fast.json = json_provider.FastJSONProvider(fast)
+    fast_name = "orjson" if json_provider.orjson else "stdlib (orjson missing)"
+
+    print(f"{'payload':<24} {'provider':<24} {'bytes':>8} {'ms':>8}")
+    for name, payload in payloads.items():
+        for label, app in (("flask default", stock), (fast_name, fast)):
+            ms, size = _time(app, payload)
+            print(f"{name:<24} {label:<24} {size:>8} {ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
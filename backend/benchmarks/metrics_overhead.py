@@ -0,0 +1,113 @@
+# backend/benchmarks/metrics_overhead.py
+"""
+Cost of the /metrics instrumentation (backend/metrics.py).
+
+1. Recording: ns per `Histogram.observe()` with per-thread shards vs the
+   same histogram behind one shared lock, from 1 and `--threads` threads.
+2. Per request: the before/after_request hooks (`begin_request()` +
+   `end_request()`: in-flight gauge, request counter, latency and DB
+   histograms), next to a whole GET /api/health through the test client.
+   Comparing two processes with METRICS_ENABLED=1/0 instead is lost in
+   run-to-run noise at this size.
+3. Scrape: time to render /metrics once the requests above have run.
+
+    python backend/benchmarks/metrics_overhead.py [--threads 8] [--requests 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+
+
+class _LockedHistogram:
+    """Baseline: one dict of bucket lists shared by every thread, guarded by a lock."""
+
+    def __init__(self, buckets):
+        from bisect import bisect_left
+        self._bisect = bisect_left
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def observe(self, value, *labels):
+        with self.lock:
+            h = self.values.get(labels)
+            if h is None:
+                h = self.values[labels] = [0] * (len(self.buckets) + 2)
+            h[self._bisect(self.buckets, value)] += 1
+            h[-1] += value
+
+
+def _observe_ns(hist, threads: int, per_thread: int) -> float:
+    def work():
+        for i in range(per_thread):
+            hist.observe((i % 100) / 1000, "GET", "/api/health")
+
+    ts = [threading.Thread(target=work) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    return (time.perf_counter() - started) / (threads * per_thread) * 1e9
+
+
+def _median_us(fn, n: int, repeat: int) -> float:
+    rounds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(n):
+            fn()
+        rounds.append((time.perf_counter() - started) / n * 1e6)
+    return statistics.median(rounds)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--observations", type=int, default=200_000)
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    os.environ.update(DB_HOST="", RATE_LIMIT_ENABLED="0", METRICS_ENABLED="1")
+    os.environ.setdefault("ADZUNA_APP_ID", "bench")
+    os.environ.setdefault("ADZUNA_APP_KEY", "bench")
+    from backend import metrics
+
+    print("observe() cost")
+    for threads in (1, args.threads):
+        per_thread = args.observations // threads
+        sharded = metrics.Histogram(f"bench_sharded_{threads}", "bench", ("method", "route"))
+        locked = _LockedHistogram(metrics.DEFAULT_BUCKETS)
+        print(f"  {threads:>2} thread(s): per-thread shards {_observe_ns(sharded, threads, per_thread):6.0f} ns"
+              f"   shared lock {_observe_ns(locked, threads, per_thread):6.0f} ns")
+
+    import logging
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    from backend import app as backend_app
+
+    client = backend_app.app.test_client()
+    for _ in range(200):
+        client.get("/api/health")
+    request_us = _median_us(lambda: client.get("/api/health"), args.requests, args.repeat)
+    with backend_app.app.test_request_context("/api/health"):
+        hooks_us = _median_us(lambda: (metrics.begin_request(), metrics.end_request("GET", "/api/health", 200)),
+                              args.requests, args.repeat)
+    print(f"per request: hooks {hooks_us:.1f} µs   whole GET /api/health {request_us:.1f} µs"
+          f"   ({100 * hooks_us / request_us:.1f}%)")
+
+    started = time.perf_counter()
+    body = metrics.render()
+    print(f"render /metrics: {(time.perf_counter() - started) * 1000:.2f} ms for {body.count(chr(10))} lines")
+
+
+if __name__ == "__main__":
+    main()
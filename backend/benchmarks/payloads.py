@@ -0,0 +1,73 @@
+# backend/benchmarks/payloads.py
+"""Synthetic but representative payloads shared by the benchmark scripts."""
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List
+
+_WORDS = (
+    "data analyst python sql dashboards stakeholders reporting pipelines cloud "
+    "experience team collaborate requirements tableau excel forecasting senior "
+    "design develop maintain applications agile communication benefits salary"
+).split()
+
+
+def _text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n_words))
+
+
+def adzuna_page(n: int = 30, seed: int = 7) -> Dict[str, Any]:
+    """One Adzuna search page shaped like the real API (HTML in descriptions, nested objects)."""
+    rng = random.Random(seed)
+    results = []
+    for i in range(n):
+        results.append({
+            "id": str(4_000_000_000 + i),
+            "adref": "eyJhbGciOiJIUzI1NiJ9." + "x" * 120,
+            "title": f"{rng.choice(['Senior', 'Junior', ''])} Data Analyst {i}".strip(),
+            "company": {"display_name": f"Company {i}", "__CLASS__": "Adzuna::API::Response::Company"},
+            "location": {
+                "display_name": "Chicago, Cook County",
+                "area": ["US", "Illinois", "Cook County", "Chicago"],
+                "__CLASS__": "Adzuna::API::Response::Location",
+            },
+            "category": {"label": "IT Jobs", "tag": "it-jobs", "__CLASS__": "Adzuna::API::Response::Category"},
+            "description": "<p>" + _text(rng, 600) + "</p> &amp; <strong>" + _text(rng, 40) + "</strong>",
+            "redirect_url": f"https://www.adzuna.com/land/ad/{4_000_000_000 + i}?se=abc&utm_medium=api&v=" + "F" * 40,
+            "created": (datetime(2025, 1, 1) + timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "salary_min": 60000 + 1000 * i,
+            "salary_max": 90000 + 1000 * i,
+            "salary_is_predicted": "0",
+            "contract_time": rng.choice(["full_time", "part_time", None]),
+            "contract_type": rng.choice(["permanent", "contract", None]),
+            "latitude": 41.88,
+            "longitude": -87.62,
+            "__CLASS__": "Adzuna::API::Response::Job",
+        })
+    return {"count": 4821, "mean": 85000.0, "results": results, "__CLASS__": "Adzuna::API::Response::JobSearchResults"}
+
+
+def saved_job_rows(n: int = 300, seed: int = 11) -> List[Dict[str, Any]]:
+    """Rows as mysql-connector returns them for the saved-jobs list (datetime, Decimal, long TEXT)."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 9, 30)
+    return [
+        {
+            "saved_job_id": i,
+            "date_saved": start + timedelta(minutes=17 * i),
+            "notes": _text(rng, 8),
+            "job_id": 1000 + i,
+            "title": f"Data Analyst {i}",
+            "company_name": f"Company {i}",
+            "location": "Chicago, IL",
+            "industry": "IT Jobs",
+            "salary_range": "60000-90000",
+            "url": f"https://www.adzuna.com/land/ad/{1000 + i}",
+            "source": "api",
+            "description": _text(rng, 600),
+            "match_score": Decimal("87.50"),
+        }
+        for i in range(n)
+    ]
@@ -0,0 +1,157 @@
+# backend/benchmarks/server_profile.py
+"""
+Throughput of the production profile (backend/gunicorn.conf.py) for two
+workloads, across worker/thread layouts:
+
+  parse   POST /api/resumes with a 2-page PDF: pdfplumber + section/contact
+          parsing + skill extraction. CPU-bound.
+  search  POST /api/jobs/search against a fake Adzuna that answers after
+          `--upstream-delay` seconds (distinct queries, so the cache and
+          single-flight never short-circuit). I/O-bound.
+
+Each layout starts a real gunicorn master with the config (preload, gthread)
+in memory mode.
+
+    python backend/benchmarks/server_profile.py [--layouts 1x1,1x8,2x8,4x8] [--clients 32]
+
+Needs gunicorn and httpx (pip install gunicorn httpx).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+
+from backend.benchmarks.async_capacity import _free_port, start_fake_adzuna  # noqa: E402
+
+
+def _resume_pdf(pages: int = 2, lines: int = 45) -> bytes:
+    """A small text PDF built by hand (no PDF writer dependency)."""
+    words = ("Built Python and SQL pipelines in Airflow, Tableau and Power BI dashboards for "
+             "supply chain KPIs; machine learning forecasts with pandas and numpy").split()
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for p in range(pages):
+        rows = ["BT /F1 10 Tf 50 760 Td 12 TL"]
+        rows.append("(Jane Doe  jane@example.com  \\(555\\) 123-4567) Tj T*" if p == 0 else "(EXPERIENCE) Tj T*")
+        for i in range(lines):
+            rows.append("(" + " ".join(words[(i + j) % len(words)] for j in range(12)) + ") Tj T*")
+        rows.append("(EDUCATION) Tj T* (B.S. Statistics) Tj T* (SKILLS) Tj T* (Python, SQL, Excel) Tj ET")
+        stream = "\n".join(rows).encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref)
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % n + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def start_server(workers: int, threads: int, adzuna_port: int) -> tuple[subprocess.Popen, int]:
+    port = _free_port()
+    env = dict(os.environ, DB_HOST="", RATE_LIMIT_ENABLED="0", ADZUNA_APP_ID="bench", ADZUNA_APP_KEY="bench",
+               ADZUNA_API_BASE=f"http://127.0.0.1:{adzuna_port}/v1/api", PYTHONPATH=ROOT,
+               WEB_BIND=f"127.0.0.1:{port}", WEB_WORKERS=str(workers), WEB_THREADS=str(threads),
+               WEB_LOG_LEVEL="warning")
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "backend/gunicorn.conf.py", "backend.app:app"],
+                            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    import httpx
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1).status_code == 200:
+                return proc, port
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("gunicorn did not come up")
+
+
+async def load(port: int, workload: str, clients: int, total: int, pdf: bytes) -> str:
+    import httpx
+
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker(client):
+        nonlocal errors
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            t0 = time.perf_counter()
+            try:
+                if workload == "parse":
+                    r = await client.post(f"http://127.0.0.1:{port}/api/resumes",
+                                          files={"file": ("resume.pdf", pdf, "application/pdf")})
+                else:
+                    r = await client.post(f"http://127.0.0.1:{port}/api/jobs/search",
+                                          json={"query": f"search q{i} {port}", "view": "summary"})
+                if r.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    async with httpx.AsyncClient(timeout=300, limits=httpx.Limits(max_connections=clients)) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return (f"{total / elapsed:7.1f} req/s  p50 {statistics.median(latencies) * 1000:6.0f} ms  "
+            f"p99 {latencies[int(0.99 * (len(latencies) - 1))] * 1000:6.0f} ms  errors {errors}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--layouts", default="1x1,1x8,2x8,4x8", help="comma-separated WORKERSxTHREADS")
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--parse-requests", type=int, default=64)
+    ap.add_argument("--search-requests", type=int, default=128)
+    ap.add_argument("--upstream-delay", type=float, default=0.5)
+    args = ap.parse_args()
+
+    adzuna_port = start_fake_adzuna(args.upstream_delay)
+    pdf = _resume_pdf()
+    print(f"{os.cpu_count()} CPUs, {args.clients} clients, PDF {len(pdf) // 1024} KB, "
+          f"upstream {args.upstream_delay:g}s")
+    for layout in args.layouts.split(","):
+        workers, threads = (int(x) for x in layout.split("x"))
+        proc, port = start_server(workers, threads, adzuna_port)
+        try:
+            parse = asyncio.run(load(port, "parse", args.clients, args.parse_requests, pdf))
+            search = asyncio.run(load(port, "search", args.clients, args.search_requests, pdf))
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait(timeout=60)
+        print(f"{workers}x{threads:<3} parse  {parse}")
+        print(f"{'':5} search {search}")
+
+
+if __name__ == "__main__":
+    main()
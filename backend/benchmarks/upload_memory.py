@@ -0,0 +1,72 @@
+# backend/benchmarks/upload_memory.py
+"""
+Peak Python heap per resume upload: spooled uploads (backend/uploads.py)
+vs the old read-into-bytes path (Werkzeug's default request, `file.read()`,
+then `BytesIO(content)` for the parser).
+
+Uploads a `--mb` MB text resume through the Flask test client and reports
+the tracemalloc peak for the request. Both numbers include the test client's
+own copy of the request body and the parsed text, so the difference is what
+the upload handling saves. Runs in memory mode.
+
+    python backend/benchmarks/upload_memory.py [--mb 4.5]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import logging
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ["DB_HOST"] = ""  # always memory mode
+os.environ.setdefault("ADZUNA_APP_ID", "bench")
+os.environ.setdefault("ADZUNA_APP_KEY", "bench")
+os.environ["RATE_LIMIT_ENABLED"] = "0"
+os.environ.setdefault("UPLOAD_MAX_MB", "64")
+
+logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mb", type=float, default=4.5)
+    args = ap.parse_args()
+
+    from flask import Flask, Request, request
+
+    from backend import app as backend_app
+
+    line = b"Built Python and SQL pipelines; Tableau dashboards for supply chain KPIs.\n"
+    body = line * int(args.mb * 1024 * 1024 / len(line))
+
+    # the old handler shape, on a plain Flask app with Werkzeug's default file streams
+    legacy = Flask("legacy")
+    legacy.request_class = Request
+    legacy.config["MAX_CONTENT_LENGTH"] = backend_app.app.config["MAX_CONTENT_LENGTH"]
+
+    @legacy.post("/api/resumes")
+    def legacy_upload():
+        content = request.files["file"].read() or b""
+        raw = io.BytesIO(content).read().decode("utf-8", errors="ignore")
+        backend_app._parse_plain_text_with_pre_llm(raw)
+        return {"size": len(content)}
+
+    for label, app in (("read()", legacy), ("spooled", backend_app.app)):
+        client = app.test_client()
+        data = {"file": (io.BytesIO(body), "resume.txt", "text/plain")}
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        r = client.post("/api/resumes", data=data, content_type="multipart/form-data")
+        peak = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+        assert r.status_code == 200, r.get_data(as_text=True)
+        print(f"{label:>8}: upload {len(body) / 1e6:5.1f} MB  peak heap {peak / 1e6:6.1f} MB  "
+              f"({peak / len(body):.1f}x the file)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# backend/catalog_io.py
+"""
+Bulk export/import of the job catalog for offline analytics.
+
+    python -m backend.catalog_io export jobs exports/jobs.parquet
+    python -m backend.catalog_io export job_recommendations exports/recs.jsonl.gz
+    python -m backend.catalog_io import jobs exports/jobs.parquet
+    python -m backend.catalog_io score exports/jobs.arrow --resume resume.txt --top 20
+
+Formats are picked from the file extension:
+- .parquet: columnar, compressed (needs pyarrow)
+- .arrow / .feather: Arrow IPC file, read back memory-mapped (needs pyarrow)
+- .jsonl / .jsonl.gz: one JSON object per row, stdlib only
+
+Rows stream through in `--chunk` sized batches in both directions: exports
+read from an unbuffered (server-side) MySQL cursor, imports insert each
+batch with one executemany. Memory use depends on the chunk size, not on
+the table size. Imports upsert on the primary key.
+
+Uses the same DB_HOST / DB_USER / DB_PASSWORD / DB_NAME settings as the API.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import heapq
+import json
+import os
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ml.lazy import available, lazy_module  # noqa: E402
+
+# optional: Parquet and Arrow formats, imported only when one is used
+pa = lazy_module("pyarrow")
+pa_ipc = lazy_module("pyarrow.ipc")
+pq = lazy_module("pyarrow.parquet")
+
+TABLES = {"jobs": "job_id", "job_recommendations": "rec_id"}
+
+Batch = List[Dict[str, Any]]
+
+
+def _format(path: str) -> str:
+    for suffix, fmt in ((".parquet", "parquet"), (".arrow", "arrow"), (".feather", "arrow"),
+                        (".jsonl.gz", "jsonl"), (".jsonl", "jsonl")):
+        if path.endswith(suffix):
+            if fmt != "jsonl" and not available("pyarrow"):
+                raise SystemExit(f"{suffix} needs pyarrow (pip install pyarrow), or use .jsonl.gz")
+            return fmt
+    raise SystemExit(f"Unknown format for {path!r}: use .parquet, .arrow, .jsonl or .jsonl.gz")
+
+
+def _connect():
+    import mysql.connector
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    if not all(os.getenv(k) for k in ("DB_HOST", "DB_USER", "DB_NAME")):
+        raise SystemExit("DB_HOST, DB_USER and DB_NAME must be set")
+    return mysql.connector.connect(
+        host=os.getenv("DB_HOST"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database=os.getenv("DB_NAME"),
+        use_pure=True,
+    )
+
+
+# -----------------------------
+# Arrow schema from the cursor
+# -----------------------------
+def _arrow_schema(description) -> "pa.Schema":
+    from mysql.connector import FieldFlag, FieldType
+
+    fields = []
+    for col in description:
+        name, type_code, flags = col[0], col[1], col[7]
+        unsigned = bool(flags & FieldFlag.UNSIGNED)
+        if type_code in (FieldType.TINY, FieldType.SHORT, FieldType.INT24, FieldType.LONG, FieldType.LONGLONG):
+            t = pa.uint64() if unsigned and type_code == FieldType.LONGLONG else pa.int64()
+        elif type_code in (FieldType.FLOAT, FieldType.DOUBLE, FieldType.DECIMAL, FieldType.NEWDECIMAL):
+            t = pa.float64()
+        elif type_code in (FieldType.DATETIME, FieldType.TIMESTAMP):
+            t = pa.timestamp("s")
+        elif type_code == FieldType.DATE:
+            t = pa.date32()
+        else:  # VARCHAR, TEXT (reported as BLOB), ENUM, JSON
+            t = pa.string()
+        fields.append(pa.field(name, t))
+    return pa.schema(fields)
+
+
+def _arrow_batch(rows: Batch, schema: "pa.Schema") -> "pa.RecordBatch":
+    cols = {f.name: [r.get(f.name) for r in rows] for f in schema}
+    for f in schema:
+        if pa.types.is_floating(f.type):
+            cols[f.name] = [float(v) if v is not None else None for v in cols[f.name]]
+        elif pa.types.is_string(f.type):
+            cols[f.name] = [v.decode("utf-8") if isinstance(v, (bytes, bytearray)) else v for v in cols[f.name]]
+    return pa.RecordBatch.from_pydict(cols, schema=schema)
+
+
+# -----------------------------
+# Writers / readers
+# -----------------------------
+def _json_default(v):
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    if isinstance(v, Decimal):
+        return str(v)
+    if isinstance(v, (bytes, bytearray)):
+        return v.decode("utf-8")
+    raise TypeError(type(v).__name__)
+
+
+def _open_text(path: str, mode: str):
+    return gzip.open(path, mode + "t", encoding="utf-8") if path.endswith(".gz") else open(path, mode, encoding="utf-8")
+
+
+def read_batches(path: str, chunk: int = 5000) -> Iterator[Batch]:
+    """Yield lists of row dicts from an export. Arrow files are memory-mapped, not loaded."""
+    fmt = _format(path)
+    if fmt == "jsonl":
+        with _open_text(path, "r") as f:
+            batch: Batch = []
+            for line in f:
+                if line.strip():
+                    batch.append(json.loads(line))
+                if len(batch) >= chunk:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+    elif fmt == "parquet":
+        for rb in pq.ParquetFile(path).iter_batches(batch_size=chunk):
+            yield rb.to_pylist()
+    else:
+        with pa.memory_map(path, "r") as source:
+            reader = pa_ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                rb = reader.get_batch(i)
+                for start in range(0, rb.num_rows, chunk):
+                    yield rb.slice(start, chunk).to_pylist()
+
+
+def export_table(conn, table: str, path: str, chunk: int = 5000) -> int:
+    fmt = _format(path)
+    cursor = conn.cursor(dictionary=True, buffered=False)
+    cursor.execute(f"SELECT * FROM {table} ORDER BY {TABLES[table]}")
+    total = 0
+    writer = None
+    out = _open_text(path, "w") if fmt == "jsonl" else None
+    try:
+        schema = _arrow_schema(cursor.description) if fmt != "jsonl" else None
+        if fmt == "parquet":
+            writer = pq.ParquetWriter(path, schema, compression="zstd")
+        elif fmt == "arrow":
+            writer = pa_ipc.new_file(path, schema)
+        while True:
+            rows = cursor.fetchmany(chunk)
+            if not rows:
+                break
+            if out is not None:
+                out.writelines(json.dumps(r, default=_json_default, ensure_ascii=False) + "\n" for r in rows)
+            else:
+                writer.write_batch(_arrow_batch(rows, schema))
+            total += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+        if out is not None:
+            out.close()
+        cursor.close()
+    return total
+
+
+def import_table(conn, table: str, path: str, chunk: int = 5000) -> int:
+    cursor = conn.cursor()
+    key = TABLES[table]
+    total = 0
+    try:
+        for rows in read_batches(path, chunk):
+            cols = list(rows[0].keys())
+            updates = ", ".join(f"{c} = VALUES({c})" for c in cols if c != key)
+            sql = (
+                f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))})"
+                f" ON DUPLICATE KEY UPDATE {updates or f'{key} = {key}'}"
+            )
+            cursor.executemany(sql, [tuple(r.get(c) for c in cols) for r in rows])
+            conn.commit()
+            total += len(rows)
+    finally:
+        cursor.close()
+    return total
+
+
+def score_export(path: str, resume_text: str, top: int = 20, chunk: int = 5000) -> List[Dict[str, Any]]:
+    """Best `top` matches for a resume across an exported catalog, one batch in memory at a time."""
+    from backend.skills import json_list, skill_extractor, skill_label, skill_match
+
+    resume_skills = set(skill_extractor.extract(resume_text))
+    best: List[tuple] = []
+    for rows in read_batches(path, chunk):
+        for r in rows:
+            skills = json_list(r.get("skills"))
+            if skills is None:  # exported before skills were stored
+                skills = skill_extractor.extract(r.get("title"), r.get("description"))
+            if not skills:
+                continue
+            score, _, gaps = skill_match(skills, resume_skills)
+            item = (score, -int(r.get("job_id") or 0), r.get("title"), r.get("company_name"),
+                    [skill_label(g) for g in gaps[:3]])
+            if len(best) < top:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+    return [
+        {"job_id": -neg_id, "title": title, "company": company, "score": score, "gaps": gaps}
+        for score, neg_id, title, company, gaps in sorted(best, reverse=True)
+    ]
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m backend.catalog_io", description=__doc__.split("\n\n")[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for cmd in ("export", "import"):
+        p = sub.add_parser(cmd)
+        p.add_argument("table", choices=sorted(TABLES))
+        p.add_argument("path")
+        p.add_argument("--chunk", type=int, default=5000)
+    p = sub.add_parser("score", help="rank exported jobs against a resume")
+    p.add_argument("path")
+    p.add_argument("--resume", required=True, help="plain-text resume file")
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--chunk", type=int, default=5000)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "score":
+        with open(args.resume, encoding="utf-8") as f:
+            resume_text = f.read()
+        for row in score_export(args.path, resume_text, args.top, args.chunk):
+            print(json.dumps(row, ensure_ascii=False))
+        return
+
+    _format(args.path)  # fail on an unknown extension before connecting
+    conn = _connect()
+    try:
+        fn = export_table if args.cmd == "export" else import_table
+        n = fn(conn, args.table, args.path, args.chunk)
+    finally:
+        conn.close()
+    print(f"{args.cmd}ed {n} rows ({args.table} {'->' if args.cmd == 'export' else '<-'} {args.path})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# backend/catalog_refresher.py
+"""
+Background refresh of popular job searches.
+
+`/api/jobs/search` reports every (what, where) pair it serves via `track()`.
+Popularity is a hit counter with exponential decay, so yesterday's hot query
+fades out on its own. A daemon thread wakes every `tick_seconds` and
+refreshes the most popular pairs that are due, which re-upserts their jobs
+into the catalog and re-warms the search response cache before users ask.
+
+Scheduling:
+- hotter queries are refreshed more often (interval / log2(2 + hits))
+- due queries are taken in priority order, hits + aging * overdue/interval,
+  so a less popular query that has waited long enough still gets its turn
+- every next run time is jittered by +-`jitter` so refreshes do not line up
+- failures back off exponentially up to `max_backoff_seconds`
+- every refresh spends one token from an hourly quota bucket; when it is
+  empty the tick stops early and the rest waits for the next tick
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from backend.rate_limit import limiter
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class _Query:
+    what: str
+    where: str
+    hits: float = 0.0
+    seen_at: float = 0.0        # last time `hits` was decayed
+    next_due: float = 0.0
+    refreshed_at: float | None = None
+    failures: int = 0
+    refreshes: int = 0
+
+
+class CatalogRefresher:
+    def __init__(
+        self,
+        interval_seconds: float = 600.0,
+        budget_per_hour: float = 120.0,
+        top_n: int = 20,
+        min_hits: float = 2.0,
+        half_life_seconds: float = 3600.0,
+        aging: float = 1.0,
+        jitter: float = 0.1,
+        max_backoff_seconds: float = 3600.0,
+        max_tracked: int = 500,
+        tick_seconds: float = 15.0,
+    ):
+        self.interval_seconds = interval_seconds
+        self.budget_per_hour = budget_per_hour
+        self.top_n = top_n
+        self.min_hits = min_hits
+        self.half_life_seconds = half_life_seconds
+        self.aging = aging
+        self.jitter = jitter
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_tracked = max_tracked
+        self.tick_seconds = tick_seconds
+        self._queries: Dict[Tuple[str, str], _Query] = {}
+        self._lock = threading.Lock()
+        self._fetch: Callable[[str, str], Any] | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._quota_log: List[float] = []   # refresh timestamps within the last hour
+        self.stats = {"ticks": 0, "refreshes": 0, "failures": 0, "budget_exhausted": 0}
+
+    @staticmethod
+    def _norm(what: str, where: str) -> Tuple[str, str]:
+        return " ".join(what.lower().split()), " ".join(where.lower().split())
+
+    def _decayed(self, q: _Query, now: float) -> float:
+        return q.hits * 0.5 ** ((now - q.seen_at) / self.half_life_seconds)
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _interval_for(self, q: _Query, now: float) -> float:
+        return self.interval_seconds / math.log2(2 + self._decayed(q, now))
+
+    def track(self, what: str, where: str, fetched: bool = False) -> None:
+        """Count one search; `fetched=True` when it just went to the provider itself."""
+        key = self._norm(what, where)
+        if not key[0]:
+            return
+        now = time.time()
+        with self._lock:
+            q = self._queries.get(key)
+            if q is None:
+                if len(self._queries) >= self.max_tracked:
+                    coldest = min(self._queries, key=lambda k: self._decayed(self._queries[k], now))
+                    del self._queries[coldest]
+                q = self._queries[key] = _Query(*key, seen_at=now, next_due=now)
+            q.hits = self._decayed(q, now) + 1
+            q.seen_at = now
+            if fetched:
+                q.refreshed_at = now
+                q.next_due = now + self._jittered(self._interval_for(q, now))
+
+    def _take_quota(self) -> bool:
+        rate = self.budget_per_hour / 3600.0
+        if limiter.backend.take("adzuna:refresher", self.budget_per_hour, rate) > 0:
+            return False
+        now = time.time()
+        with self._lock:
+            self._quota_log = [t for t in self._quota_log if now - t < 3600] + [now]
+        return True
+
+    def due(self, now: float | None = None) -> List[_Query]:
+        """Due queries among the `top_n` hottest, highest priority first."""
+        now = now or time.time()
+        with self._lock:
+            hot = heapq.nlargest(
+                self.top_n,
+                (q for q in self._queries.values() if self._decayed(q, now) >= self.min_hits),
+                key=lambda q: self._decayed(q, now),
+            )
+            ready = [q for q in hot if q.next_due <= now]
+            ready.sort(
+                key=lambda q: self._decayed(q, now) + self.aging * (now - q.next_due) / self.interval_seconds,
+                reverse=True,
+            )
+            return ready
+
+    def tick(self) -> int:
+        """Refresh what is due within the quota; returns the number of refreshes attempted."""
+        fetch = self._fetch
+        if fetch is None:
+            return 0
+        done = 0
+        with self._lock:
+            self.stats["ticks"] += 1
+        for q in self.due():
+            if not self._take_quota():
+                with self._lock:
+                    self.stats["budget_exhausted"] += 1
+                break
+            done += 1
+            try:
+                fetch(q.what, q.where)
+            except Exception as e:
+                log.warning("Catalog refresh failed for %r in %r: %s", q.what, q.where, e)
+                with self._lock:
+                    q.failures += 1
+                    self.stats["failures"] += 1
+                    backoff = min(self.max_backoff_seconds, self.interval_seconds * 2 ** q.failures)
+                    q.next_due = time.time() + self._jittered(backoff)
+                continue
+            now = time.time()
+            with self._lock:
+                q.failures = 0
+                q.refreshes += 1
+                q.refreshed_at = now
+                q.next_due = now + self._jittered(self._interval_for(q, now))
+                self.stats["refreshes"] += 1
+        return done
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._jittered(self.tick_seconds)):
+            try:
+                self.tick()
+            except Exception:
+                log.exception("Catalog refresher tick failed")
+
+    def start(self, fetch: Callable[[str, str], Any]) -> None:
+        """Start the daemon thread; `fetch(what, where)` refreshes one query."""
+        self._fetch = fetch
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="catalog-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def snapshot(self, limit: int = 20) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            quota_used = sum(1 for t in self._quota_log if now - t < 3600)
+            ranked = sorted(self._queries.values(), key=lambda q: self._decayed(q, now), reverse=True)[:limit]
+            queries = [{
+                "what": q.what,
+                "where": q.where,
+                "hits": round(self._decayed(q, now), 2),
+                "age_seconds": round(now - q.refreshed_at, 1) if q.refreshed_at else None,
+                "next_refresh_in_seconds": round(max(0.0, q.next_due - now), 1),
+                "refreshes": q.refreshes,
+                "failures": q.failures,
+            } for q in ranked]
+            return dict(
+                self.stats,
+                running=bool(self._thread and self._thread.is_alive()),
+                tracked=len(self._queries),
+                quota={"budget_per_hour": self.budget_per_hour, "used_last_hour": quota_used},
+                queries=queries,
+            )
+
+
+refresher = CatalogRefresher(
+    interval_seconds=float(os.getenv("CATALOG_REFRESH_INTERVAL_SECONDS", "600")),
+    budget_per_hour=float(os.getenv("CATALOG_REFRESH_BUDGET_PER_HOUR", "120")),
+    top_n=int(os.getenv("CATALOG_REFRESH_TOP_N", "20")),
+    min_hits=float(os.getenv("CATALOG_REFRESH_MIN_HITS", "2")),
+)
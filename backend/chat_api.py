@@ -5,7 +5,9 @@ Gemini chat blueprint
 POST /api/chat
 Body:
 {
-  "messages": [
+  "conversation_id": "...",             # optional; returned by the previous reply
+  "message": "Now make it shorter.",    # the new turn when using conversation_id
+  "messages": [                         # legacy: full transcript, seeds a new conversation
     {"role": "system", "content": "You are a helpful job search assistant."},
     {"role": "user", "content": "Rewrite my resume bullet for SQL."}
   ],
@@ -15,15 +17,19 @@ Body:
 }
 
 Response:
-  {"text": "<assistant reply>"}
+  {"text": "<assistant reply>", "conversation_id": "..."}
 """
 from typing import Optional
 
 import os
 from flask import Blueprint, request, jsonify
 
+from ml.lazy import lazy_module
+from ml.resilience import CircuitOpenError, get_caller
+from backend.conversations import store as conversations
+
 # pip install google-generativeai
-import google.generativeai as genai
+genai = lazy_module("google.generativeai")
 
 chat_bp = Blueprint("chat_bp", __name__)
 
@@ -37,45 +43,43 @@ def _init_model(model_override: str | None = None):
     model_name = model_override or os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
     return genai.GenerativeModel(model_name)
 
-def _to_gemini_contents(messages):
-    """
-    Convert OpenAI-style {role, content} list into Gemini 'contents'.
-    - user/system -> role='user'
-    - assistant -> role='model'
-    """
-    contents = []
-    for m in messages or []:
-        role = m.get("role", "user")
-        text = m.get("content", "")
-        if not isinstance(text, str) or not text.strip():
-            continue
-        g_role = "user" if role in ("user", "system") else "model"
-        contents.append({"role": g_role, "parts": [text]})
-    # ensure at least one user message
-    if not contents:
-        contents = [{"role": "user", "parts": ["Hello"]}]
-    return contents
-
 @chat_bp.route("/api/chat", methods=["POST"])
 def chat():
     data = request.get_json(force=True) or {}
     messages = data.get("messages", [])
+    message = (data.get("message") or "").strip()
+    conversation_id = data.get("conversation_id")
     temperature = float(data.get("temperature", 0.2))
     max_tokens = int(data.get("max_output_tokens", 1024))
     model_override = data.get("model")
 
     try:
         model = _init_model(model_override)
-        contents = _to_gemini_contents(messages)
+        conv = conversations.get(str(conversation_id), None) if conversation_id else None
+        if conv is None:
+            if not message and messages:
+                # legacy body: the last user entry is the new turn
+                *messages, last = messages
+                message = (last.get("content") or "").strip()
+            conv = conversations.create(None, seed=messages)
+        contents = conversations.history(conv, message or "Hello")
 
-        resp = model.generate_content(
+        caller = get_caller("gemini")
+        resp = caller.call(
+            model.generate_content,
             contents,
             generation_config={
                 "temperature": temperature,
                 "max_output_tokens": max_tokens,
             },
+            request_options={"timeout": caller.timeout_seconds},
         )
         # `resp.text` is the plain text answer
-        return jsonify({"text": getattr(resp, "text", "") or ""})
+        text = getattr(resp, "text", "") or ""
+        conversations.append(conv, message or "Hello", text)
+        return jsonify({"text": text, "conversation_id": conv.conversation_id})
+    except CircuitOpenError as e:
+        get_caller("gemini").record_fallback()
+        return jsonify({"error": str(e)}), 503
     except Exception as e:
         return jsonify({"error": str(e)}), 500
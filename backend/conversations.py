@@ -0,0 +1,158 @@
+# backend/conversations.py
+"""
+Server-side chat sessions for /api/chat.
+
+Clients send `{conversation_id, message}` instead of replaying the whole
+transcript. Each conversation keeps up to `max_turns` messages verbatim.
+Past that, the older half is folded into a rolling, size-capped summary by
+`summarizer(summary, evicted_turns, max_chars)`, so the prompt stays roughly
+constant in size no matter how long the session runs. Folding half at a
+time means the summarizer runs once every few exchanges, not every turn.
+
+The app installs a Gemini summarizer (backend/app.py `_summarize_turns`);
+the default here, `clipped_transcript`, is not a summary: it only keeps a
+clipped line per older message and is what the app falls back to when
+Gemini is unavailable.
+
+The store is per-process and bounded: least-recently-used conversations are
+evicted once `max_conversations` is reached, and idle ones expire after
+`ttl_seconds`. A client whose conversation was evicted simply gets a new
+`conversation_id` back.
+"""
+from __future__ import annotations
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _to_gemini_role(role: str) -> str:
+    # user/system -> user, assistant/model -> model (same rule as chat_api)
+    return "model" if role in ("assistant", "model") else "user"
+
+
+def transcript(turns: List[Dict[str, str]], clip: int | None = None) -> str:
+    """"User: ..." / "Assistant: ..." lines, each optionally clipped to `clip` characters."""
+    lines = []
+    for t in turns:
+        who = "User" if t["role"] == "user" else "Assistant"
+        text = " ".join(t["content"].split())
+        if clip and len(text) > clip:
+            text = text[:clip - 3] + "..."
+        lines.append(f"{who}: {text}")
+    return "\n".join(lines)
+
+
+def clipped_transcript(summary: str, evicted: List[Dict[str, str]], max_chars: int) -> str:
+    """Fallback "summary": the previous one plus one clipped line per evicted message, newest text kept."""
+    out = "\n".join(part for part in (summary, transcript(evicted, clip=160)) if part)
+    return out[-max_chars:] if len(out) > max_chars else out
+
+
+@dataclass
+class Conversation:
+    conversation_id: str
+    user_id: Optional[int]
+    summary: str = ""
+    turns: List[Dict[str, str]] = field(default_factory=list)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ConversationStore:
+    """Bounded LRU of conversations with rolling summaries."""
+
+    def __init__(
+        self,
+        max_conversations: int = 1000,
+        max_turns: int = 10,
+        ttl_seconds: float = 3600.0,
+        summary_max_chars: int = 1500,
+        summarizer: Callable[[str, List[Dict[str, str]], int], str] | None = None,
+    ):
+        self.max_conversations = max_conversations
+        self.max_turns = max_turns
+        self.ttl_seconds = ttl_seconds
+        self.summary_max_chars = summary_max_chars
+        self.summarizer = summarizer or clipped_transcript
+        self._items: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._items:
+            cid, conv = next(iter(self._items.items()))
+            if now - conv.last_used < self.ttl_seconds:
+                break
+            del self._items[cid]
+
+    def create(self, user_id: Optional[int], seed: List[Dict[str, Any]] | None = None) -> Conversation:
+        """Start a conversation, optionally seeded with a legacy client-side transcript."""
+        conv = Conversation(conversation_id=secrets.token_urlsafe(16), user_id=user_id)
+        for m in seed or []:
+            content = m.get("content", "")
+            if isinstance(content, str) and content.strip():
+                conv.turns.append({"role": _to_gemini_role(m.get("role", "user")), "content": content})
+        self._fold(conv)
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            self._items[conv.conversation_id] = conv
+            while len(self._items) > self.max_conversations:
+                self._items.popitem(last=False)
+        return conv
+
+    def get(self, conversation_id: str, user_id: Optional[int]) -> Conversation | None:
+        """Return the conversation if it exists and belongs to `user_id`."""
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            conv = self._items.get(conversation_id)
+            if conv is None or conv.user_id != user_id:
+                return None
+            conv.last_used = now
+            self._items.move_to_end(conversation_id)
+            return conv
+
+    def history(self, conv: Conversation, message: str) -> List[Dict[str, Any]]:
+        """Gemini `contents` for the next turn: summary, recent turns, then `message`."""
+        contents: List[Dict[str, Any]] = []
+        if conv.summary:
+            contents.append({"role": "user", "parts": ["Summary of our earlier conversation:\n" + conv.summary]})
+            contents.append({"role": "model", "parts": ["Understood."]})
+        for t in conv.turns:
+            contents.append({"role": t["role"], "parts": [t["content"]]})
+        contents.append({"role": "user", "parts": [message]})
+        return contents
+
+    def append(self, conv: Conversation, user_text: str, reply: str) -> None:
+        """Record a turn; may call the summarizer (a Gemini round-trip in the app), outside the store lock."""
+        with self._lock:
+            conv.turns.append({"role": "user", "content": user_text})
+            conv.turns.append({"role": "model", "content": reply})
+            conv.last_used = time.monotonic()
+        self._fold(conv)
+
+    def _fold(self, conv: Conversation) -> None:
+        with self._lock:
+            if len(conv.turns) <= self.max_turns:
+                return
+            split = len(conv.turns) - self.max_turns // 2
+            evicted, conv.turns = conv.turns[:split], conv.turns[split:]
+            previous = conv.summary
+        summary = self.summarizer(previous, evicted, self.summary_max_chars)
+        with self._lock:
+            conv.summary = summary[:self.summary_max_chars]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"conversations": len(self._items)}
+
+
+store = ConversationStore(
+    max_conversations=int(os.getenv("CHAT_MAX_CONVERSATIONS", "1000")),
+    max_turns=int(os.getenv("CHAT_MAX_TURNS", "10")),
+    ttl_seconds=float(os.getenv("CHAT_TTL_SECONDS", "3600")),
+)
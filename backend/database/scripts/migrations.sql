@@ -0,0 +1,37 @@
+-- Incremental changes for databases created from an older schema.sql.
+-- Fresh installs get all of this from schema.sql; run each block once, in order.
+USE jobhunter_ai;
+
+-- Local job catalog: normalized filter columns + full-text index
+ALTER TABLE jobs
+    ADD COLUMN job_type VARCHAR(20),
+    ADD COLUMN experience_level VARCHAR(10),
+    ADD COLUMN salary_min INT,
+    ADD COLUMN salary_max INT,
+    ADD COLUMN fetched_at TIMESTAMP NULL,
+    ADD FULLTEXT KEY ft_jobs_title_desc (title, description);
+
+-- Keyset pagination for saved/applied lists
+ALTER TABLE saved_jobs ADD INDEX idx_saved_user_date (user_id, date_saved DESC, saved_job_id DESC);
+ALTER TABLE applied_jobs ADD INDEX idx_applied_user_date (user_id, applied_at DESC, applied_id DESC);
+
+-- Indexed filtering and sorting on the normalized job columns
+ALTER TABLE jobs
+    ADD INDEX idx_jobs_type_exp_posted (job_type, experience_level, posted_at),
+    ADD INDEX idx_jobs_salary (salary_min, salary_max),
+    ADD INDEX idx_jobs_posted (posted_at);
+
+-- Near-duplicate detection: fingerprint of title/company/location + description SimHash.
+-- Existing rows get both on their next upsert.
+ALTER TABLE jobs
+    ADD COLUMN fingerprint CHAR(40),
+    ADD COLUMN simhash BIGINT UNSIGNED,
+    ADD INDEX idx_jobs_fingerprint (fingerprint);
+
+-- Skills and term vectors extracted at upsert time; the multi-valued index
+-- serves `'python' MEMBER OF (skills)` / JSON_OVERLAPS lookups (MySQL 8.0.17+).
+-- Existing rows get both on their next upsert.
+ALTER TABLE jobs
+    ADD COLUMN skills JSON,
+    ADD COLUMN term_vector JSON,
+    ADD INDEX idx_jobs_skills ((CAST(skills AS CHAR(64) ARRAY)));
@@ -103,8 +103,26 @@ CREATE TABLE IF NOT EXISTS jobs (
     salary_range VARCHAR(100),
     source ENUM('internal','api') DEFAULT 'internal',
     posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE KEY uq_job_unique (title, company_name, location, url)
-);
+    -- normalized at upsert time so the local catalog can filter in SQL
+    job_type VARCHAR(20),
+    experience_level VARCHAR(10),
+    salary_min INT,
+    salary_max INT,
+    fetched_at TIMESTAMP NULL,
+    -- near-duplicate detection (backend/job_dedup.py)
+    fingerprint CHAR(40),
+    simhash BIGINT UNSIGNED,
+    -- extracted once at upsert (backend/skills.py): canonical skill names, term -> weight
+    skills JSON,
+    term_vector JSON,
+    UNIQUE KEY uq_job_unique (title, company_name, location, url),
+    INDEX idx_jobs_type_exp_posted (job_type, experience_level, posted_at),
+    INDEX idx_jobs_salary (salary_min, salary_max),
+    INDEX idx_jobs_posted (posted_at),
+    INDEX idx_jobs_fingerprint (fingerprint),
+    INDEX idx_jobs_skills ((CAST(skills AS CHAR(64) ARRAY))),
+    FULLTEXT KEY ft_jobs_title_desc (title, description)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 -- 8. JOB RECOMMENDATIONS
 CREATE TABLE IF NOT EXISTS job_recommendations (
@@ -128,7 +146,9 @@ CREATE TABLE IF NOT EXISTS saved_jobs (
     notes VARCHAR(255),
     CONSTRAINT fk_savedjobs_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     CONSTRAINT fk_savedjobs_job  FOREIGN KEY (job_id)  REFERENCES jobs(job_id) ON DELETE CASCADE,
-    UNIQUE KEY uq_user_job (user_id, job_id)
+    UNIQUE KEY uq_user_job (user_id, job_id),
+    -- keyset pagination: WHERE user_id=? ORDER BY date_saved DESC, saved_job_id DESC
+    INDEX idx_saved_user_date (user_id, date_saved DESC, saved_job_id DESC)
 );
 
 -- 10. APPLIED JOBS
@@ -141,6 +161,8 @@ CREATE TABLE IF NOT EXISTS applied_jobs (
         REFERENCES users(id) ON DELETE CASCADE,
     CONSTRAINT fk_appliedjobs_job FOREIGN KEY (job_id)
         REFERENCES jobs(job_id) ON DELETE CASCADE,
-    UNIQUE KEY uq_applied_user_job (user_id, job_id)
+    UNIQUE KEY uq_applied_user_job (user_id, job_id),
+    -- keyset pagination: WHERE user_id=? ORDER BY applied_at DESC, applied_id DESC
+    INDEX idx_applied_user_date (user_id, applied_at DESC, applied_id DESC)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
@@ -0,0 +1,92 @@
+# backend/gunicorn.conf.py
+"""
+Production server profile (gunicorn).
+
+    gunicorn -c backend/gunicorn.conf.py backend.app:app
+
+The master imports the app once (`preload_app`): the Flask app, compiled
+regexes, the skill vocabulary and taxonomy matcher, the Gemini config, the
+lazily imported dependencies (ml/lazy.py) and a warm-up parse all happen
+before forking, so workers start in
+milliseconds and share those pages copy-on-write. Each worker then runs
+`init_worker()` to get its own DB connection and background threads.
+
+Sizing (override with env):
+  WEB_WORKERS           processes; default = CPU count. Resume parsing is
+                        CPU-bound and only scales with processes.
+  WEB_THREADS           request threads per worker (gthread); default 8.
+                        Searches mostly wait on Adzuna/MySQL, so threads
+                        add I/O capacity cheaply.
+  WEB_MAX_REQUESTS      recycle a worker after this many requests (+ up to
+                        WEB_MAX_REQUESTS_JITTER) to cap memory creep from
+                        caches and fragmentation; default 2000 / 200.
+  WEB_TIMEOUT           seconds before a silent worker is killed; default 120
+                        (cover letters wait on Gemini).
+  WEB_GRACEFUL_TIMEOUT  seconds in-flight requests get on reload/shutdown.
+  WEB_WORKER_CLASS      "gthread" (default), or "uvicorn.workers.UvicornWorker"
+                        with `backend.asgi:app` for the async mode.
+
+Rate limits (backend/rate_limit.py) must be shared by the workers, or each
+worker admits the full "global" Adzuna/Gemini quota and N workers spend N
+times it. This profile therefore defaults RATE_LIMIT_BACKEND to a sqlite
+file on the host (RATE_LIMIT_DB_PATH, default /tmp/jobhunter-ratelimit.db);
+set RATE_LIMIT_BACKEND=memory only for a single worker. The catalog
+refresher's CATALOG_REFRESH_BUDGET_PER_HOUR is still per worker.
+
+Without MySQL the memory store lives inside each worker, so several workers
+would each see different users and resumes. Memory mode therefore defaults
+to one worker that is never recycled. With MEM_SNAPSHOT_PATH a worker saves
+the store when it exits and its replacement loads it, so data survives
+recycling and restarts (not HUP, where the new worker starts first).
+
+Graceful reload: `kill -HUP <master pid>` starts fresh workers with the
+current config/env and lets the old ones finish their requests. Because the
+app is preloaded, HUP does not pick up new code; for a deploy send USR2
+(starts a new master with the new code), then TERM to the old master.
+"""
+import os
+
+# read by backend/app.py at import: defer per-process startup to init_worker()
+os.environ["APP_PREFORK"] = "1"
+# one token bucket store for all workers (see above); read when the app is imported
+os.environ.setdefault(
+    "RATE_LIMIT_BACKEND", "sqlite:///" + os.getenv("RATE_LIMIT_DB_PATH", "/tmp/jobhunter-ratelimit.db"))
+
+_cpus = os.cpu_count() or 1
+_memory_mode = not all(os.getenv(k) for k in ["DB_HOST", "DB_USER", "DB_NAME"])
+
+bind = os.getenv("WEB_BIND", f"0.0.0.0:{os.getenv('PORT', '5001')}")
+backlog = int(os.getenv("WEB_BACKLOG", "2048"))
+worker_class = os.getenv("WEB_WORKER_CLASS", "gthread")
+workers = int(os.getenv("WEB_WORKERS", "1" if _memory_mode else str(_cpus)))
+threads = int(os.getenv("WEB_THREADS", "8"))
+preload_app = True
+
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "0" if _memory_mode else "2000"))
+max_requests_jitter = int(os.getenv("WEB_MAX_REQUESTS_JITTER", "200"))
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("WEB_KEEPALIVE", "5"))
+
+pidfile = os.getenv("WEB_PIDFILE") or None
+accesslog = os.getenv("WEB_ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.getenv("WEB_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    from backend import app as backend_app
+
+    stats = backend_app.warm_up()
+    server.log.info("preloaded app: %d workers x %d threads (%s), warm-up (imports + parse) %.1f ms",
+                    workers, threads, worker_class, stats["ms"])
+
+
+def post_fork(server, worker):
+    from backend import app as backend_app
+
+    backend_app.init_worker()
+
+
+def worker_abort(worker):
+    worker.log.warning("worker %s timed out after %ss", worker.pid, timeout)
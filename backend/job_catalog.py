@@ -0,0 +1,179 @@
+# backend/job_catalog.py
+"""
+Local job catalog search.
+
+Every job returned by Adzuna is upserted into `jobs`, so repeated or similar
+queries can be answered from our own copy. Two engines share one interface,
+`search(...) -> (rows, total, newest_fetch)`:
+
+- MySQL: FULLTEXT index on (title, description), filters and the count run in SQL
+- memory mode: an embedded SQLite database with an FTS5 index, filled by
+  `upsert()` as searches come in
+
+Rows come back with the same keys in both engines:
+job_id, title, company, location, url, description, category, job_type,
+experience_level, salary_min, salary_max, posted_at, skills (JSON array text),
+fetched_at (epoch seconds).
+
+`sort` is one of SORTS: relevance (default), newest (posted_at) or salary.
+"""
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+SearchResult = Tuple[List[Dict[str, Any]], int, float | None]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+SORTS = ("relevance", "newest", "salary")
+
+
+def _tokens(query: str, min_len: int = 1) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((query or "").lower()) if len(t) >= min_len]
+
+
+def _filters(alias: str, job_type: str, experience: str, salary_min, salary_max,
+             location: str) -> Tuple[List[str], List[Any]]:
+    """WHERE fragments shared by both engines (placeholders are rewritten for SQLite)."""
+    where, params = [], []
+    if job_type:
+        where.append(f"{alias}job_type = %s")
+        params.append(job_type)
+    if experience:
+        where.append(f"{alias}experience_level = %s")
+        params.append(experience)
+    if salary_min:
+        # salary ranges overlap the requested range
+        where.append(f"{alias}salary_max >= %s")
+        params.append(float(salary_min))
+    if salary_max:
+        where.append(f"{alias}salary_min <= %s")
+        params.append(float(salary_max))
+    if location:
+        where.append(f"{alias}location LIKE %s")
+        params.append(f"%{location}%")
+    return where, params
+
+
+def mysql_search(cursor, query: str, location: str = "", job_type: str = "", experience: str = "",
+                 salary_min=None, salary_max=None, page: int = 1, per_page: int = 30,
+                 sort: str = "relevance") -> SearchResult:
+    """Full-text search over `jobs` with filters and a true filtered total."""
+    # InnoDB ignores tokens shorter than innodb_ft_min_token_size (3 by default)
+    words = _tokens(query, min_len=3)
+    where, params = _filters("", job_type, experience, salary_min, salary_max, location)
+    if words:
+        boolean_q = " ".join(f"+{w}*" for w in words)
+        where.insert(0, "MATCH(title, description) AGAINST (%s IN BOOLEAN MODE)")
+        params.insert(0, boolean_q)
+        order = "MATCH(title, description) AGAINST (%s IN BOOLEAN MODE) DESC, posted_at DESC"
+        order_params = [boolean_q]
+    else:
+        where.insert(0, "title LIKE %s")
+        params.insert(0, f"%{query}%")
+        order, order_params = "posted_at DESC", []
+    if sort == "newest":
+        order, order_params = "posted_at DESC, job_id DESC", []
+    elif sort == "salary":
+        order, order_params = "salary_max IS NULL, salary_max DESC, job_id DESC", []
+    where_sql = " AND ".join(where)
+
+    cursor.execute(
+        f"SELECT COUNT(*) AS n, UNIX_TIMESTAMP(MAX(fetched_at)) AS newest FROM jobs WHERE {where_sql}",
+        tuple(params),
+    )
+    agg = cursor.fetchone() or {}
+    total = int(agg.get("n") or 0)
+    if not total:
+        return [], 0, None
+
+    cursor.execute(
+        f"""
+        SELECT job_id, title, company_name AS company, location, url, description,
+               industry AS category, job_type, experience_level, salary_min, salary_max,
+               posted_at, skills, UNIX_TIMESTAMP(fetched_at) AS fetched_at
+        FROM jobs WHERE {where_sql}
+        ORDER BY {order}
+        LIMIT %s OFFSET %s
+        """,
+        tuple(params + order_params + [per_page, (page - 1) * per_page]),
+    )
+    newest = agg.get("newest")
+    return cursor.fetchall(), total, float(newest) if newest is not None else None
+
+
+class MemoryCatalog:
+    """SQLite FTS5 catalog for memory mode (one per process, thread-safe)."""
+
+    def __init__(self):
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._conn.executescript(
+            """
+            CREATE TABLE jobs (
+                job_id INTEGER PRIMARY KEY,
+                title TEXT, company TEXT, location TEXT, url TEXT, description TEXT,
+                category TEXT, job_type TEXT, experience_level TEXT,
+                salary_min REAL, salary_max REAL, posted_at TEXT, skills TEXT, fetched_at REAL
+            );
+            CREATE INDEX idx_jobs_type_exp ON jobs (job_type, experience_level, posted_at);
+            CREATE INDEX idx_jobs_salary ON jobs (salary_min, salary_max);
+            CREATE VIRTUAL TABLE jobs_fts USING fts5(title, description);
+            """
+        )
+
+    def upsert(self, job_id: int, job: Dict[str, Any]) -> None:
+        row = (
+            job_id, job.get("title"), job.get("company"), job.get("location"), job.get("url"),
+            job.get("full_description") or job.get("description") or "", job.get("category"),
+            job.get("type") or "", job.get("experience_level") or "",
+            job.get("salary_min"), job.get("salary_max"), job.get("posted_at"),
+            json.dumps(job["skills"]) if job.get("skills") is not None else None, time.time(),
+        )
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO jobs VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)", row)
+            self._conn.execute("DELETE FROM jobs_fts WHERE rowid = ?", (job_id,))
+            self._conn.execute(
+                "INSERT INTO jobs_fts (rowid, title, description) VALUES (?, ?, ?)",
+                (job_id, row[1] or "", row[5]),
+            )
+
+    def delete(self, job_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM jobs_fts WHERE rowid = ?", (job_id,))
+
+    def search(self, query: str, location: str = "", job_type: str = "", experience: str = "",
+               salary_min=None, salary_max=None, page: int = 1, per_page: int = 30,
+               sort: str = "relevance") -> SearchResult:
+        words = _tokens(query)
+        where, params = _filters("j.", job_type, experience, salary_min, salary_max, location)
+        if not words:
+            return [], 0, None
+        # quote every token so FTS5 operators in user input are treated as text
+        where.insert(0, "jobs_fts MATCH ?")
+        params.insert(0, " ".join(f'"{w}"*' for w in words))
+        where_sql = " AND ".join(where).replace("%s", "?")
+        base = f"FROM jobs_fts JOIN jobs j ON j.job_id = jobs_fts.rowid WHERE {where_sql}"
+        order = {
+            "newest": "j.posted_at DESC, j.job_id DESC",
+            "salary": "j.salary_max IS NULL, j.salary_max DESC, j.job_id DESC",
+        }.get(sort, "bm25(jobs_fts), j.posted_at DESC")
+
+        with self._lock:
+            agg = self._conn.execute(f"SELECT COUNT(*), MAX(j.fetched_at) {base}", params).fetchone()
+            total, newest = int(agg[0] or 0), agg[1]
+            rows = self._conn.execute(
+                f"SELECT j.* {base} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [per_page, (page - 1) * per_page],
+            ).fetchall()
+        return [dict(r) for r in rows], total, newest
+
+
+memory_catalog = MemoryCatalog()
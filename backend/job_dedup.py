@@ -0,0 +1,131 @@
+# backend/job_dedup.py
+"""
+Near-duplicate detection for job postings.
+
+`uq_job_unique (title, company_name, location, url)` misses reposts: the same
+job comes back from Adzuna under a new tracking `redirect_url` and becomes a
+new row. Two jobs are treated as the same posting when
+
+- their fingerprints match: sha1 of the normalized title, company and
+  location (lowercased, punctuation and company suffixes like "Inc" removed)
+- and the SimHash signatures of their descriptions are within
+  `max_distance` bits (Hamming distance) of each other
+
+SimHash is used rather than MinHash because its 64-bit signature fits a
+single BIGINT column, and the fingerprint index already narrows candidates
+down to a handful per posting.
+
+Because candidates already share a fingerprint the distance can be generous:
+unrelated descriptions land ~32 bits apart, lightly edited reposts of a short
+Adzuna snippet ~8 (see benchmarks/dedup_signatures.py).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_COMPANY_SUFFIX_RE = re.compile(r"\b(inc|llc|ltd|limited|corp|corporation|co|company|plc|gmbh|lp|llp)\b")
+
+SIGNATURE_BITS = 64
+_SHINGLE = 3
+
+
+def _normalize(s: str | None) -> str:
+    return " ".join(_WORD_RE.findall((s or "").lower()))
+
+
+def fingerprint(title: str | None, company: str | None, location: str | None) -> str:
+    company_norm = " ".join(_COMPANY_SUFFIX_RE.sub(" ", _normalize(company)).split())
+    blob = "\x1f".join((_normalize(title), company_norm, _normalize(location)))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def simhash(text: str | None) -> int:
+    """64-bit SimHash over word 3-gram shingles (each shingle counted once)."""
+    tokens = _WORD_RE.findall((text or "").lower())
+    shingles = {" ".join(tokens[i:i + _SHINGLE]) for i in range(max(1, len(tokens) - _SHINGLE + 1))}
+    digests = b"".join([hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest() for s in shingles])
+    # one '0'/'1' character per bit, shingle after shingle; bit i of every
+    # shingle is then the slice bits[i::64], which str.count tallies in C
+    bits = bin(int.from_bytes(digests, "big") | (1 << len(digests) * 8))[3:]
+    half = len(shingles) / 2
+    sig = 0
+    for i in range(SIGNATURE_BITS):
+        sig = (sig << 1) | (bits[i::SIGNATURE_BITS].count("1") > half)
+    return sig
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def closest(candidates: Iterable[Tuple[int, int | None]], sig: int, max_distance: int) -> int | None:
+    """Id of the (id, signature) candidate nearest to `sig` within `max_distance`, else None."""
+    best, best_d = None, max_distance + 1
+    for job_id, other in candidates:
+        if other is None:
+            continue
+        d = hamming(sig, int(other))
+        if d < best_d:
+            best, best_d = job_id, d
+    return best
+
+
+class DedupIndex:
+    """
+    Signatures of known jobs by fingerprint (memory mode) and dedup counters
+    (both modes). In MySQL mode candidates come from the indexed
+    `fingerprint` column instead.
+    """
+
+    def __init__(self, max_distance: int = 12):
+        self.max_distance = max_distance
+        self._by_fp: Dict[str, List[Tuple[int, int]]] = {}
+        self._fp_of: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self.stats = {"seen": 0, "duplicates_in_page": 0, "duplicates_in_catalog": 0}
+
+    def match(self, fp: str, sig: int) -> int | None:
+        with self._lock:
+            return closest(self._by_fp.get(fp, ()), sig, self.max_distance)
+
+    def add(self, fp: str, sig: int, job_id: int) -> None:
+        with self._lock:
+            self._drop(job_id)
+            self._by_fp.setdefault(fp, []).append((job_id, sig))
+            self._fp_of[job_id] = fp
+
+    def discard(self, job_id: int) -> None:
+        """Forget a job that left the memory store, so its id is never matched again."""
+        with self._lock:
+            self._drop(job_id)
+
+    def _drop(self, job_id: int) -> None:
+        fp = self._fp_of.pop(job_id, None)
+        if fp is None:
+            return
+        entries = [e for e in self._by_fp.get(fp, ()) if e[0] != job_id]
+        if entries:
+            self._by_fp[fp] = entries
+        else:
+            self._by_fp.pop(fp, None)
+
+    def record(self, seen: int, in_page: int, in_catalog: int) -> None:
+        with self._lock:
+            self.stats["seen"] += seen
+            self.stats["duplicates_in_page"] += in_page
+            self.stats["duplicates_in_catalog"] += in_catalog
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            out = dict(self.stats, fingerprints=len(self._by_fp))
+        dupes = out["duplicates_in_page"] + out["duplicates_in_catalog"]
+        out["dedup_ratio"] = round(dupes / out["seen"], 3) if out["seen"] else 0.0
+        return out
+
+
+dedup_index = DedupIndex(max_distance=int(os.getenv("JOB_DEDUP_MAX_DISTANCE", "12")))
@@ -0,0 +1,57 @@
+# backend/json_provider.py
+"""
+Flask JSON provider that uses orjson when it is installed.
+
+Both paths produce the same output for what MySQL rows contain, and the
+same as Flask's own provider: datetime/date -> RFC 822 HTTP date
+("Tue, 01 Oct 2024 12:00:00 GMT", naive values taken as UTC),
+Decimal -> string, timedelta -> "H:MM:SS". orjson is told to pass
+dates through to `_default` instead of writing its zone-less ISO strings.
+Keys are sorted (as Flask does by default) so ETags stay stable.
+"""
+from __future__ import annotations
+
+import decimal
+from datetime import timedelta
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider, _default as _flask_default
+
+try:  # optional speedup
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(o: Any) -> Any:
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, timedelta):
+        return str(o)
+    # date/datetime -> http_date, like Flask
+    return _flask_default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+
+    def _orjson_options(self, pretty: bool) -> int:
+        opts = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if pretty:
+            opts |= orjson.OPT_INDENT_2
+        return opts
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            # callers passing stdlib options (cls=, indent=...) get the stdlib encoder
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._orjson_options(False)).decode()
+
+    def response(self, *args: Any, **kwargs: Any):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        # bytes straight into the response: no str round-trip
+        body = orjson.dumps(obj, default=_default, option=self._orjson_options(pretty) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
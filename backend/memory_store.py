@@ -0,0 +1,172 @@
+# backend/memory_store.py
+"""
+The in-memory fallback store used when MySQL is not configured.
+
+`MEM` used to be a plain dict of dicts that only ever grew: every searched
+job, every resume text and every generated cover letter stayed until the
+process died, and id counters were bumped with unsynchronized `+= 1`.
+
+`MemoryStore` keeps one `BoundedCollection` per kind of record. A collection
+behaves like a dict (`store["resumes"][rid]`, `.get`, `in`, `del`), is
+guarded by a lock and evicts least-recently-used entries once it holds more
+than `max_items` records or roughly `max_bytes` of data. Sizes are estimated
+when a record is stored, so change records by assigning a new value rather
+than mutating the stored dict in place. `next_id()` hands out ids
+atomically. `append()` collections (job recommendations) are plain
+bounded logs.
+
+The store can be saved to and reloaded from a JSON file (MEM_SNAPSHOT_PATH),
+which keeps a dev or demo instance's data across restarts.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterator, List, MutableMapping, Tuple
+
+
+def approx_size(value: Any) -> int:
+    """Rough payload size in bytes: string/bytes lengths plus a small per-object overhead."""
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value) + 48
+    if isinstance(value, dict):
+        return 64 + sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return 56 + sum(approx_size(v) for v in value)
+    return 24
+
+
+class BoundedCollection(MutableMapping):
+    def __init__(self, name: str, max_items: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 on_evict: Callable[[Any, Any], None] | None = None):
+        self.name = name
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Any, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.evictions = 0
+
+    def __getitem__(self, key):
+        with self._lock:
+            value, _ = self._data[key]
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value) -> None:
+        size = approx_size(value)
+        evicted: List[Tuple[Any, Any]] = []
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            # never evict the record just stored, even if it alone is over max_bytes
+            while len(self._data) > 1 and (len(self._data) > self.max_items or self._bytes > self.max_bytes):
+                k, (v, s) = self._data.popitem(last=False)
+                self._bytes -= s
+                self.evictions += 1
+                evicted.append((k, v))
+        if self.on_evict is not None:
+            for k, v in evicted:
+                self.on_evict(k, v)
+
+    def __delitem__(self, key) -> None:
+        with self._lock:
+            _, size = self._data.pop(key)
+            self._bytes -= size
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator:
+        with self._lock:
+            return iter(list(self._data))
+
+    # snapshots that don't count as "use" for the LRU order
+    def items(self) -> List[Tuple[Any, Any]]:  # type: ignore[override]
+        with self._lock:
+            return [(k, v) for k, (v, _) in self._data.items()]
+
+    def values(self) -> List[Any]:  # type: ignore[override]
+        with self._lock:
+            return [v for v, _ in self._data.values()]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"items": len(self._data), "approx_bytes": self._bytes, "evictions": self.evictions,
+                    "max_items": self.max_items, "max_bytes": self.max_bytes}
+
+
+class MemoryStore:
+    def __init__(self, limits: Dict[str, Tuple[int, int]], log_limits: Dict[str, int] | None = None):
+        self.collections = {name: BoundedCollection(name, *lim) for name, lim in limits.items()}
+        self.logs = {name: deque(maxlen=n) for name, n in (log_limits or {}).items()}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> BoundedCollection:
+        return self.collections[name]
+
+    def get(self, name: str, default=None):
+        return self.collections.get(name, default)
+
+    def next_id(self, name: str) -> int:
+        with self._lock:
+            n = self._counters.get(name, 1)
+            self._counters[name] = n + 1
+            return n
+
+    def append(self, log: str, record: Dict[str, Any]) -> None:
+        self.logs[log].append(record)
+
+    def snapshot(self) -> Dict[str, Any]:
+        out = {name: c.stats() for name, c in self.collections.items()}
+        out.update({name: {"items": len(d), "max_items": d.maxlen} for name, d in self.logs.items()})
+        out["approx_bytes"] = sum(c["approx_bytes"] for c in out.values() if "approx_bytes" in c)
+        return out
+
+    # -------- snapshot to disk --------
+    def save(self, path: str) -> None:
+        """Write every collection to `path` (JSON, written to a temp file and renamed)."""
+        with self._lock:
+            counters = dict(self._counters)
+        blob = {
+            "counters": counters,
+            # keys are kept as [key, value] pairs so int and tuple keys survive JSON
+            "collections": {name: [[k, v] for k, v in c.items()] for name, c in self.collections.items()},
+            "logs": {name: list(d) for name, d in self.logs.items()},
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(blob, f, default=str)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with open(path, encoding="utf-8") as f:
+                blob = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"memory store snapshot {path} not loaded: {e}", file=sys.stderr)
+            return False
+        with self._lock:
+            self._counters.update(blob.get("counters") or {})
+        for name, pairs in (blob.get("collections") or {}).items():
+            if name in self.collections:
+                for k, v in pairs:
+                    self.collections[name][tuple(k) if isinstance(k, list) else k] = v
+        for name, records in (blob.get("logs") or {}).items():
+            if name in self.logs:
+                self.logs[name].extend(records)
+        return True
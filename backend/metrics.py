@@ -0,0 +1,314 @@
+# backend/metrics.py
+"""
+Prometheus metrics for `GET /metrics` (text exposition format 0.0.4).
+
+Recording is lock-free: every thread writes its counters and histogram
+buckets into its own dict (a "shard", created on the thread's first
+observation), so request threads never contend with each other or with a
+scrape. `render()` copies each shard and sums them; shards of threads that
+have exited are folded into a retired total so their counts are kept.
+A scrape may see a histogram mid-update (bucket bumped, sum not yet), which
+the next scrape corrects.
+
+Besides the counters, gauges and histograms defined here, `register_callback()`
+exposes values read at scrape time from the existing snapshots (cache hit
+ratios, single-flight calls in flight...).
+
+Metrics are per process: under the gunicorn profile every worker has its
+own, so scrape each worker or sum in Prometheus.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from flask import g, has_request_context
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds; Adzuna/Gemini calls take up to the 10-30 s deadlines
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_Key = Tuple[str, Tuple[str, ...]]
+
+_lock = threading.Lock()
+_local = threading.local()
+_shards: List[Tuple[threading.Thread, Dict[_Key, Any]]] = []
+_retired: Dict[_Key, Any] = {}
+_metrics: Dict[str, "_Metric"] = {}
+
+
+def _shard() -> Dict[_Key, Any]:
+    try:
+        return _local.shard
+    except AttributeError:
+        shard: Dict[_Key, Any] = {}
+        with _lock:
+            _shards.append((threading.current_thread(), shard))
+        _local.shard = shard
+        return shard
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        with _lock:
+            if name in _metrics:
+                raise ValueError(f"metric {name} already registered")
+            _metrics[name] = self
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, n: float = 1) -> None:
+        shard = _shard()
+        key = (self.name, labels)
+        shard[key] = shard.get(key, 0) + n
+
+
+class Gauge(Counter):
+    """A counter that may go down; summed across threads like one."""
+    kind = "gauge"
+
+    def dec(self, *labels: str, n: float = 1) -> None:
+        self.inc(*labels, n=-n)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = _shard()
+        key = (self.name, labels)
+        h = shard.get(key)
+        if h is None:
+            # per-bucket counts (last one is +Inf), then the sum
+            h = shard[key] = [0] * (len(self.buckets) + 2)
+        h[bisect_left(self.buckets, value)] += 1
+        h[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+
+class _Callback(_Metric):
+    def __init__(self, name: str, kind: str, help: str, labels: Sequence[str],
+                 fn: Callable[[], Dict[Tuple[str, ...], float]]):
+        super().__init__(name, help, labels)
+        self.kind = kind
+        self.fn = fn
+
+
+def register_callback(name: str, kind: str, help: str, labels: Sequence[str],
+                      fn: Callable[[], Dict[Tuple[str, ...], float]]) -> None:
+    """Expose `fn()` ({label values: value}), called at scrape time, as a gauge or counter."""
+    _Callback(name, kind, help, labels, fn)
+
+
+# -----------------------------
+# Collection / exposition
+# -----------------------------
+def _merge(into: Dict[_Key, Any], shard: Dict[_Key, Any]) -> None:
+    for key, value in shard.items():
+        if isinstance(value, list):
+            total = into.get(key)
+            if total is None:
+                into[key] = list(value)
+            else:
+                for i, v in enumerate(value):
+                    total[i] += v
+        else:
+            into[key] = into.get(key, 0) + value
+
+
+def collect() -> Dict[_Key, Any]:
+    """Current totals across threads: {(name, label values): number or histogram list}."""
+    with _lock:
+        live = []
+        for thread, shard in _shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                # the thread is gone, so nothing writes to its shard any more
+                _merge(_retired, shard)
+        _shards[:] = live
+        totals: Dict[_Key, Any] = {}
+        _merge(totals, _retired)
+    for _, shard in live:
+        # dict.copy() is atomic under the GIL; histogram lists are copied by _merge
+        _merge(totals, shard.copy())
+    return totals
+
+
+def _fmt(v: float) -> str:
+    if isinstance(v, int):
+        return str(v)
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    if math.isnan(v):
+        return "NaN"
+    return repr(float(v))
+
+
+def _escape(v: Any) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render() -> str:
+    totals = collect()
+    by_metric: Dict[str, List[Tuple[Tuple[str, ...], Any]]] = {}
+    for (name, labels), value in totals.items():
+        by_metric.setdefault(name, []).append((labels, value))
+    with _lock:
+        metrics = list(_metrics.values())
+
+    lines: List[str] = []
+    for m in metrics:
+        if isinstance(m, _Callback):
+            try:
+                samples = sorted(m.fn().items())
+            except Exception as e:  # a broken snapshot must not take the whole scrape down
+                lines.append(f"# {m.name} unavailable: {_escape(e)}")
+                continue
+        else:
+            samples = sorted(by_metric.get(m.name, []))
+        lines.append(f"# HELP {m.name} {m.help}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        for labels, value in samples:
+            if isinstance(m, Histogram):
+                cumulative = 0
+                for bound, count in zip(m.buckets + (math.inf,), value):
+                    cumulative += count
+                    le = 'le="%s"' % _fmt(bound)
+                    lines.append(f"{m.name}_bucket{_labels(m.labels, labels, le)} {cumulative}")
+                lines.append(f"{m.name}_sum{_labels(m.labels, labels)} {_fmt(value[-1])}")
+                lines.append(f"{m.name}_count{_labels(m.labels, labels)} {cumulative}")
+            else:
+                lines.append(f"{m.name}{_labels(m.labels, labels)} {_fmt(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------------
+# Application metrics
+# -----------------------------
+HTTP_REQUESTS = Counter(
+    "jobhunter_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+HTTP_SECONDS = Histogram(
+    "jobhunter_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge(
+    "jobhunter_http_requests_in_flight", "HTTP requests being handled.")
+REQUEST_DB_QUERIES = Histogram(
+    "jobhunter_http_request_db_queries", "MySQL queries per HTTP request.", ("route",), COUNT_BUCKETS)
+REQUEST_DB_SECONDS = Histogram(
+    "jobhunter_http_request_db_seconds", "Time in MySQL queries per HTTP request.", ("route",))
+DB_QUERY_SECONDS = Histogram(
+    "jobhunter_db_query_duration_seconds", "MySQL query latency by statement type.", ("op",))
+UPSTREAM_SECONDS = Histogram(
+    "jobhunter_upstream_request_duration_seconds",
+    "Adzuna and Gemini call latency by outcome (ok, error, timeout, rejected).", ("upstream", "outcome"))
+RESUME_PARSE_SECONDS = Histogram(
+    "jobhunter_resume_parse_duration_seconds", "Resume upload parsing time by file type.", ("format",))
+
+_UNMATCHED = "<unmatched>"
+
+
+def begin_request() -> None:
+    HTTP_IN_FLIGHT.inc()
+    # [started, db queries, db seconds]
+    g._metrics = [time.perf_counter(), 0, 0.0]
+
+
+def end_request(method: str, route: str | None, status: int) -> None:
+    state = g.pop("_metrics", None)
+    if state is None:
+        return
+    HTTP_IN_FLIGHT.dec()
+    # unknown paths share one label so scanners can't blow up the series count
+    route = route or _UNMATCHED
+    HTTP_REQUESTS.inc(method, route, str(status))
+    HTTP_SECONDS.observe(time.perf_counter() - state[0], method, route)
+    REQUEST_DB_QUERIES.observe(state[1], route)
+    REQUEST_DB_SECONDS.observe(state[2], route)
+
+
+def observe_query(sql: str, seconds: float) -> None:
+    op = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "OTHER"
+    if op not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        op = "OTHER"
+    DB_QUERY_SECONDS.observe(seconds, op)
+    state = g.get("_metrics") if has_request_context() else None
+    if state is not None:
+        state[1] += 1
+        state[2] += seconds
+
+
+@contextmanager
+def track_upstream(upstream: str) -> Iterator[None]:
+    """Time an upstream call (works around an `await` too); outcome "error" if it raises."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_SECONDS.observe(time.perf_counter() - started, upstream, outcome)
+
+
+def observe_upstream(upstream: str, outcome: str, seconds: float) -> None:
+    """Observer for ml/resilience.py callers (Gemini)."""
+    UPSTREAM_SECONDS.observe(seconds, upstream, outcome)
+
+
+class TimedCursor:
+    """DB-API cursor proxy: execute()/executemany() are timed into DB_QUERY_SECONDS and the request's totals."""
+
+    __slots__ = ("_cursor",)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, operation, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, *args, **kwargs)
+        finally:
+            observe_query(operation, time.perf_counter() - started)
+
+    def executemany(self, operation, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, *args, **kwargs)
+        finally:
+            observe_query(operation, time.perf_counter() - started)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
@@ -0,0 +1,134 @@
+# backend/password_hasher.py
+"""
+bcrypt on a small, bounded worker pool.
+
+Every hash/check costs ~100-300 ms of CPU at the default cost. Run inline,
+a burst of logins occupies every server thread and starves unrelated
+endpoints. Here at most `workers` hashes run at once (bcrypt releases the
+GIL, so the other request threads keep running). Up to `max_queue` more
+calls may wait for a worker; beyond that callers get `PoolSaturated`
+immediately and the routes answer 503 with Retry-After.
+
+`workers=0` hashes inline on the request thread (the old behaviour).
+
+The cost factor comes from BCRYPT_ROUNDS. Hashes made with another cost
+still verify, and `needs_rehash()` tells the login route to re-hash the
+password once it has been checked.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict
+
+from ml.lazy import lazy_module
+
+bcrypt = lazy_module("bcrypt")
+
+
+class PoolSaturated(Exception):
+    """Raised when the hashing queue is full; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+def _cost(stored: str) -> int | None:
+    # "$2b$12$<salt+hash>"
+    parts = stored.split("$")
+    try:
+        return int(parts[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    def __init__(self, rounds: int = 12, workers: int = 2, max_queue: int = 32, timeout_seconds: float = 10.0):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="bcrypt") if workers > 0 else None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._avg_seconds = 0.25
+        self.stats = {"hashed": 0, "verified": 0, "rehashed": 0, "shed": 0}
+
+    def _run(self, fn: Callable[[], Any]) -> Any:
+        if self._pool is None:
+            return self._timed(fn)
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.stats["shed"] += 1
+                # roughly how long the current backlog takes to drain
+                raise PoolSaturated(self._pending / self.workers * self._avg_seconds)
+            self._pending += 1
+        try:
+            future = self._pool.submit(self._timed, fn)
+        except BaseException:
+            self._release()
+            raise
+        # the slot is freed when the hash is done (or cancelled), not when the caller gives up:
+        # an abandoned hash still occupies a worker until it finishes
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeout:
+            # a call still queued never runs; one already running cannot be stopped
+            future.cancel()
+            with self._lock:
+                self.stats["shed"] += 1
+            raise PoolSaturated(self._avg_seconds) from None
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _timed(self, fn: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._avg_seconds = 0.9 * self._avg_seconds + 0.1 * elapsed
+
+    def hash(self, password: str) -> str:
+        hashed = self._run(lambda: bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.rounds)))
+        with self._lock:
+            self.stats["hashed"] += 1
+        return hashed.decode("utf-8")
+
+    def verify(self, password: str, stored: str) -> bool:
+        ok = self._run(lambda: bcrypt.checkpw(password.encode("utf-8"), stored.encode("utf-8")))
+        with self._lock:
+            self.stats["verified"] += 1
+        return ok
+
+    def needs_rehash(self, stored: str) -> bool:
+        return _cost(stored) != self.rounds
+
+    def count_rehash(self) -> None:
+        with self._lock:
+            self.stats["rehashed"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                self.stats,
+                rounds=self.rounds,
+                workers=self.workers,
+                pending=self._pending,
+                avg_ms=round(self._avg_seconds * 1000, 1),
+            )
+
+
+password_hasher = PasswordHasher(
+    rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+    workers=int(os.getenv("AUTH_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2)))),
+    max_queue=int(os.getenv("AUTH_HASH_MAX_QUEUE", "32")),
+    timeout_seconds=float(os.getenv("AUTH_HASH_TIMEOUT_SECONDS", "10")),
+)
@@ -0,0 +1,285 @@
+# backend/profiling.py
+"""
+Opt-in sampling profiler for single requests.
+
+    python -m backend.profiling summary [--dir /tmp/jobhunter-profiles] [--match jobs_search] [--top 25]
+
+The app starts a `Session` for a request when asked to (see PROFILE_* in
+documents/README.DEV.md): an `X-Profile` header from an admin or carrying
+PROFILE_TOKEN, or a random PROFILE_SAMPLE_RATE share of the requests.
+While any session is open, one sampler thread wakes every
+PROFILE_INTERVAL_MS and records the stack of each profiled request's thread
+from `sys._current_frames()`. Sampling is wall-clock: time blocked on
+MySQL, Adzuna or Gemini shows up as well as CPU time. Other requests'
+threads are not sampled and nothing runs when no request is profiled.
+
+When the request ends its samples are written to PROFILE_DIR as
+  - `<name>.collapsed`: one `root;...;leaf count` line per distinct stack
+    (flamegraph.pl, inferno, speedscope all read it)
+  - `<name>.speedscope.json`: the same stacks for https://www.speedscope.app,
+    weighted by the wall time between samples
+and the oldest profiles beyond PROFILE_MAX_FILES are deleted. The name
+(time, duration, method, route) is returned to the client in `X-Profile-Id`.
+A request that ends before the first sample writes nothing.
+
+Under the ASGI mode async routes share the event loop thread, so their
+profiles also contain whatever other coroutines ran meanwhile.
+
+`summary` adds up the .collapsed files: samples per function where it was
+on top of the stack (self) and anywhere on the stack (total).
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_STDLIB = sysconfig.get_paths()["stdlib"]
+
+_MAX_DEPTH = 200
+_SLUG = re.compile(r"[^A-Za-z0-9]+")
+
+
+def _short_path(path: str) -> str:
+    if path.startswith(ROOT + os.sep):
+        return os.path.relpath(path, ROOT)
+    marker = "site-packages" + os.sep
+    if marker in path:
+        return path.split(marker, 1)[1]
+    if path.startswith(_STDLIB + os.sep):
+        return os.path.relpath(path, _STDLIB)
+    return os.path.basename(path)
+
+
+def _label(code) -> str:
+    # ";" separates frames in the collapsed format
+    name = getattr(code, "co_qualname", code.co_name).replace(";", ":")
+    return f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Session:
+    __slots__ = ("name", "thread_id", "started", "stacks", "seconds")
+
+    def __init__(self, name: str, thread_id: int):
+        self.name = name
+        self.thread_id = thread_id
+        self.started = time.perf_counter()
+        # tuple of code objects, root first -> samples; labelled only when written
+        self.stacks: Dict[Tuple, int] = {}
+        # same keys -> seconds since the previous tick (ticks stretch when the request holds the GIL)
+        self.seconds: Dict[Tuple, float] = {}
+
+    def add(self, frame, seconds: float) -> None:
+        codes = []
+        while frame is not None and len(codes) < _MAX_DEPTH:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        key = tuple(reversed(codes))
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.seconds[key] = self.seconds.get(key, 0.0) + seconds
+
+
+class Profiler:
+    def __init__(self, out_dir: str, interval_ms: float = 5.0, max_files: int = 200, max_concurrent: int = 4):
+        self.out_dir = out_dir
+        self.interval = interval_ms / 1000
+        self.max_files = max_files
+        self.max_concurrent = max_concurrent
+        self._sessions: Dict[int, Session] = {}
+        self._lock = threading.Lock()
+        self._sampler: threading.Thread | None = None
+        self._seq = 0
+        self.stats = {"profiled": 0, "skipped_busy": 0, "too_short": 0, "written": 0, "deleted": 0, "write_failures": 0}
+
+    def start(self, name: str) -> Session | None:
+        """Profile the calling thread until stop(); None when max_concurrent sessions are already open."""
+        session = Session(name, threading.get_ident())
+        with self._lock:
+            if len(self._sessions) >= self.max_concurrent:
+                self.stats["skipped_busy"] += 1
+                return None
+            self._sessions[id(session)] = session
+            self.stats["profiled"] += 1
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._sampler.start()
+        return session
+
+    def stop(self, session: Session) -> str | None:
+        """End the session and write its files; returns the profile name (None if nothing was written)."""
+        with self._lock:
+            if self._sessions.pop(id(session), None) is None:
+                return None
+            self._seq += 1
+            seq = self._seq
+        elapsed_ms = (time.perf_counter() - session.started) * 1000
+        # a sample may land while we copy; dict() of a plain dict is atomic under the GIL
+        stacks, seconds = dict(session.stacks), dict(session.seconds)
+        if not stacks:
+            # finished before the first sample
+            with self._lock:
+                self.stats["too_short"] += 1
+            return None
+        name = "{}-{:06.0f}ms-{}-{}-{}".format(
+            time.strftime("%Y%m%dT%H%M%S"), elapsed_ms, _SLUG.sub("_", session.name).strip("_")[:80], os.getpid(), seq)
+        try:
+            os.makedirs(self.out_dir, exist_ok=True)
+            self._write(name, session.name, stacks, seconds, elapsed_ms)
+            self._prune()
+        except OSError:
+            with self._lock:
+                self.stats["write_failures"] += 1
+            return None
+        return name
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while True:
+            with self._lock:
+                if not self._sessions:
+                    self._sampler = None
+                    return
+                sessions = list(self._sessions.values())
+            frames = sys._current_frames()
+            now = time.perf_counter()
+            for session in sessions:
+                frame = frames.get(session.thread_id)
+                if frame is not None:
+                    session.add(frame, now - max(last, session.started))
+            del frames
+            last = now
+            time.sleep(self.interval)
+
+    def _write(self, name: str, title: str, stacks: Dict[Tuple, int], seconds: Dict[Tuple, float],
+               elapsed_ms: float) -> None:
+        labels: Dict[object, str] = {}
+        for key in stacks:
+            for code in key:
+                if code not in labels:
+                    labels[code] = _label(code)
+
+        base = os.path.join(self.out_dir, name)
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            for key, count in stacks.items():
+                f.write(";".join(labels[c] for c in key) + f" {count}\n")
+
+        index = {code: i for i, code in enumerate(labels)}
+        frames = []
+        for code, label in labels.items():
+            frames.append({"name": label.split(" (", 1)[0], "file": _short_path(code.co_filename),
+                           "line": code.co_firstlineno})
+        weights = [round(seconds.get(key, 0.0) * 1000, 3) for key in stacks]
+        doc = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": "jobhunter backend/profiling.py",
+            "name": f"{title} ({elapsed_ms:.0f} ms)",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": title,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": [[index[c] for c in key] for key in stacks],
+                "weights": weights,
+            }],
+        }
+        with open(base + ".speedscope.json", "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+        with self._lock:
+            self.stats["written"] += 1
+
+    def _prune(self) -> None:
+        profiles = sorted(glob.glob(os.path.join(self.out_dir, "*.collapsed")), key=_mtime)
+        deleted = 0
+        for path in profiles[:max(0, len(profiles) - self.max_files)]:
+            for p in (path, path[:-len(".collapsed")] + ".speedscope.json"):
+                try:
+                    os.remove(p)
+                except FileNotFoundError:
+                    pass
+            deleted += 1
+        if deleted:
+            with self._lock:
+                self.stats["deleted"] += deleted
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return dict(self.stats, active=len(self._sessions), dir=self.out_dir,
+                        interval_ms=self.interval * 1000, max_files=self.max_files)
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return 0.0
+
+
+profiler = Profiler(
+    out_dir=os.getenv("PROFILE_DIR", "/tmp/jobhunter-profiles"),
+    interval_ms=float(os.getenv("PROFILE_INTERVAL_MS", "5")),
+    max_files=int(os.getenv("PROFILE_MAX_FILES", "200")),
+    max_concurrent=int(os.getenv("PROFILE_MAX_CONCURRENT", "4")),
+)
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def summarize(paths: List[str]) -> Tuple[Counter, Counter, int]:
+    """(self samples, total samples, all samples) per frame label across collapsed files."""
+    self_samples: Counter = Counter()
+    total_samples: Counter = Counter()
+    samples = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                if not stack or not count.isdigit():
+                    continue
+                n = int(count)
+                frames = stack.split(";")
+                samples += n
+                self_samples[frames[-1]] += n
+                # recursion: count a function once per stack
+                for frame in set(frames):
+                    total_samples[frame] += n
+    return self_samples, total_samples, samples
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m backend.profiling", description=__doc__.split("\n\n")[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("summary", help="top functions across captured profiles")
+    p.add_argument("--dir", default=os.getenv("PROFILE_DIR", "/tmp/jobhunter-profiles"))
+    p.add_argument("--match", default="", help="only profiles whose file name contains this (e.g. jobs_search)")
+    p.add_argument("--top", type=int, default=25)
+    p.add_argument("--sort", choices=("self", "total"), default="self")
+    args = ap.parse_args(argv)
+
+    paths = [p for p in sorted(glob.glob(os.path.join(args.dir, "*.collapsed"))) if args.match in os.path.basename(p)]
+    if not paths:
+        raise SystemExit(f"No profiles in {args.dir}" + (f" matching {args.match!r}" if args.match else ""))
+    self_samples, total_samples, samples = summarize(paths)
+    ranked = self_samples if args.sort == "self" else total_samples
+
+    print(f"{len(paths)} profiles, {samples} samples")
+    print(f"{'self':>7} {'self%':>6} {'total':>7} {'total%':>6}  function")
+    for label, _ in ranked.most_common(args.top):
+        s, t = self_samples[label], total_samples[label]
+        print(f"{s:>7} {100 * s / samples:>5.1f}% {t:>7} {100 * t / samples:>5.1f}%  {label}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# backend/rate_limit.py
+"""
+Token-bucket admission control for the endpoints that spend upstream quota
+(Adzuna searches, Gemini generations).
+
+Every limited request takes one token from two buckets:
+
+- a per-client bucket ("<upstream>:user:<id>" or "<upstream>:ip:<addr>")
+- a global bucket per upstream ("<upstream>:global"), sized to the provider quota
+
+When the global bucket rejects a request, the client's token is given back.
+
+If a bucket is empty but refills within `max_wait_seconds`, the request
+sleeps briefly and proceeds; otherwise it is rejected with 429 and a
+`Retry-After` header.
+
+Backends:
+- memory (default): per-process, fine for the dev server
+- sqlite:///path/to/file.db: shared by every worker on the host; each take is
+  a single `BEGIN IMMEDIATE` transaction so concurrent workers stay consistent
+"""
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, Tuple
+
+from flask import jsonify
+
+
+class MemoryBackend:
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        """Take `cost` tokens; return 0.0 on success or the seconds until they would be available.
+
+        A negative `cost` gives tokens back (never above `capacity`).
+        """
+        with self._lock:
+            now = time.time()
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (min(capacity, tokens - cost), now)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > 50_000:
+                # idle buckets are full anyway; dropping them loses nothing
+                idle = [k for k, (_, t) in self._buckets.items() if now - t > 3600]
+                for k in idle:
+                    del self._buckets[k]
+            return (cost - tokens) / rate if rate > 0 else math.inf
+
+
+class SqliteBackend:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        # a connection opened in the gunicorn master must not be used by a forked worker
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key=?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens = min(capacity, tokens - cost)
+            else:
+                wait = (cost - tokens) / rate if rate > 0 else math.inf
+            conn.execute(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens=excluded.tokens, updated=excluded.updated",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def _backend_from_env():
+    url = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    if url.startswith("sqlite:///"):
+        return SqliteBackend(url[len("sqlite:///"):])
+    return MemoryBackend()
+
+
+class RateLimiter:
+    def __init__(self, backend=None, max_wait_seconds: float = 1.0, enabled: bool = True):
+        self.backend = backend or MemoryBackend()
+        self.max_wait_seconds = max_wait_seconds
+        self.enabled = enabled
+        # upstream -> {"user": (capacity, rate/s), "global": (capacity, rate/s)}
+        self.limits: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    def configure(self, upstream: str, user_per_min: float, global_per_min: float) -> None:
+        self.limits[upstream] = {
+            "user": (user_per_min, user_per_min / 60.0),
+            "global": (global_per_min, global_per_min / 60.0),
+        }
+        self._metrics.setdefault(upstream, {"allowed": 0, "queued": 0, "rejected_user": 0, "rejected_global": 0})
+
+    def _count(self, upstream: str, key: str) -> None:
+        with self._lock:
+            self._metrics[upstream][key] += 1
+
+    def _admit(self, bucket_key: str, capacity: float, rate: float) -> Tuple[bool, float, bool]:
+        """Take a token, sleeping up to max_wait_seconds. Returns (admitted, retry_after, queued)."""
+        wait = self.backend.take(bucket_key, capacity, rate)
+        if wait == 0.0:
+            return True, 0.0, False
+        if wait > self.max_wait_seconds:
+            return False, wait, False
+        time.sleep(wait)
+        wait = self.backend.take(bucket_key, capacity, rate)
+        return wait == 0.0, wait, True
+
+    def check(self, upstream: str, client_key: str) -> Tuple[bool, float]:
+        """Admit one request for `client_key` against `upstream`'s buckets."""
+        if not self.enabled or upstream not in self.limits:
+            return True, 0.0
+        limits = self.limits[upstream]
+        queued = False
+        taken = []
+        for scope, bucket_key in (("user", f"{upstream}:{client_key}"), ("global", f"{upstream}:global")):
+            admitted, retry_after, waited = self._admit(bucket_key, *limits[scope])
+            queued = queued or waited
+            if not admitted:
+                # a request the global bucket turns away must not cost the client a token
+                for key, capacity, rate in taken:
+                    self.backend.take(key, capacity, rate, cost=-1)
+                self._count(upstream, f"rejected_{scope}")
+                return False, retry_after
+            taken.append((bucket_key, *limits[scope]))
+        self._count(upstream, "queued" if queued else "allowed")
+        return True, 0.0
+
+    def limit(self, upstream: str, key_func: Callable[[], str]):
+        """Route decorator: 429 + Retry-After when `upstream` buckets are exhausted."""
+        def deco(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                admitted, retry_after = self.check(upstream, key_func())
+                if not admitted:
+                    return self.rejection(retry_after)
+                return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    @staticmethod
+    def rejection(retry_after: float):
+        resp = jsonify({"error": "Too many requests, please retry later"})
+        resp.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return resp, 429
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._metrics.items()}
+
+
+limiter = RateLimiter(
+    backend=_backend_from_env(),
+    max_wait_seconds=float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "1.0")),
+    enabled=os.getenv("RATE_LIMIT_ENABLED", "1") == "1",
+)
+limiter.configure(
+    "adzuna",
+    user_per_min=float(os.getenv("RATE_LIMIT_ADZUNA_USER_PER_MIN", "20")),
+    global_per_min=float(os.getenv("RATE_LIMIT_ADZUNA_GLOBAL_PER_MIN", "60")),
+)
+limiter.configure(
+    "gemini",
+    user_per_min=float(os.getenv("RATE_LIMIT_GEMINI_USER_PER_MIN", "10")),
+    global_per_min=float(os.getenv("RATE_LIMIT_GEMINI_GLOBAL_PER_MIN", "60")),
+)
@@ -0,0 +1,153 @@
+# backend/search_cache.py
+"""
+Per-process cache of job search responses from Adzuna.
+
+Entries are keyed by the normalized search (query, location, filters, page,
+sort) and hold the response payload before view shaping, so one entry serves
+every `view`. Filled by `/api/jobs/search` on a miss and kept warm by the
+catalog refresher for popular queries.
+
+Stale-while-revalidate: each entry has a soft and a hard TTL, chosen by its
+query class. Past the soft TTL the entry is still served (flagged stale) while
+one background refresh replaces it; past the hard TTL it is gone and the
+caller has to wait for the provider.
+
+Query classes:
+- plain: first page, no filters (the searches the refresher keeps warm)
+- filtered: type/experience/salary filters or a non-default sort
+- paged: any page after the first
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from backend.singleflight import make_key
+
+log = logging.getLogger(__name__)
+
+CachedSearch = Tuple[Dict[str, Any], float, bool]   # (payload, age_seconds, stale)
+
+
+def search_key(query: str, location: str = "", job_type: str = "", experience: str = "",
+               page: int = 1, salary_min=None, salary_max=None, sort: str = "relevance") -> str:
+    return make_key(
+        " ".join(query.lower().split()), " ".join(location.lower().split()),
+        job_type.lower(), experience.lower(), int(page),
+        salary_min or None, salary_max or None, sort,
+    )
+
+
+def query_class(page: int = 1, job_type: str = "", experience: str = "",
+                salary_min=None, salary_max=None, sort: str = "relevance") -> str:
+    if int(page) > 1:
+        return "paged"
+    if job_type or experience or salary_min or salary_max or sort != "relevance":
+        return "filtered"
+    return "plain"
+
+
+def parse_class_ttls(spec: str) -> Dict[str, Tuple[float, float]]:
+    """"plain=900:3600,paged=300:900" -> {"plain": (900.0, 3600.0), "paged": (300.0, 900.0)}"""
+    out = {}
+    for part in spec.split(","):
+        name, _, ttls = part.partition("=")
+        soft, _, hard = ttls.partition(":")
+        if name.strip() and soft.strip():
+            out[name.strip()] = (float(soft), float(hard or soft))
+    return out
+
+
+class SearchCache:
+    """Bounded LRU with soft/hard TTLs per query class."""
+
+    def __init__(self, soft_ttl_seconds: float = 900.0, hard_ttl_seconds: float = 3600.0,
+                 max_entries: int = 128, class_ttls: Dict[str, Tuple[float, float]] | None = None):
+        self.soft_ttl_seconds = soft_ttl_seconds
+        self.hard_ttl_seconds = max(hard_ttl_seconds, soft_ttl_seconds)
+        self.max_entries = max_entries
+        self.class_ttls = class_ttls or {}
+        # key -> (payload, stored_at, query_class)
+        self._items: "OrderedDict[str, Tuple[Dict[str, Any], float, str]]" = OrderedDict()
+        self._revalidating: set[str] = set()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "puts": 0, "evictions": 0,
+                      "revalidations": 0, "revalidation_failures": 0}
+
+    def ttls(self, cls: str) -> Tuple[float, float]:
+        return self.class_ttls.get(cls, (self.soft_ttl_seconds, self.hard_ttl_seconds))
+
+    def get(self, key: str) -> CachedSearch | None:
+        """Return (payload, age_seconds, stale), or None when missing or past the hard TTL."""
+        now = time.time()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                soft, hard = self.ttls(item[2])
+                age = now - item[1]
+                if age < hard:
+                    self._items.move_to_end(key)
+                    stale = age >= soft
+                    self.stats["stale_hits" if stale else "hits"] += 1
+                    return item[0], age, stale
+                del self._items[key]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, payload: Dict[str, Any], cls: str = "plain") -> None:
+        with self._lock:
+            self._items[key] = (payload, time.time(), cls)
+            self._items.move_to_end(key)
+            self.stats["puts"] += 1
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def revalidate(self, key: str, fetch, cls: str = "plain") -> bool:
+        """
+        Refresh `key` from `fetch()` in a daemon thread unless a refresh is
+        already running. Returns whether this call started one.
+        """
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            self.stats["revalidations"] += 1
+
+        def run():
+            try:
+                self.put(key, fetch(), cls)
+            except Exception as e:
+                log.warning("Search revalidation failed, keeping the stale entry: %s", e)
+                with self._lock:
+                    self.stats["revalidation_failures"] += 1
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=run, name="search-revalidate", daemon=True).start()
+        return True
+
+    def age(self, key: str) -> float | None:
+        with self._lock:
+            item = self._items.get(key)
+        return time.time() - item[1] if item else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self.stats, entries=len(self._items), revalidating=len(self._revalidating))
+        lookups = out["hits"] + out["stale_hits"] + out["misses"]
+        out["hit_rate"] = round((out["hits"] + out["stale_hits"]) / lookups, 3) if lookups else 0.0
+        return out
+
+
+search_cache = SearchCache(
+    soft_ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "900")),
+    hard_ttl_seconds=float(os.getenv("SEARCH_CACHE_STALE_SECONDS", "3600")),
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "128")),
+    class_ttls=parse_class_ttls(os.getenv("SEARCH_CACHE_CLASS_TTLS", "")),
+)
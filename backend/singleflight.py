@@ -0,0 +1,121 @@
+# backend/singleflight.py
+"""
+Collapse concurrent identical upstream calls into one.
+
+The first caller for a key (the leader) runs the function; callers that
+arrive while it is in flight wait for the leader and receive the same result,
+or the same exception. Nothing is cached: once the leader finishes the key is
+released and the next caller triggers a fresh call.
+
+`AsyncSingleFlight` does the same for coroutines on one event loop (the
+ASGI mode in backend/asgi.py).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {"leaders": 0, "shared": 0, "follower_timeouts": 0}
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: float | None = None) -> Any:
+        """Run `fn()` once per in-flight `key`; followers wait at most `timeout` seconds."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["leaders"] += 1
+            else:
+                call.waiters += 1
+                self.stats["shared"] += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    self.stats["follower_timeouts"] += 1
+                raise TimeoutError(f"{self.name}: timed out waiting for in-flight call")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats, in_flight=len(self._calls))
+
+
+class AsyncSingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.stats = {"leaders": 0, "shared": 0, "follower_timeouts": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], timeout: float | None = None) -> Any:
+        """Await `fn()` once per in-flight `key`; followers wait at most `timeout` seconds."""
+        fut = self._calls.get(key)
+        if fut is not None:
+            self.stats["shared"] += 1
+            try:
+                # shield: a follower giving up must not cancel the leader's call
+                return await asyncio.wait_for(asyncio.shield(fut), timeout)
+            except asyncio.TimeoutError:
+                self.stats["follower_timeouts"] += 1
+                raise TimeoutError(f"{self.name}: timed out waiting for in-flight call") from None
+
+        self.stats["leaders"] += 1
+        fut = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+            fut.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved when nobody was waiting
+            raise
+        finally:
+            self._calls.pop(key, None)
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.stats, in_flight=len(self._calls))
+
+
+def make_key(*parts: Any) -> str:
+    """Stable hash of JSON-serializable parts (dict key order does not matter)."""
+    blob = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+adzuna_flight = SingleFlight("adzuna")
+gemini_flight = SingleFlight("gemini")
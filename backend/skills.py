@@ -0,0 +1,132 @@
+# backend/skills.py
+"""
+Skill extraction done once per job, when it is upserted.
+
+`SkillExtractor` matches a vocabulary of canonical skills (the built-in
+`BASE_SKILLS` list plus backend/skill_taxonomy.json) against a job's title
+and description as whole words, so "r" no longer matches inside every word.
+The canonical skill list and a small normalized term vector are stored with
+the job (`jobs.skills`, `jobs.term_vector`), and recommendation-time matching
+becomes a set intersection with the resume's skills.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple
+
+_TERM_RE = re.compile(r"[a-z][a-z0-9+#]{2,}")
+_STOPWORDS = frozenset(
+    "the and for with you our are will your this that from have has who all can not job role team "
+    "work working experience years year including ability strong skills about their they them more "
+    "must such other any using use within across into able new well also may per who what when "
+    "where which while would should could been being were was its it's".split()
+)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "skill_taxonomy.json")
+
+# Only skills that are unambiguous as a bare word. "node", "rest", "spark", "go",
+# "react", "excel", "forecast", "r" and "sap" also occur in plain English, so
+# they are matched through the qualified phrases in the taxonomy ("node.js",
+# "rest api", "pyspark", "golang", "reactjs", "ms excel", "demand forecasting",
+# "r programming", "sap erp").
+BASE_SKILLS = {
+    "python", "sql", "power bi", "tableau", "snowflake", "pandas", "numpy",
+    "java", "javascript", "api", "fastapi", "flask",
+    "dashboards", "kpi", "etl", "data pipeline", "airflow", "docker", "kubernetes",
+    "git", "jira", "experimentation", "a b testing", "a/b testing", "statistics",
+    "supply chain", "ibp", "ml", "machine learning", "genai",
+}
+
+
+def load_taxonomy(path: str | None) -> Dict[str, List[str]]:
+    """Canonical skill -> alias phrases; keys starting with "_" are comments."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    return {k.lower(): [a.lower() for a in v] for k, v in raw.items() if not k.startswith("_")}
+
+
+def skill_label(skill: str) -> str:
+    """Display form used by the API ("SQL", "R", "Power Bi")."""
+    return skill.upper() if skill in {"sql", "r"} else skill.title()
+
+
+def term_vector(text: str, top: int = 30) -> Dict[str, float]:
+    """L2-normalized term frequencies of the `top` most frequent non-stopword terms."""
+    counts = Counter(t for t in _TERM_RE.findall((text or "").lower()) if t not in _STOPWORDS)
+    common = counts.most_common(top)
+    norm = math.sqrt(sum(c * c for _, c in common)) or 1.0
+    return {t: round(c / norm, 4) for t, c in common}
+
+
+class SkillExtractor:
+    def __init__(self, base_skills: Iterable[str] = (), taxonomy: Mapping[str, List[str]] | None = None):
+        aliases: Dict[str, str] = {}
+        for skill in base_skills:
+            aliases[skill.lower()] = skill.lower()
+        for skill, phrases in (taxonomy or {}).items():
+            # an alias listed in the taxonomy overrides a base skill of the same text
+            # ("a b testing" -> "a/b testing"). The canonical name itself only
+            # matches when it is listed, so "go" can mean just "golang".
+            for phrase in phrases or [skill]:
+                aliases[phrase] = skill
+        self.aliases = aliases
+        self._canonical = set(aliases.values())
+        # longest phrases first so "machine learning" wins over "ml"-like prefixes
+        parts = sorted(aliases, key=len, reverse=True)
+        pattern = "|".join(re.escape(p).replace(r"\ ", r"\s+") for p in parts)
+        self._re = re.compile(rf"(?<![\w+#&])(?:{pattern})(?![\w+#&])", re.IGNORECASE) if parts else None
+
+    @property
+    def skills(self) -> Set[str]:
+        return set(self._canonical)
+
+    def canonical(self, name: str) -> str | None:
+        """Canonical skill for a skill name a user typed ("PowerBI", "Python3", "Go"), or None if unknown."""
+        phrase = " ".join((name or "").lower().split())
+        if phrase in self.aliases:
+            return self.aliases[phrase]
+        # a name typed on its own is unambiguous even when the canonical key is not an alias
+        if phrase in self._canonical:
+            return phrase
+        found = self.extract(phrase)
+        return found[0] if found else None
+
+    def extract(self, *texts: str | None) -> List[str]:
+        """Canonical skills found in the texts, ordered by first appearance."""
+        if self._re is None:
+            return []
+        found: Dict[str, None] = {}
+        for text in texts:
+            for m in self._re.finditer(text or ""):
+                found.setdefault(self.aliases[" ".join(m.group(0).lower().split())], None)
+        return list(found)
+
+
+def skill_match(job_skills: List[str], resume_skills: Set[str]) -> Tuple[int, List[str], List[str]]:
+    """Score, matched and missing skills from precomputed canonical skill sets."""
+    matched = [s for s in job_skills if s in resume_skills]
+    gaps = [s for s in job_skills if s not in resume_skills]
+    return max(40, min(99, 60 + 7 * len(matched))), matched, gaps
+
+
+def json_list(v) -> List[Any] | None:
+    """A JSON array column as returned by mysql-connector/SQLite (str or bytes), or None."""
+    if v is None or isinstance(v, list):
+        return v
+    try:
+        return json.loads(v)
+    except ValueError:
+        return None
+
+
+def from_env(base_skills: Iterable[str] = BASE_SKILLS) -> SkillExtractor:
+    return SkillExtractor(base_skills, load_taxonomy(os.getenv("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)))
+
+
+skill_extractor = from_env()
@@ -0,0 +1,214 @@
+# backend/uploads.py
+"""
+Streaming resume uploads.
+
+The upload routes used to `file.read()` the whole upload into bytes and wrap
+it in another `BytesIO` for pdfplumber/mammoth: two full copies in RAM per
+concurrent upload, plus Werkzeug's own buffer.
+
+`UploadRequest` (installed as `app.request_class`) has Werkzeug's multipart
+parser write each uploaded file straight into a `SpooledUpload`:
+  - chunks go to memory up to UPLOAD_SPOOL_MEMORY_KB, then to an unnamed
+    temp file on disk, so RAM per upload stays bounded whatever the cap is;
+  - SHA-256 is updated chunk by chunk as the body arrives;
+  - the first bytes are kept to sniff the real type (PDF, DOCX, text).
+The parsers then get the spooled file object itself (`upload.open()`).
+Text is UTF-8, UTF-16 with a BOM, or a legacy 8-bit encoding (Windows-1252
+/ Latin-1, as older editors save it); anything with control bytes is binary.
+
+Size caps: MAX_CONTENT_LENGTH (UPLOAD_MAX_MB) for normal requests and
+UPLOAD_BATCH_MAX_MB for the endpoints in BATCH_ENDPOINTS. A bigger batch cap
+costs disk, not RAM.
+"""
+from __future__ import annotations
+
+import codecs
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+from typing import BinaryIO, Iterable
+
+from flask import Request
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TEXT = "text/plain"
+OCTET = "application/octet-stream"
+
+# encodings announced by a byte order mark
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+# bytes that never occur in an 8-bit text file (tab, newlines, form feed, ESC and the VT Word exports aside)
+_BINARY_BYTES = frozenset(range(32)) - frozenset(b"\t\n\x0b\x0c\r\x1b")
+
+_HEAD_BYTES = 2048
+_CHUNK = 64 * 1024
+
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_MB", "5")) * 1024 * 1024
+UPLOAD_BATCH_MAX_BYTES = int(os.getenv("UPLOAD_BATCH_MAX_MB", "50")) * 1024 * 1024
+UPLOAD_SPOOL_MEMORY_BYTES = int(os.getenv("UPLOAD_SPOOL_MEMORY_KB", "512")) * 1024
+
+# endpoints allowed the batch cap; filled in by the routes that accept many files
+BATCH_ENDPOINTS: set[str] = set()
+
+
+class UploadRejected(ValueError):
+    """The upload is not an allowed or consistent file type (answer 400)."""
+
+
+class SpooledUpload:
+    def __init__(self, max_memory: int = UPLOAD_SPOOL_MEMORY_BYTES):
+        self.max_memory = max_memory
+        self.file: BinaryIO = io.BytesIO()
+        self.size = 0
+        self.spilled = False
+        self._sha = hashlib.sha256()
+        self._head = bytearray()
+
+    @classmethod
+    def from_stream(cls, stream: BinaryIO) -> "SpooledUpload":
+        """Copy an already buffered stream (an upload that didn't come through UploadRequest)."""
+        upload = cls()
+        stream.seek(0)
+        for chunk in iter(lambda: stream.read(_CHUNK), b""):
+            upload.write(chunk)
+        upload.seek(0)
+        return upload
+
+    # -------- file protocol used by Werkzeug's parser and FileStorage --------
+    def write(self, chunk: bytes) -> int:
+        self._sha.update(chunk)
+        if len(self._head) < _HEAD_BYTES:
+            self._head += chunk[:_HEAD_BYTES - len(self._head)]
+        self.size += len(chunk)
+        if not self.spilled and self.size > self.max_memory:
+            disk = tempfile.TemporaryFile(prefix="upload-")
+            disk.write(self.file.getbuffer())
+            self.file = disk
+            self.spilled = True
+        return self.file.write(chunk)
+
+    def read(self, n: int = -1) -> bytes:
+        return self.file.read(n)
+
+    def readline(self, limit: int = -1) -> bytes:
+        return self.file.readline(limit)
+
+    def seek(self, pos: int, whence: int = 0) -> int:
+        return self.file.seek(pos, whence)
+
+    def tell(self) -> int:
+        return self.file.tell()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def __iter__(self):
+        return iter(self.file)
+
+    # -------- what the routes use --------
+    @property
+    def sha256(self) -> str:
+        return self._sha.hexdigest()
+
+    @property
+    def sniffed(self) -> str:
+        return sniff(bytes(self._head), self)
+
+    def open(self) -> BinaryIO:
+        """The spooled file, rewound, for parsers that take a file object."""
+        self.file.seek(0)
+        return self.file
+
+    def text(self) -> str:
+        """The upload decoded incrementally from the spool: BOM encoding, else UTF-8, else Windows-1252."""
+        head = bytes(self._head)
+        for bom, encoding in _BOMS:
+            if head.startswith(bom):
+                return self._decode(encoding, "ignore")
+        try:
+            return self._decode("utf-8", "strict")
+        except UnicodeDecodeError:
+            # cp1252 is Latin-1 plus curly quotes/dashes in 0x80-0x9f; its 5 unmapped bytes are dropped
+            return self._decode("cp1252", "ignore")
+
+    def _decode(self, encoding: str, errors: str) -> str:
+        wrapper = io.TextIOWrapper(self.open(), encoding=encoding, errors=errors)
+        try:
+            return wrapper.read()
+        finally:
+            wrapper.detach()
+
+
+def sniff(head: bytes, fileobj: BinaryIO | None = None) -> str:
+    """PDF, DOCX or plain text from the leading bytes; OCTET for anything else."""
+    if head.startswith(b"%PDF-"):
+        return PDF
+    if head.startswith(b"PK\x03\x04"):
+        # any zip: only a Word document counts (reads the central directory, not the body)
+        if fileobj is not None:
+            pos = fileobj.tell()
+            try:
+                fileobj.seek(0)
+                with zipfile.ZipFile(fileobj) as z:
+                    if "word/document.xml" in z.namelist():
+                        return DOCX
+            except zipfile.BadZipFile:
+                pass
+            finally:
+                fileobj.seek(pos)
+        return OCTET
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return TEXT
+    if b"\x00" in head:
+        return OCTET
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # a multi-byte character cut off at the end of the sample is fine;
+        # otherwise it is 8-bit text (cp1252/Latin-1) unless it has control bytes
+        if e.start < len(head) - 3 and not _BINARY_BYTES.isdisjoint(head):
+            return OCTET
+    return TEXT
+
+
+def resolve_type(declared: str | None, upload: SpooledUpload, allowed: Iterable[str]) -> str:
+    """
+    The upload's type from its bytes; UploadRejected if not allowed, or if the
+    client declared PDF, DOCX or text and the bytes are one of the others.
+    Other declared types (text/markdown, application/msword...) defer to the bytes.
+    """
+    kind = upload.sniffed
+    if kind not in allowed:
+        raise UploadRejected("Only PDF, DOCX, or TXT allowed")
+    declared = (declared or "").split(";")[0].strip().lower()
+    if declared in (PDF, DOCX, TEXT) and declared != kind:
+        raise UploadRejected("File content does not match its type")
+    return kind
+
+
+def spooled(file_storage) -> SpooledUpload:
+    """The SpooledUpload behind a request.files entry."""
+    stream = file_storage.stream
+    return stream if isinstance(stream, SpooledUpload) else SpooledUpload.from_stream(stream)
+
+
+class UploadRequest(Request):
+    @property
+    def max_content_length(self) -> int | None:  # type: ignore[override]
+        if self.url_rule is not None and self.url_rule.endpoint in BATCH_ENDPOINTS:
+            return UPLOAD_BATCH_MAX_BYTES
+        return super().max_content_length
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledUpload()
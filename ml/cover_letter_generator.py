@@ -1,13 +1,82 @@
-from textwrap import dedent
 from typing import Mapping, Any
-import google.generativeai as genai
+from datetime import timedelta
+import asyncio
+import hashlib
+import logging
 import os
+import threading
+import time
+
+try:
+    from ml.lazy import lazy_module
+    from ml.resilience import get_caller
+except ImportError:  # executed from inside ml/ (run_cover_letter_generator.py)
+    from lazy import lazy_module
+    from resilience import get_caller
+
+genai = lazy_module("google.generativeai")
+
+log = logging.getLogger(__name__)
+
+SYSTEM_INSTRUCTION = "You are a professional writer who crafts clear, concise cover letters."
 
 DEFAULT_STYLE_GUIDE = """\
 - clear, professional tone
 - 1 page max
 """
 
+DELIVERABLE = """\
+Write a cover letter for the candidate that contains the following:
+- A placeholder for the cover letter writer's address, and today's date at the top.
+- A placeholder for the recruiter's name, company name, and company address below that.
+- Address the recruiter with "Dear Mr./Ms. (Insert Name)"
+- The first paragraph should indicate what position you are interested in and how you heard about it. Use the names of contact persons, if appropriate, or references to your sources of information.
+- The second paragraph should relate your experience, skills and background for the position. Highlight the specific skills and competencies that could be useful to the company.
+- The third paragraph should indicate your plans for follow-up contact and that your resume is enclosed.
+- End the letter with "Sincerely, (Insert the cover letter writer's name)"
+Output only the letter text.
+"""
+
+# Identical for every letter, so it can live in a cached context
+STATIC_INSTRUCTIONS = (
+    f"{SYSTEM_INSTRUCTION}\n\n"
+    f"### Style Guide\n{DEFAULT_STYLE_GUIDE}\n"
+    f"### Deliverable\n{DELIVERABLE}"
+)
+
+
+def _resume_block(sections: Mapping[str, str] | None = None) -> str:
+    sections = sections or {}
+    return (
+        "### Candidate Resume Details\n"
+        f"Skills:\n{sections.get('skills', '')}\n\n"
+        f"Experience:\n{sections.get('experience', '')}\n\n"
+        f"Projects:\n{sections.get('projects', '')}\n\n"
+        f"Education:\n{sections.get('education', '')}\n"
+    )
+
+
+def _job_block(
+    name: str,
+    tone: str = "professional",
+    job_title: str | None = None,
+    company: str | None = None,
+    extras: str | None = None,
+    job_description: str | None = None,
+    job_board: str | None = None,
+) -> str:
+    return (
+        "You are drafting a cover letter.\n\n"
+        f"Candidate: {name}\n"
+        f"Target Role: {job_title or 'Not Specified'}\n"
+        f"Company: {company or 'Not Specified'}\n"
+        f"Tone: {tone}\n"
+        f"Position Found On: {job_board or 'Adzuna'}\n"
+        f"{'- ' + extras + chr(10) if extras else ''}\n"
+        f"### Job Description\n{job_description}\n"
+    )
+
+
 def _build_prompt(
     contacts: Mapping[str, Any] | None = None,
     sections: Mapping[str, str]  | None = None,
@@ -18,66 +87,188 @@ def _build_prompt(
     job_description: str | None = None,
     job_board: str | None = None,
 ) -> str:
+    """Full single-shot prompt (used when no cached context is available)."""
     contacts = contacts or {}
-    sections = sections or {}
-    
     name = contacts.get("name", "Candidate")
-    skills = sections.get("skills","")
-    projects = sections.get("projects", "")
-    experience = sections.get("experience", "")
-    education = sections.get("education", "")
-
-    return dedent(f"""
-    You are drafting a cover letter.
-    
-    Candidate: {name}
-    Target Role: {job_title or "Not Specified"}
-    Company: {company or "Not Specified"}
-    Tone: {tone}
-    Position Found On: {job_board or "Adzuna"}
-
-    ###  Style Guide
-    {DEFAULT_STYLE_GUIDE}
-    {"- " + extras if extras else ""}
-
-    ### Job Description
-    {job_description}
-
-    ### Candidate Resume Details
-    Skills:
-    {skills}
-
-    Experience:
-    {experience}
-
-    Projects:
-    {projects}
-
-    Education:
-    {education}
-
-    ### Deliverable
-    Write a cover letter for the candidate that contains the following:
-    - A placeholder for the cover letter writer's address, and today's date at the top.
-    - A placeholder for the recruiter's name, company name, and company address below that.
-    - Address the recruiter with "Dear Mr./Ms. (Insert Name)"
-    - The first paragraph should indicate what position you are interested in and how you heard about it. Use the names of contact persons, if appropriate, or references to your sources of information.
-    - The second paragraph should relate your experience, skills and background for the position. Highlight the specific skills and competencies that could be useful to the company.
-    - The third paragraph should indicate your plans for follow-up contact and that your resume is enclosed.
-    - End the letter with "Sincerely, (Insert the cover letter writer's name)"
-    Output only the letter text.
-    """)
+
+    return "\n".join([
+        _job_block(name, tone, job_title, company, extras, job_description, job_board),
+        "###  Style Guide",
+        DEFAULT_STYLE_GUIDE,
+        _resume_block(sections),
+        "### Deliverable",
+        DELIVERABLE,
+    ])
+
+
+class ContextCache:
+    """
+    Registers static prompt prefixes as Gemini cached contexts and hands back
+    models bound to them.
+
+    Entries are keyed by model + content hash and recreated shortly before
+    their TTL runs out. Prefixes estimated below `min_tokens` (Gemini refuses
+    to cache less than ~1024 tokens on Flash models) are not sent at all.
+    If creation fails (caching unsupported for the model, quota...), the key
+    is remembered for `retry_after_failure` seconds. In both cases callers get
+    None, i.e. they should send the full prompt instead.
+
+    Concurrent callers for the same key share one creation (the others wait
+    up to `create_wait_seconds` for it). Entries dropped before their TTL
+    (over `max_entries`, or replaced by a refresh) are deleted on the server
+    too, so they stop accruing storage cost.
+    """
+
+    def __init__(self, ttl_seconds: int = 3600, refresh_margin: int = 60,
+                 retry_after_failure: int = 600, max_entries: int = 256,
+                 min_tokens: int = 1024, create_wait_seconds: float = 15.0):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin = refresh_margin
+        self.retry_after_failure = retry_after_failure
+        self.max_entries = max_entries
+        self.min_tokens = min_tokens
+        self.create_wait_seconds = create_wait_seconds
+        self._entries: dict[str, tuple[Any, float]] = {}   # key -> (CachedContent, expires_at)
+        self._failed: dict[str, float] = {}                # key -> retry_at
+        self._creating: dict[str, threading.Event] = {}    # key -> set when its creation finishes
+        self._lock = threading.Lock()
+        self.stats = {
+            "created": 0,
+            "create_failures": 0,
+            "too_small": 0,
+            "shared_creates": 0,
+            "deleted": 0,
+            "letters": 0,
+            "cached_letters": 0,
+            "prompt_tokens": 0,
+            "tokens_saved": 0,
+        }
+
+    @staticmethod
+    def _key(model_name: str, system_instruction: str, contents: list[str]) -> str:
+        h = hashlib.sha256(model_name.encode())
+        for part in [system_instruction, *contents]:
+            h.update(b"\0" + part.encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def estimate_tokens(system_instruction: str, contents: list[str]) -> int:
+        # ~4 characters per token for English text
+        return (len(system_instruction) + sum(len(c) for c in contents)) // 4
+
+    def model_for(self, model_name: str, system_instruction: str, contents: list[str]):
+        if self.estimate_tokens(system_instruction, contents) < self.min_tokens:
+            with self._lock:
+                self.stats["too_small"] += 1
+            return None
+        key = self._key(model_name, system_instruction, contents)
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                if self._failed.get(key, 0) > now:
+                    return None
+                entry = self._entries.get(key)
+                if entry and entry[1] - self.refresh_margin > now:
+                    return genai.GenerativeModel.from_cached_content(entry[0])
+                pending = self._creating.get(key)
+                if pending is None:
+                    self._creating[key] = threading.Event()
+                    # drop expired entries before adding another (the server already removed them)
+                    for k in [k for k, (_, exp) in self._entries.items() if exp <= now]:
+                        del self._entries[k]
+                    break
+                self.stats["shared_creates"] += 1
+            # another thread is creating this context: wait for it, then re-check
+            if not pending.wait(self.create_wait_seconds):
+                return None
+
+        stale = []
+        try:
+            try:
+                cached = genai.caching.CachedContent.create(
+                    model=model_name,
+                    display_name=f"cover-letter-{key[:12]}",
+                    system_instruction=system_instruction,
+                    contents=contents or None,
+                    ttl=timedelta(seconds=self.ttl_seconds),
+                )
+            except Exception as e:
+                log.info("Context cache unavailable for %s, sending full prompt: %s", model_name, e)
+                with self._lock:
+                    self.stats["create_failures"] += 1
+                    self._failed = {k: t for k, t in self._failed.items() if t > now}
+                    self._failed[key] = now + self.retry_after_failure
+                return None
+
+            with self._lock:
+                self.stats["created"] += 1
+                replaced = self._entries.pop(key, None)
+                if replaced is not None:
+                    stale.append(replaced[0])
+                if len(self._entries) >= self.max_entries:
+                    oldest = min(self._entries, key=lambda k: self._entries[k][1])
+                    stale.append(self._entries.pop(oldest)[0])
+                self._entries[key] = (cached, now + self.ttl_seconds)
+            return genai.GenerativeModel.from_cached_content(cached)
+        finally:
+            with self._lock:
+                self._creating.pop(key).set()
+            for old in stale:
+                self._delete(old)
+
+    def _delete(self, cached: Any) -> None:
+        try:
+            cached.delete()
+        except Exception as e:  # it expires on its own at the end of its TTL anyway
+            log.info("Could not delete cached context %s: %s", getattr(cached, "name", "?"), e)
+            return
+        with self._lock:
+            self.stats["deleted"] += 1
+
+    def record_usage(self, resp: Any) -> dict[str, int]:
+        """Accumulate prompt/cached token counts from a response's usage_metadata."""
+        usage = getattr(resp, "usage_metadata", None)
+        prompt_tokens = int(getattr(usage, "prompt_token_count", 0) or 0)
+        saved = int(getattr(usage, "cached_content_token_count", 0) or 0)
+        with self._lock:
+            self.stats["letters"] += 1
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["tokens_saved"] += saved
+            if saved:
+                self.stats["cached_letters"] += 1
+        return {"prompt_tokens": prompt_tokens, "cached_tokens": saved}
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            out = dict(self.stats, entries=len(self._entries))
+        out["avg_tokens_saved_per_letter"] = round(out["tokens_saved"] / out["letters"], 1) if out["letters"] else 0.0
+        out["hit_rate"] = round(out["cached_letters"] / out["letters"], 3) if out["letters"] else 0.0
+        return out
+
+
+context_cache = ContextCache(
+    ttl_seconds=int(os.getenv("GEMINI_CONTEXT_CACHE_TTL_SECONDS", "3600")),
+    min_tokens=int(os.getenv("GEMINI_CONTEXT_CACHE_MIN_TOKENS", "1024")),
+)
+
 
 class CoverLetterGenerator:
-    def __init__(self, model_name: str | None = None):
+    def __init__(self, model_name: str | None = None, use_context_cache: bool | None = None):
         api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
         if api_key:
             genai.configure(api_key=api_key.strip().strip('"').strip("'"))
-        model_name = model_name or os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
-        
+        self.model_name = model_name or os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+        if use_context_cache is None:
+            use_context_cache = os.getenv("GEMINI_CONTEXT_CACHE", "1") == "1"
+        self.use_context_cache = use_context_cache
+        # cache the resume sections with the instructions (one context per resume): the
+        # instructions alone (~250 tokens) are far below Gemini's minimum cacheable size
+        self.cache_resume = os.getenv("GEMINI_CONTEXT_CACHE_RESUME", "1") == "1"
+        self.last_usage: dict[str, int] = {}
+
         self.model = genai.GenerativeModel(
-            model_name,
-            system_instruction="You are a professional writer who crafts clear, concise cover letters."
+            self.model_name,
+            system_instruction=SYSTEM_INSTRUCTION,
         )
 
     def generate_cover_letter(
@@ -90,14 +281,59 @@ class CoverLetterGenerator:
         job_description: str | None = None,
         job_board: str | None = None,
     ) -> str:
-        prompt = _build_prompt(
-            contacts=contacts,
-            sections=sections,
-            tone=tone,
-            job_title=job_title,
-            company=company,
-            job_description=job_description,
-            job_board=job_board,
+        model, prompt = self._model_and_prompt(contacts, sections, tone, job_title, company,
+                                               job_description, job_board)
+        caller = get_caller("gemini")
+        resp = caller.call(
+            model.generate_content,
+            prompt,
+            request_options={"timeout": caller.timeout_seconds},
         )
-        resp = self.model.generate_content(prompt)
-        return (getattr(resp, "text", None) or "").strip()
\ No newline at end of file
+        self.last_usage = context_cache.record_usage(resp)
+        return (getattr(resp, "text", None) or "").strip()
+
+    async def generate_cover_letter_async(self, **kwargs: Any) -> str:
+        """Same as generate_cover_letter, awaiting Gemini instead of blocking a thread."""
+        # registering a cached context is a blocking call, made at most once per TTL
+        model, prompt = await asyncio.to_thread(self._model_and_prompt, **kwargs)
+        caller = get_caller("gemini")
+        resp = await caller.call_async(
+            model.generate_content_async,
+            prompt,
+            request_options={"timeout": caller.timeout_seconds},
+        )
+        self.last_usage = context_cache.record_usage(resp)
+        return (getattr(resp, "text", None) or "").strip()
+
+    def _model_and_prompt(
+        self,
+        contacts: Mapping[str, Any] | None = None,
+        sections: dict | None = None,
+        tone: str = "professional",
+        job_title: str | None = None,
+        company: str | None = None,
+        job_description: str | None = None,
+        job_board: str | None = None,
+    ):
+        model, prompt = None, None
+        if self.use_context_cache:
+            cached_parts = [_resume_block(sections)] if self.cache_resume and sections else []
+            model = context_cache.model_for(self.model_name, STATIC_INSTRUCTIONS, cached_parts)
+            if model is not None:
+                name = (contacts or {}).get("name", "Candidate")
+                prompt = _job_block(name, tone, job_title, company, None, job_description, job_board)
+                if not cached_parts:
+                    prompt += "\n" + _resume_block(sections)
+
+        if model is None:
+            model = self.model
+            prompt = _build_prompt(
+                contacts=contacts,
+                sections=sections,
+                tone=tone,
+                job_title=job_title,
+                company=company,
+                job_description=job_description,
+                job_board=job_board,
+            )
+        return model, prompt
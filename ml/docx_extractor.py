@@ -0,0 +1,129 @@
+# ml/docx_extractor.py
+"""
+Plain text and paragraph styles straight from a DOCX, without mammoth.
+
+mammoth.extract_raw_text builds mammoth's full document model (runs,
+hyperlinks, numbering, notes, comments...) meant for HTML conversion, only
+to flatten it to text, and the paragraph styles are lost on the way.
+
+`iter_paragraphs()` opens the zip, resolves style ids to names from
+word/styles.xml (small), then streams word/document.xml through
+`ElementTree.iterparse`, clearing each paragraph once it is emitted, so
+memory stays flat however long the document is. Each paragraph comes with
+its style name and heading level (Heading 1-9 / Title styles, or an
+explicit outline level), which `ParsingFunctionsPreLLM.define_sections_from_paragraphs`
+uses as section boundaries.
+
+Raises `DocxError` for anything that isn't a readable Word document; the
+caller falls back to mammoth.
+"""
+from __future__ import annotations
+
+import re
+import zipfile
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List
+from xml.etree import ElementTree as ET
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_HEADING_NAME = re.compile(r"^heading\s*(\d)$", re.I)
+
+
+class DocxError(ValueError):
+    """Not a readable .docx (bad zip, missing word/document.xml, broken XML)."""
+
+
+@dataclass
+class Paragraph:
+    text: str
+    style: str | None = None
+    heading_level: int | None = None  # 0 for Title, 1-9 for headings
+
+    @property
+    def is_heading(self) -> bool:
+        return self.heading_level is not None
+
+
+def _style_names(z: zipfile.ZipFile) -> Dict[str, str]:
+    try:
+        with z.open("word/styles.xml") as f:
+            root = ET.parse(f).getroot()
+    except KeyError:
+        return {}
+    names = {}
+    for style in root.iter(W + "style"):
+        name = style.find(W + "name")
+        if name is not None:
+            names[style.get(W + "styleId", "")] = name.get(W + "val", "")
+    return names
+
+
+def _heading_level(style_name: str | None, outline_level: str | None) -> int | None:
+    if style_name:
+        if style_name.lower() == "title":
+            return 0
+        m = _HEADING_NAME.match(style_name.strip())
+        if m:
+            return int(m.group(1))
+    if outline_level is not None and outline_level.isdigit() and int(outline_level) < 9:
+        return int(outline_level) + 1
+    return None
+
+
+def iter_paragraphs(fileobj: BinaryIO) -> Iterator[Paragraph]:
+    """Paragraphs of a .docx in document order (table cells and text boxes included)."""
+    try:
+        z = zipfile.ZipFile(fileobj)
+        styles = _style_names(z)
+        stream = z.open("word/document.xml")
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        raise DocxError(str(e)) from e
+
+    # a stack, because text boxes put paragraphs inside paragraphs
+    stack: List[Dict] = []
+    body = None
+    with z, stream:
+        try:
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    if tag == W + "p":
+                        stack.append({"parts": [], "style": None, "outline": None})
+                    elif tag == W + "body":
+                        body = elem
+                    continue
+                if not stack:
+                    continue
+                top = stack[-1]
+                if tag == W + "t":
+                    top["parts"].append(elem.text or "")
+                elif tag == W + "tab":
+                    top["parts"].append("\t")
+                elif tag in (W + "br", W + "cr"):
+                    top["parts"].append("\n")
+                elif tag == W + "noBreakHyphen":
+                    top["parts"].append("-")
+                elif tag == W + "pStyle":
+                    top["style"] = elem.get(W + "val")
+                elif tag == W + "outlineLvl":
+                    top["outline"] = elem.get(W + "val")
+                elif tag == W + "p":
+                    stack.pop()
+                    style = styles.get(top["style"], top["style"]) if top["style"] else None
+                    yield Paragraph("".join(top["parts"]), style, _heading_level(style, top["outline"]))
+                    elem.clear()
+                    if not stack and body is not None:
+                        # drop finished paragraphs/tables from the tree (an open table stays referenced by the parser)
+                        body.clear()
+        except ET.ParseError as e:
+            raise DocxError(str(e)) from e
+
+
+def extract(fileobj: BinaryIO) -> List[Paragraph]:
+    return list(iter_paragraphs(fileobj))
+
+
+def to_text(paragraphs: List[Paragraph]) -> str:
+    """Same layout as mammoth.extract_raw_text: each paragraph followed by a blank line."""
+    return "".join(p.text + "\n\n" for p in paragraphs)
@@ -1,7 +1,13 @@
 from dataclasses import dataclass
 import os
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+try:
+    from ml.lazy import lazy_module
+except ImportError:  # executed from inside ml/
+    from lazy import lazy_module
+
+genai = lazy_module("google.generativeai")
 
 @dataclass
 class GeminiConfig:
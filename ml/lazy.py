@@ -0,0 +1,102 @@
+# ml/lazy.py
+"""
+Deferred imports for heavy dependencies.
+
+`google.generativeai` alone takes ~0.5 s to import (protobuf/gRPC stubs),
+and pdfplumber, mammoth, mysql-connector, requests and pyarrow add a few
+hundred ms more. Importing them all at module load made every cold start
+(autoscaled containers, free-tier wakeups, `python -m backend.catalog_io`)
+pay for dependencies that most requests never touch.
+
+`lazy_module("pdfplumber")` returns a stand-in that imports the real module
+on first attribute access and forwards to it afterwards, so call sites keep
+the `pdfplumber.open(...)` spelling. There is one stand-in per module name,
+so `after_import()` callbacks (e.g. `genai.configure`) run exactly once,
+whichever caller triggers the import. `warm()` imports everything up front
+for processes that would rather pay at startup (a preforking master).
+"""
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+_registry: Dict[str, "LazyModule"] = {}
+_registry_lock = threading.Lock()
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        # set through __dict__ so __getattr__ never sees these as missing
+        self.__dict__.update(_name=name, _module=None, _callbacks=[], _lock=threading.RLock(), load_ms=None)
+
+    def load(self) -> Any:
+        module = self._module
+        if module is not None:
+            return module
+        with self._lock:
+            if self._module is None:
+                started = time.perf_counter()
+                module = importlib.import_module(self._name)
+                for callback in self._callbacks:
+                    callback(module)
+                self.__dict__["load_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                self.__dict__["_module"] = module
+            return self._module
+
+    def after_import(self, callback: Callable[[Any], None]) -> None:
+        """Run `callback(module)` once the module is imported (now, if it already is)."""
+        with self._lock:
+            if self._module is None:
+                self._callbacks.append(callback)
+                return
+        callback(self._module)
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = LazyModule(name)
+        return _registry[name]
+
+
+def available(name: str) -> bool:
+    """Whether `name` is installed, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def warm(names: Iterable[str] | None = None) -> Dict[str, float | None]:
+    """Import the given (default: all registered) lazy modules now; returns ms per module."""
+    if names is not None:
+        targets: List[LazyModule] = [lazy_module(n) for n in names]
+    else:
+        with _registry_lock:
+            targets = list(_registry.values())
+    out: Dict[str, float | None] = {}
+    for mod in targets:
+        try:
+            mod.load()
+        except ImportError:
+            pass  # optional dependency not installed
+        out[mod._name] = mod.load_ms
+    return out
+
+
+def snapshot() -> Dict[str, Any]:
+    with _registry_lock:
+        return {name: {"loaded": m.loaded, "load_ms": m.load_ms} for name, m in sorted(_registry.items())}
@@ -1,7 +1,15 @@
-import pdfplumber, re
+import re
+from collections import Counter
 from io import BytesIO
 from pprint import pprint
 
+try:
+    from ml.lazy import lazy_module
+except ImportError:  # executed from inside ml/ (run_cover_letter_generator.py)
+    from lazy import lazy_module
+
+pdfplumber = lazy_module("pdfplumber")
+
 class ParsingFunctionsPreLLM:
 
     HEADERS = [
@@ -42,7 +50,11 @@ class ParsingFunctionsPreLLM:
 
     def extract_text_from_pdf_bytes(self, content: bytes):
         """Extract text from in-memory PDF bytes."""
-        with pdfplumber.open(BytesIO(content)) as pdf:
+        return self.extract_text_from_pdf_file(BytesIO(content))
+
+    def extract_text_from_pdf_file(self, fileobj):
+        """Extract text from a seekable binary file object (read in place, not copied)."""
+        with pdfplumber.open(fileobj) as pdf:
             self.unfiltered_text = "\n".join((page.extract_text() or "") for page in pdf.pages)
         return self.unfiltered_text
     
@@ -94,7 +106,70 @@ class ParsingFunctionsPreLLM:
                 self.sections[canon] = clean_up_body
 
         return self.sections
-    
+
+    def define_sections_from_paragraphs(self, paragraphs):
+        """Same output as define_sections, for DOCX paragraphs (ml/docx_extractor.py). Paragraphs
+          styled as the section heading level start a section (deeper headings such as job titles
+          stay in the body); see _section_level for how it is chosen. Documents without heading
+          styles use short paragraphs that are just a known header. Falls back to define_sections
+          on the text when neither finds one."""
+        top_level = self._section_level(paragraphs)
+        titled = []
+        title, body = None, []
+        for p in paragraphs:
+            text = p.text.strip()
+            if not text:
+                continue
+            if self._is_section_heading(p, text, top_level):
+                titled.append((title, body))
+                title, body = text.lower().strip(" :"), []
+            else:
+                body.append(self.clean_up_text(text))
+        titled.append((title, body))
+
+        if not any(t for t, _ in titled):
+            text = "".join(p.text + "\n\n" for p in paragraphs)
+            return self.define_sections(self.clean_up_text(text))
+
+        # text before the first heading (name, contact line) isn't a section, as in define_sections
+        for title, body in titled:
+            if title is None:
+                continue
+            canon = self.CANON_MAP.get(title, title)
+            content = "\n\n".join(body)
+            if canon in self.sections:
+                self.sections[canon] = (self.sections[canon] + "\n" + content).strip()
+            else:
+                self.sections[canon] = content
+
+        return self.sections
+
+    def _section_level(self, paragraphs):
+        """The heading level used for sections: the one with the most known headers (ties go to the
+          shallower level), so a name styled Heading 1 above Heading 2 sections doesn't hide them.
+          Without known headers, the top level, skipping it when it is a single heading (a name).
+          Title (level 0) is the candidate's name, never a section."""
+        counts, known = Counter(), Counter()
+        for p in paragraphs:
+            if p.heading_level:
+                counts[p.heading_level] += 1
+                if self._is_known_header(p.text.strip()):
+                    known[p.heading_level] += 1
+        if not counts:
+            return None
+        if known:
+            return max(known, key=lambda level: (known[level], -level))
+        levels = sorted(counts)
+        return levels[1] if counts[levels[0]] == 1 and len(levels) > 1 else levels[0]
+
+    def _is_known_header(self, text):
+        return len(text.split()) <= 4 and not text.endswith(".") and bool(self.HEADERS_REGEX.match(text.lower()))
+
+    def _is_section_heading(self, paragraph, text, top_level):
+        if top_level is not None:
+            return paragraph.heading_level == top_level and len(text) <= 60
+        return self._is_known_header(text)
+
     def gather_contact_info_from_text(self, text: str):
         """Find and return all names, emails, phone numbers, and URLs."""
         emails = set(self.EMAIL_REGEX.findall(text))
@@ -0,0 +1,325 @@
+"""
+Resilience helpers for upstream LLM calls.
+
+Every Gemini `generate_content` call should go through a `ResilientCaller`:
+
+- per-call deadline: the call runs on a small bounded pool and the caller
+  stops waiting once the deadline passes (the SDK also receives the timeout
+  through `request_options`, so the socket is released as well)
+- circuit breaker: when the error rate over a rolling window crosses a
+  threshold the breaker opens and calls fail fast with `CircuitOpenError`
+  until a cool-down has passed; one probe call then decides whether to close
+- optional hedging: once enough latency samples exist, a second identical
+  request is fired if the first has not returned after the observed p95
+
+`call_async()` is the same for coroutine functions (the SDK's
+`generate_content_async`): the deadline is awaited on the event loop instead
+of a pool thread, and there is no hedging.
+
+Callers are expected to catch `CircuitOpenError` / `TimeoutError` and use
+their own fallback (e.g. the template cover letter in backend/app.py) and
+report it with `record_fallback()` so the fallback rate shows up in metrics.
+
+`add_observer(fn)` registers `fn(name, outcome, seconds)`, called after every
+call with outcome "ok", "error", "timeout" or "rejected" (backend/metrics.py
+uses it for the upstream latency histograms).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Awaitable, Callable, Deque, Dict, Tuple
+
+log = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+_observers: list[Callable[[str, str, float], None]] = []
+
+
+def add_observer(fn: Callable[[str, str, float], None]) -> None:
+    """Call `fn(caller name, outcome, seconds)` after every ResilientCaller call."""
+    _observers.append(fn)
+
+
+def _notify(name: str, outcome: str, seconds: float) -> None:
+    for fn in _observers:
+        try:
+            fn(name, outcome, seconds)
+        except Exception:
+            log.exception("resilience observer failed")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the breaker is open."""
+
+
+class CircuitBreaker:
+    """Error-rate breaker over a rolling time window."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window_seconds: float = 60.0,
+        cooldown_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self._events: Deque[Tuple[float, bool]] = deque()  # (timestamp, ok)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def _maybe_half_open(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.cooldown_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+            log.info("circuit %s half-open", self.name)
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._events and self._events[0][0] < cutoff:
+            self._events.popleft()
+
+    def allow(self) -> bool:
+        """Return True when a call may proceed (reserves the probe slot when half-open)."""
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_half_open(now)
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if success:
+                    self._state = CLOSED
+                    self._events.clear()
+                    log.info("circuit %s closed", self.name)
+                else:
+                    self._open(now)
+                return
+
+            self._events.append((now, success))
+            self._trim(now)
+            total = len(self._events)
+            if self._state == CLOSED and total >= self.min_calls:
+                failures = sum(1 for _, ok in self._events if not ok)
+                if failures / total >= self.failure_rate:
+                    self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        log.warning("circuit %s opened", self.name)
+
+    def retry_after(self) -> int:
+        """Seconds until the breaker will admit a probe (0 when not open)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0
+            left = self.cooldown_seconds - (time.monotonic() - self._opened_at)
+            return max(1, int(left + 0.999))
+
+
+class ResilientCaller:
+    """Deadline + breaker + optional hedging around a blocking upstream call."""
+
+    def __init__(
+        self,
+        name: str,
+        timeout_seconds: float = 30.0,
+        breaker: CircuitBreaker | None = None,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+        max_workers: int = 8,
+    ):
+        self.name = name
+        self.timeout_seconds = timeout_seconds
+        self.breaker = breaker or CircuitBreaker(name)
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-call")
+        self._latencies: Deque[float] = deque(maxlen=200)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "hedged": 0,
+            "fallbacks": 0,
+        }
+
+    def _inc(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += n
+
+    def _p95(self) -> float | None:
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            samples = sorted(self._latencies)
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `fn(*args, **kwargs)` under the deadline and breaker; re-raises upstream errors."""
+        if not self.breaker.allow():
+            self._inc("rejected")
+            _notify(self.name, "rejected", 0.0)
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        self._inc("calls")
+        started = time.monotonic()
+        deadline = started + self.timeout_seconds
+        futures = [self._pool.submit(fn, *args, **kwargs)]
+
+        try:
+            hedge_after = self._p95() if self.hedge else None
+            if hedge_after is not None and hedge_after < self.timeout_seconds:
+                done, _ = wait(futures, timeout=hedge_after)
+                if not done:
+                    self._inc("hedged")
+                    futures.append(self._pool.submit(fn, *args, **kwargs))
+
+            result = self._first_result(futures, deadline)
+        except FutureTimeout:
+            self._inc("timeouts")
+            self._inc("failures")
+            self.breaker.record(False)
+            _notify(self.name, "timeout", time.monotonic() - started)
+            raise TimeoutError(f"{self.name} call exceeded {self.timeout_seconds:g}s deadline")
+        except Exception:
+            self._inc("failures")
+            self.breaker.record(False)
+            _notify(self.name, "error", time.monotonic() - started)
+            raise
+
+        self._succeeded(started)
+        return result
+
+    async def call_async(self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """`call()` for a coroutine function, awaited under the deadline and breaker."""
+        if not self.breaker.allow():
+            self._inc("rejected")
+            _notify(self.name, "rejected", 0.0)
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        self._inc("calls")
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(fn(*args, **kwargs), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self._inc("timeouts")
+            self._inc("failures")
+            self.breaker.record(False)
+            _notify(self.name, "timeout", time.monotonic() - started)
+            raise TimeoutError(f"{self.name} call exceeded {self.timeout_seconds:g}s deadline")
+        except Exception:
+            self._inc("failures")
+            self.breaker.record(False)
+            _notify(self.name, "error", time.monotonic() - started)
+            raise
+
+        self._succeeded(started)
+        return result
+
+    def _succeeded(self, started: float) -> None:
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._latencies.append(elapsed)
+        _notify(self.name, "ok", elapsed)
+        self._inc("successes")
+        self.breaker.record(True)
+
+    @staticmethod
+    def _first_result(futures, deadline: float) -> Any:
+        """Return the first successful result; raise the last error if every attempt failed."""
+        pending = set(futures)
+        last_exc: BaseException | None = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FutureTimeout()
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                raise FutureTimeout()
+            for f in done:
+                exc = f.exception()
+                if exc is None:
+                    return f.result()
+                last_exc = exc
+        raise last_exc  # type: ignore[misc]
+
+    def record_fallback(self) -> None:
+        self._inc("fallbacks")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        attempts = counters["calls"] + counters["rejected"]
+        return {
+            **counters,
+            "state": self.breaker.state,
+            "fallback_rate": round(counters["fallbacks"] / attempts, 4) if attempts else 0.0,
+            "p95_seconds": self._p95(),
+        }
+
+
+# -----------------------------
+# Shared callers (one per upstream, so every code path trips the same breaker)
+# -----------------------------
+_CALLERS: Dict[str, ResilientCaller] = {}
+_CALLERS_LOCK = threading.Lock()
+
+
+def get_caller(name: str = "gemini") -> ResilientCaller:
+    with _CALLERS_LOCK:
+        caller = _CALLERS.get(name)
+        if caller is None:
+            prefix = name.upper()
+            caller = ResilientCaller(
+                name,
+                timeout_seconds=float(os.getenv(f"{prefix}_TIMEOUT_SECONDS", "30")),
+                breaker=CircuitBreaker(
+                    name,
+                    failure_rate=float(os.getenv(f"{prefix}_BREAKER_FAILURE_RATE", "0.5")),
+                    min_calls=int(os.getenv(f"{prefix}_BREAKER_MIN_CALLS", "10")),
+                    window_seconds=float(os.getenv(f"{prefix}_BREAKER_WINDOW_SECONDS", "60")),
+                    cooldown_seconds=float(os.getenv(f"{prefix}_BREAKER_COOLDOWN_SECONDS", "30")),
+                ),
+                hedge=os.getenv(f"{prefix}_HEDGE", "0") == "1",
+            )
+            _CALLERS[name] = caller
+        return caller
+
+
+def snapshot_all() -> Dict[str, Dict[str, Any]]:
+    with _CALLERS_LOCK:
+        callers = list(_CALLERS.values())
+    return {c.name: c.snapshot() for c in callers}
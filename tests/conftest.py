@@ -0,0 +1,11 @@
+# tests/conftest.py
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+# module-level singletons read these at import; keep the tests off real services
+os.environ.setdefault("RATE_LIMIT_BACKEND", "memory")
+os.environ.setdefault("ADZUNA_APP_ID", "test")
+os.environ.setdefault("ADZUNA_APP_KEY", "test")
@@ -0,0 +1,96 @@
+# tests/test_app.py
+import sqlite3
+
+import pytest
+
+from backend import app
+from backend.job_dedup import DedupIndex
+
+
+def _job(n):
+    return {"title": f"Data Analyst {n}", "company": "Acme", "location": "Chicago",
+            "url": f"https://example.com/{n}", "description": f"Role number {n}"}
+
+
+def test_evicted_jobs_leave_the_repost_index(monkeypatch):
+    index = DedupIndex()
+    monkeypatch.setattr(app, "dedup_index", index)
+    monkeypatch.setattr(app.MEM["jobs"], "max_items", 2)
+    for n in range(5):
+        app._remember_job(_job(n), fp=f"fp{n}", sig=n)
+    assert len(app.MEM["jobs"]) == 2
+    assert index.snapshot()["fingerprints"] == 2
+    assert index.match("fp0", 0) is None
+
+
+class SqliteCursor:
+    """The dictionary cursor the list helpers expect, on an in-memory SQLite database."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def execute(self, sql, params=()):
+        self.rows = [dict(r) for r in self.conn.execute(sql.replace("%s", "?"), params)]
+
+    def fetchall(self):
+        return self.rows
+
+
+@pytest.fixture
+def saved_jobs(monkeypatch):
+    conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        """
+        CREATE TABLE jobs (job_id INTEGER PRIMARY KEY, title TEXT, company_name TEXT, location TEXT,
+                           industry TEXT, salary_range TEXT, url TEXT, source TEXT, description TEXT);
+        CREATE TABLE saved_jobs (saved_job_id INTEGER PRIMARY KEY, user_id INTEGER, job_id INTEGER,
+                                 date_saved TIMESTAMP, notes TEXT);
+        """
+    )
+    # ids 2-4 share a timestamp, so only the id keeps the page boundary stable
+    saved = [(1, "2026-01-01 09:00:00"), (2, "2026-01-02 09:00:00"), (3, "2026-01-02 09:00:00"),
+             (4, "2026-01-02 09:00:00"), (5, "2026-01-03 09:00:00")]
+    for sid, ts in saved:
+        conn.execute("INSERT INTO jobs (job_id, title) VALUES (?, ?)", (sid, f"Job {sid}"))
+        conn.execute("INSERT INTO saved_jobs VALUES (?, 1, ?, ?, NULL)", (sid, sid, ts))
+    conn.execute("INSERT INTO saved_jobs VALUES (99, 2, 1, '2026-01-04 09:00:00', NULL)")  # another user
+    monkeypatch.setattr(app, "get_db", lambda: (conn, SqliteCursor(conn)))
+    client = app.app.test_client()
+    client.environ_base["HTTP_AUTHORIZATION"] = "Bearer " + app.token_cache.issue(1)
+    return conn, client
+
+
+def test_saved_jobs_cursor_pages_through_tied_timestamps(saved_jobs):
+    _, client = saved_jobs
+    ids, cursor = [], None
+    while True:
+        query = "limit=2" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(f"/api/users/me/saved-jobs?{query}").get_json()
+        assert len(body["items"]) <= 2
+        ids += [item["saved_job_id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert ids == [5, 4, 3, 2, 1]
+    assert client.get("/api/users/me/saved-jobs?cursor=garbage").status_code == 400
+
+
+def test_saved_jobs_fields_projection(saved_jobs):
+    _, client = saved_jobs
+    rows = client.get("/api/users/me/saved-jobs?fields=title").get_json()
+    assert set(rows[0]) == {"date_saved", "saved_job_id", "title"}
+    assert [r["title"] for r in rows] == ["Job 5", "Job 4", "Job 3", "Job 2", "Job 1"]
+    assert client.get("/api/users/me/saved-jobs?fields=password").status_code == 400
+
+
+def test_unchanged_saved_jobs_answer_if_none_match_with_304(saved_jobs):
+    conn, client = saved_jobs
+    first = client.get("/api/users/me/saved-jobs")
+    etag = first.headers["ETag"]
+    again = client.get("/api/users/me/saved-jobs", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and not again.data
+    conn.execute("UPDATE saved_jobs SET notes = 'call back' WHERE saved_job_id = 3")
+    changed = client.get("/api/users/me/saved-jobs", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
@@ -0,0 +1,54 @@
+# tests/test_auth_tokens.py
+import base64
+import json
+
+from backend import auth_tokens
+from backend.auth_tokens import TokenCache
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def test_cached_claims_are_served_only_until_the_token_expires(monkeypatch):
+    cache = TokenCache("secret")
+    token = cache.issue(7, name="Ada", role="admin", days=1)
+    claims = cache.claims(token)
+    assert (claims["user_id"], claims["name"], claims["role"]) == (7, "Ada", "admin")
+    assert cache.claims(token) is claims
+    assert cache.snapshot()["hits"] == 1
+
+    monkeypatch.setattr(auth_tokens, "time", FakeClock(claims["exp"] + 1))
+    assert cache.claims(token) is None
+    snap = cache.snapshot()
+    assert (snap["expired"], snap["entries"]) == (1, 0)
+
+
+def test_cache_keeps_at_most_max_entries():
+    cache = TokenCache("secret", max_entries=2)
+    tokens = [cache.issue(uid) for uid in (1, 2, 3)]
+    for token in tokens:
+        cache.claims(token)
+    assert cache.snapshot()["entries"] == 2
+    assert cache.claims(tokens[0])["user_id"] == 1  # evicted, so verified again
+    assert cache.snapshot()["misses"] == 4
+
+
+def test_tampered_and_expired_tokens_are_rejected():
+    cache = TokenCache("secret")
+    token = cache.issue(7)
+    header, payload, signature = token.split(".")
+    claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    forged = base64.urlsafe_b64encode(json.dumps(dict(claims, user_id=8)).encode()).decode().rstrip("=")
+    assert cache.claims(".".join([header, forged, signature])) is None
+    assert cache.claims(TokenCache("other").issue(7)) is None
+    assert cache.claims("not-a-token") is None
+    assert cache.snapshot()["invalid"] == 3
+
+    assert cache.claims(cache.issue(7, days=-1)) is None
+    snap = cache.snapshot()
+    assert (snap["expired"], snap["entries"]) == (1, 0)
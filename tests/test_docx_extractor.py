@@ -0,0 +1,75 @@
+# tests/test_docx_extractor.py
+import io
+import zipfile
+
+import pytest
+
+from ml.docx_extractor import DocxError, Paragraph, extract, to_text
+
+_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+STYLES = f"""<?xml version="1.0"?>
+<w:styles {_NS}>
+  <w:style w:styleId="Title"><w:name w:val="Title"/></w:style>
+  <w:style w:styleId="Heading1"><w:name w:val="heading 1"/></w:style>
+  <w:style w:styleId="Heading2"><w:name w:val="heading 2"/></w:style>
+</w:styles>"""
+
+
+def _p(text, style=None, outline=None):
+    ppr = ""
+    if style or outline is not None:
+        ppr = "<w:pPr>" + (f'<w:pStyle w:val="{style}"/>' if style else "") + \
+              (f'<w:outlineLvl w:val="{outline}"/>' if outline is not None else "") + "</w:pPr>"
+    return f"<w:p>{ppr}<w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def make_docx(*paragraphs: str, styles: str | None = STYLES) -> io.BytesIO:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("word/document.xml", f'<?xml version="1.0"?><w:document {_NS}><w:body>'
+                   + "".join(paragraphs) + "</w:body></w:document>")
+        if styles is not None:
+            z.writestr("word/styles.xml", styles)
+    buf.seek(0)
+    return buf
+
+
+def test_paragraphs_come_with_style_names_and_heading_levels():
+    doc = make_docx(_p("Jane Doe", "Title"), _p("Experience", "Heading1"), _p("Acme", "Heading2"),
+                    _p("Built dashboards"), _p("Skills", outline=0))
+    assert extract(doc) == [
+        Paragraph("Jane Doe", "Title", 0),
+        Paragraph("Experience", "heading 1", 1),
+        Paragraph("Acme", "heading 2", 2),
+        Paragraph("Built dashboards", None, None),
+        Paragraph("Skills", None, 1),
+    ]
+
+
+def test_runs_tabs_and_breaks_are_joined_into_paragraph_text():
+    doc = make_docx('<w:p><w:r><w:t>SQL</w:t><w:tab/><w:t>Python</w:t><w:br/><w:t>R</w:t></w:r></w:p>')
+    assert extract(doc)[0].text == "SQL\tPython\nR"
+
+
+def test_style_ids_are_used_when_styles_xml_is_missing():
+    paragraphs = extract(make_docx(_p("Education", "Heading1"), _p("Note", "Custom"), styles=None))
+    assert paragraphs == [Paragraph("Education", "Heading1", 1), Paragraph("Note", "Custom", None)]
+
+
+def test_to_text_matches_mammoths_raw_text_layout():
+    assert to_text([Paragraph("a"), Paragraph("b")]) == "a\n\nb\n\n"
+
+
+@pytest.mark.parametrize("data", [b"not a zip", b"PK\x03\x04broken"])
+def test_unreadable_documents_raise_docx_error(data):
+    with pytest.raises(DocxError):
+        extract(io.BytesIO(data))
+
+
+def test_zip_without_a_document_raises_docx_error():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("xl/workbook.xml", "<x/>")
+    with pytest.raises(DocxError):
+        extract(buf)
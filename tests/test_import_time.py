@@ -0,0 +1,14 @@
+# tests/test_import_time.py
+from backend.benchmarks import import_time
+
+
+def test_backend_app_imports_within_budget_and_lazily():
+    # one cold import; the budget is the script's default, the lazy list its LAZY
+    median, _, _, failures = import_time.check("backend.app", runs=1, max_ms=500.0)
+    assert failures == [], f"{median:.0f} ms: {failures}"
+
+
+def test_catalog_io_does_not_import_the_app():
+    _, _, by_child, failures = import_time.check("backend.catalog_io", runs=1, max_ms=300.0)
+    assert failures == []
+    assert "backend.app" not in by_child
@@ -0,0 +1,61 @@
+# tests/test_job_dedup.py
+from backend.job_dedup import DedupIndex, closest, fingerprint, hamming, simhash
+
+DESCRIPTION = (
+    "We are hiring a data analyst to build dashboards in Tableau, write SQL against our warehouse "
+    "and work with product managers on experiments. Three years of experience with Python required."
+)
+
+
+def test_fingerprint_ignores_case_punctuation_and_company_suffix():
+    a = fingerprint("Data Analyst", "Acme, Inc.", "Chicago, IL")
+    b = fingerprint("data  analyst", "ACME", "chicago il")
+    assert a == b
+    assert a != fingerprint("Data Engineer", "Acme", "Chicago, IL")
+
+
+def test_simhash_is_close_for_reposts_and_far_for_other_jobs():
+    repost = DESCRIPTION + " Apply today."
+    other = "Senior nurse for the night shift in our emergency department, BLS certification required."
+    assert simhash(DESCRIPTION) == simhash(DESCRIPTION)
+    assert hamming(simhash(DESCRIPTION), simhash(repost)) <= 12
+    assert hamming(simhash(DESCRIPTION), simhash(other)) > 12
+
+
+def test_closest_picks_the_nearest_candidate_within_distance():
+    sig = simhash(DESCRIPTION)
+    candidates = [(1, sig ^ 0b111), (2, sig ^ 0b1), (3, None)]
+    assert closest(candidates, sig, max_distance=4) == 2
+    assert closest([(1, sig ^ 0xFFFF)], sig, max_distance=4) is None
+
+
+def test_index_matches_by_fingerprint_and_replaces_a_jobs_signature():
+    index = DedupIndex(max_distance=3)
+    fp, sig = fingerprint("Data Analyst", "Acme", "Chicago"), simhash(DESCRIPTION)
+    assert index.match(fp, sig) is None
+    index.add(fp, sig, 7)
+    assert index.match(fp, sig ^ 0b11) == 7
+    assert index.match(fingerprint("Other", "Acme", "Chicago"), sig) is None
+    index.add(fp, sig ^ 0xFFFF, 7)
+    assert index.match(fp, sig) is None
+
+
+def test_snapshot_reports_the_dedup_ratio():
+    index = DedupIndex()
+    index.record(seen=10, in_page=1, in_catalog=2)
+    snap = index.snapshot()
+    assert snap["dedup_ratio"] == 0.3
+    assert snap["seen"] == 10
+
+
+def test_discard_forgets_a_job_and_its_empty_fingerprint():
+    index = DedupIndex(max_distance=3)
+    fp, sig = fingerprint("Data Analyst", "Acme", "Chicago"), simhash(DESCRIPTION)
+    index.add(fp, sig, 7)
+    index.add(fp, sig ^ 0xFFFF, 8)
+    index.discard(7)
+    assert index.match(fp, sig) is None
+    assert index.snapshot()["fingerprints"] == 1
+    index.discard(8)
+    index.discard(9)  # unknown ids are ignored
+    assert index.snapshot()["fingerprints"] == 0
@@ -0,0 +1,62 @@
+# tests/test_memory_store.py
+import threading
+
+from backend.memory_store import BoundedCollection, MemoryStore
+
+
+def test_evicts_least_recently_used_by_count():
+    evicted = []
+    c = BoundedCollection("jobs", max_items=2, on_evict=lambda k, v: evicted.append(k))
+    c[1], c[2] = "a", "b"
+    c[1]  # use 1, so 2 is the oldest
+    c[3] = "c"
+    assert sorted(c) == [1, 3]
+    assert evicted == [2]
+    assert c.stats()["evictions"] == 1
+
+
+def test_evicts_by_approximate_bytes_but_keeps_the_new_record():
+    c = BoundedCollection("resumes", max_items=100, max_bytes=1000)
+    c["a"] = "x" * 600
+    c["b"] = "y" * 600
+    assert list(c) == ["b"]
+    c["big"] = "z" * 5000
+    assert list(c) == ["big"]
+
+
+def test_replacing_a_record_updates_its_size():
+    c = BoundedCollection("resumes", max_bytes=10_000)
+    c["a"] = "x" * 5000
+    c["a"] = "short"
+    assert c.stats()["approx_bytes"] < 100
+    del c["a"]
+    assert c.stats()["approx_bytes"] == 0 and "a" not in c
+
+
+def test_next_id_is_unique_across_threads():
+    store = MemoryStore({})
+    ids = []
+    threads = [threading.Thread(target=lambda: ids.extend(store.next_id("job") for _ in range(200)))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(ids) == list(range(1, 801))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "mem.json")
+    store = MemoryStore({"jobs": (10, 1 << 20), "job_keys": (10, 1 << 20)}, {"recs": 5})
+    store["jobs"][store.next_id("job")] = {"title": "Data Analyst"}
+    store["job_keys"][("Data Analyst", "Acme")] = 1
+    store.append("recs", {"job_id": 1})
+    store.save(path)
+
+    loaded = MemoryStore({"jobs": (10, 1 << 20), "job_keys": (10, 1 << 20)}, {"recs": 5})
+    assert loaded.load(path)
+    assert loaded["jobs"][1] == {"title": "Data Analyst"}
+    assert loaded["job_keys"][("Data Analyst", "Acme")] == 1
+    assert list(loaded.logs["recs"]) == [{"job_id": 1}]
+    assert loaded.next_id("job") == 2
+    assert not loaded.load(str(tmp_path / "missing.json"))
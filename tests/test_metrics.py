@@ -0,0 +1,74 @@
+# tests/test_metrics.py
+import threading
+
+from backend import metrics
+
+
+def _sample(name, labels=()):
+    return metrics.collect().get((name, tuple(labels)))
+
+
+def test_counters_sum_across_threads_including_finished_ones():
+    counter = metrics.Counter("test_threads_total", "test", ("kind",))
+    threads = [threading.Thread(target=lambda: [counter.inc("a") for _ in range(100)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    counter.inc("a", n=5)
+    assert _sample("test_threads_total", ("a",)) == 405
+    # the dead threads' shards were folded into the retired totals
+    assert _sample("test_threads_total", ("a",)) == 405
+
+
+def test_gauge_goes_down():
+    gauge = metrics.Gauge("test_gauge", "test")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert _sample("test_gauge") == 1
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    hist = metrics.Histogram("test_latency_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(v, "/api/x")
+    text = metrics.render()
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{route="/api/x",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/api/x",le="1.0"} 3' in text
+    assert 'test_latency_seconds_bucket{route="/api/x",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_sum{route="/api/x"} 4.05' in text
+    assert 'test_latency_seconds_count{route="/api/x"} 4' in text
+
+
+def test_label_values_are_escaped():
+    counter = metrics.Counter("test_escape_total", "test", ("path",))
+    counter.inc('a"b\\c\nd')
+    assert 'test_escape_total{path="a\\"b\\\\c\\nd"} 1' in metrics.render()
+
+
+def test_callbacks_are_read_at_scrape_time_and_failures_are_contained():
+    values = {("adzuna",): 0.5}
+    metrics.register_callback("test_ratio", "gauge", "test", ("cache",), lambda: values)
+    metrics.register_callback("test_broken", "gauge", "test", (), lambda: 1 / 0)
+    values[("adzuna",)] = 0.75
+    text = metrics.render()
+    assert 'test_ratio{cache="adzuna"} 0.75' in text
+    assert "# test_broken unavailable: division by zero" in text
+
+
+def test_timed_cursor_records_query_time_by_statement_type():
+    class Cursor:
+        def execute(self, sql, args=None):
+            return "done"
+
+        def fetchall(self):
+            return [1]
+
+    before = _sample(metrics.DB_QUERY_SECONDS.name, ("SELECT",))
+    cursor = metrics.TimedCursor(Cursor())
+    assert cursor.execute(" select 1") == "done"
+    assert cursor.fetchall() == [1]
+    after = _sample(metrics.DB_QUERY_SECONDS.name, ("SELECT",))
+    assert sum(after[:-1]) == (sum(before[:-1]) if before else 0) + 1
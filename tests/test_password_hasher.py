@@ -0,0 +1,79 @@
+# tests/test_password_hasher.py
+import threading
+import time
+
+import pytest
+
+from backend.password_hasher import PasswordHasher, PoolSaturated
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def _occupy(hasher, release, n):
+    """Start `n` calls that block until `release` is set."""
+    def call():
+        try:
+            hasher._run(release.wait)
+        except PoolSaturated:  # the caller gave up; the worker still holds the slot
+            pass
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    _wait_for(lambda: hasher.snapshot()["pending"] == n)
+    return threads
+
+
+def test_full_queue_is_shed_with_a_retry_after():
+    hasher = PasswordHasher(rounds=4, workers=1, max_queue=1)
+    release = threading.Event()
+    threads = _occupy(hasher, release, 2)  # one running, one queued
+    try:
+        with pytest.raises(PoolSaturated) as exc:
+            hasher._run(lambda: "never")
+        assert exc.value.retry_after > 0
+        assert hasher.snapshot()["shed"] == 1
+    finally:
+        release.set()
+        for t in threads:
+            t.join()
+    assert hasher.snapshot()["pending"] == 0
+
+
+def test_a_queued_call_that_times_out_is_cancelled_and_frees_its_slot():
+    hasher = PasswordHasher(rounds=4, workers=1, max_queue=1, timeout_seconds=0.05)
+    release = threading.Event()
+    threads = _occupy(hasher, release, 1)
+    ran = []
+    try:
+        with pytest.raises(PoolSaturated):
+            hasher._run(lambda: ran.append(1))
+        assert hasher.snapshot()["pending"] == 1
+    finally:
+        release.set()
+        for t in threads:
+            t.join()
+    _wait_for(lambda: hasher.snapshot()["pending"] == 0)
+    assert ran == []
+
+
+def test_zero_workers_hash_inline():
+    hasher = PasswordHasher(rounds=4, workers=0)
+    assert hasher._run(threading.get_ident) == threading.get_ident()
+    stored = hasher.hash("s3cret")
+    assert hasher.verify("s3cret", stored)
+    assert not hasher.verify("wrong", stored)
+
+
+def test_needs_rehash_for_another_cost_or_a_malformed_hash():
+    stored = PasswordHasher(rounds=4, workers=0).hash("s3cret")
+    assert stored.startswith("$2b$04$")
+    assert not PasswordHasher(rounds=4, workers=0).needs_rehash(stored)
+    assert PasswordHasher(rounds=5, workers=0).needs_rehash(stored)
+    assert PasswordHasher(rounds=4, workers=0).needs_rehash("plaintext")
+    assert PasswordHasher(rounds=4, workers=0).needs_rehash("$2b$xx$abc")
@@ -0,0 +1,55 @@
+# tests/test_pre_llm_filter_functions.py
+from ml.docx_extractor import Paragraph
+from ml.pre_llm_filter_functions import ParsingFunctionsPreLLM
+
+
+def _sections(*paragraphs):
+    return ParsingFunctionsPreLLM(None).define_sections_from_paragraphs(list(paragraphs))
+
+
+def test_sections_come_from_the_top_heading_level():
+    sections = _sections(
+        Paragraph("Jane Doe", "Title", 0),
+        Paragraph("Experience", "heading 1", 1),
+        Paragraph("Data Analyst, Acme", "heading 2", 2),
+        Paragraph("Built dashboards."),
+        Paragraph("Education", "heading 1", 1),
+        Paragraph("BS Statistics"),
+    )
+    assert sections == {"experience": "Data Analyst, Acme\n\nBuilt dashboards.", "education": "BS Statistics"}
+
+
+def test_name_styled_heading_1_above_heading_2_sections():
+    # regression: the smallest level (the name) used to be the only boundary, losing every section
+    sections = _sections(
+        Paragraph("Jane Doe", "heading 1", 1),
+        Paragraph("jane@example.com"),
+        Paragraph("Work Experience", "heading 2", 2),
+        Paragraph("Data Analyst, Acme", "heading 3", 3),
+        Paragraph("Built dashboards."),
+        Paragraph("Skills", "heading 2", 2),
+        Paragraph("SQL, Python"),
+    )
+    assert sections == {"experience": "Data Analyst, Acme\n\nBuilt dashboards.", "skills": "SQL, Python"}
+
+
+def test_a_lone_top_heading_is_skipped_when_no_header_is_known():
+    sections = _sections(
+        Paragraph("Jane Doe", "heading 1", 1),
+        Paragraph("Summary", "heading 2", 2),
+        Paragraph("Analyst."),
+        Paragraph("Publications", "heading 2", 2),
+        Paragraph("Paper."),
+    )
+    assert sections == {"summary": "Analyst.", "publications": "Paper."}
+
+
+def test_unstyled_documents_use_known_header_paragraphs():
+    sections = _sections(
+        Paragraph("Jane Doe"),
+        Paragraph("SKILLS:"),
+        Paragraph("SQL"),
+        Paragraph("Education"),
+        Paragraph("BS Statistics"),
+    )
+    assert sections == {"skills": "SQL", "education": "BS Statistics"}
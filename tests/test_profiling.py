@@ -0,0 +1,74 @@
+# tests/test_profiling.py
+import glob
+import json
+import os
+import threading
+import time
+
+from backend.profiling import Profiler, summarize
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profile_is_written_as_collapsed_stacks_and_speedscope(tmp_path):
+    profiler = Profiler(str(tmp_path), interval_ms=1)
+    session = profiler.start("GET /api/jobs")
+    _busy(0.1)
+    name = profiler.stop(session)
+
+    assert name and "GET_api_jobs" in name
+    collapsed = tmp_path / f"{name}.collapsed"
+    lines = collapsed.read_text().splitlines()
+    assert any("_busy" in line for line in lines)
+    doc = json.loads((tmp_path / f"{name}.speedscope.json").read_text())
+    profile = doc["profiles"][0]
+    assert len(profile["samples"]) == len(profile["weights"]) == len(lines)
+    assert profile["endValue"] > 0
+
+    self_samples, total_samples, samples = summarize([str(collapsed)])
+    assert samples == sum(int(line.rsplit(" ", 1)[1]) for line in lines)
+    assert any(label.startswith("_busy") for label in total_samples)
+
+
+def test_only_the_profiled_thread_is_sampled(tmp_path):
+    profiler = Profiler(str(tmp_path), interval_ms=1)
+    stop = threading.Event()
+
+    def other_request():
+        while not stop.is_set():
+            _busy(0.001)
+
+    other = threading.Thread(target=other_request)
+    other.start()
+    session = profiler.start("GET /api/health")
+    time.sleep(0.05)
+    name = profiler.stop(session)
+    stop.set()
+    other.join()
+    assert "other_request" not in (tmp_path / f"{name}.collapsed").read_text()
+
+
+def test_sessions_beyond_max_concurrent_are_skipped(tmp_path):
+    profiler = Profiler(str(tmp_path), interval_ms=1, max_concurrent=1)
+    first = profiler.start("a")
+    assert profiler.start("b") is None
+    profiler.stop(first)
+    assert profiler.snapshot()["skipped_busy"] == 1
+    assert profiler.stop(first) is None  # stopping twice writes nothing
+
+
+def test_oldest_profiles_beyond_max_files_are_deleted(tmp_path):
+    profiler = Profiler(str(tmp_path), interval_ms=1, max_files=2)
+    for i in range(3):
+        session = profiler.start(f"req{i}")
+        _busy(0.02)
+        profiler.stop(session)
+        time.sleep(0.01)  # distinct mtimes
+    remaining = sorted(os.path.basename(p) for p in glob.glob(str(tmp_path / "*.collapsed")))
+    assert len(remaining) == 2
+    assert not any("req0" in p for p in remaining)
+    assert len(glob.glob(str(tmp_path / "*.speedscope.json"))) == 2
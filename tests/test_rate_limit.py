@@ -0,0 +1,71 @@
+# tests/test_rate_limit.py
+import os
+import time
+
+from backend.rate_limit import MemoryBackend, RateLimiter, SqliteBackend
+
+
+def _limiter(backend=None):
+    limiter = RateLimiter(backend or MemoryBackend(), max_wait_seconds=0)
+    limiter.configure("adzuna", user_per_min=2, global_per_min=3)
+    return limiter
+
+
+def test_per_client_bucket_then_global_bucket():
+    limiter = _limiter()
+    assert limiter.check("adzuna", "user:1") == (True, 0.0)
+    assert limiter.check("adzuna", "user:1") == (True, 0.0)
+    admitted, retry_after = limiter.check("adzuna", "user:1")
+    assert not admitted and retry_after > 0
+    # another client has its own bucket, but the global one has a single token left
+    assert limiter.check("adzuna", "user:2")[0]
+    assert not limiter.check("adzuna", "user:3")[0]
+    assert limiter.snapshot()["adzuna"] == {"allowed": 3, "queued": 0, "rejected_user": 1, "rejected_global": 1}
+
+
+def test_global_rejection_refunds_the_client_token():
+    limiter = RateLimiter(MemoryBackend(), max_wait_seconds=0)
+    limiter.configure("adzuna", user_per_min=2, global_per_min=1)
+    assert limiter.check("adzuna", "user:1")[0]
+    for _ in range(3):
+        assert not limiter.check("adzuna", "user:2")[0]
+    # user:2 still has its whole bucket once the global quota allows it
+    assert limiter.backend.take("adzuna:user:2", capacity=2, rate=2 / 60, cost=2) == 0.0
+    assert limiter.snapshot()["adzuna"]["rejected_global"] == 3
+
+
+def test_refunds_never_overfill_a_bucket(tmp_path):
+    for backend in (MemoryBackend(), SqliteBackend(str(tmp_path / "buckets.db"))):
+        assert backend.take("k", capacity=2, rate=1.0, cost=-1) == 0.0
+        assert backend.take("k", capacity=2, rate=1.0, cost=3) > 0
+
+
+def test_unconfigured_upstreams_and_disabled_limiter_admit_everything():
+    limiter = _limiter()
+    assert limiter.check("other", "ip:1.2.3.4") == (True, 0.0)
+    limiter.enabled = False
+    for _ in range(10):
+        assert limiter.check("adzuna", "user:1")[0]
+
+
+def test_short_waits_are_queued_instead_of_rejected():
+    limiter = RateLimiter(MemoryBackend(), max_wait_seconds=1.0)
+    limiter.configure("gemini", user_per_min=600, global_per_min=6000)  # a token every 0.1 s
+    limiter.backend._buckets["gemini:user:1"] = (0.0, time.time())
+    assert limiter.check("gemini", "user:1")[0]
+    assert limiter.snapshot()["gemini"]["queued"] == 1
+
+
+def test_sqlite_backend_is_shared_by_every_instance_on_the_file(tmp_path):
+    path = str(tmp_path / "buckets.db")
+    first, second = SqliteBackend(path), SqliteBackend(path)
+    assert first.take("k", capacity=2, rate=0.01) == 0.0
+    assert second.take("k", capacity=2, rate=0.01) == 0.0
+    assert first.take("k", capacity=2, rate=0.01) > 0
+
+
+def test_sqlite_backend_reconnects_after_fork(tmp_path):
+    backend = SqliteBackend(str(tmp_path / "buckets.db"))
+    conn = backend._conn()
+    backend._local.pid = os.getpid() + 1  # as seen from a forked child
+    assert backend._conn() is not conn
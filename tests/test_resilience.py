@@ -0,0 +1,120 @@
+# tests/test_resilience.py
+import threading
+
+import pytest
+
+from ml import resilience
+from ml.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, ResilientCaller
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, "time", clock)
+    return clock
+
+
+def test_breaker_opens_on_error_rate_then_probes_and_closes(clock):
+    breaker = CircuitBreaker("up", failure_rate=0.5, min_calls=4, window_seconds=60, cooldown_seconds=30)
+    for ok in (True, False, True):
+        breaker.record(ok)
+    assert breaker.state == CLOSED  # below min_calls
+    breaker.record(False)
+    assert breaker.state == OPEN and not breaker.allow()
+    assert breaker.retry_after() == 30
+
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+    breaker.record(True)
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_failed_probe_reopens_and_old_errors_leave_the_window(clock):
+    breaker = CircuitBreaker("up", failure_rate=0.5, min_calls=2, window_seconds=10, cooldown_seconds=5)
+    breaker.record(False)
+    clock.now += 11
+    breaker.record(False)
+    assert breaker.state == CLOSED  # the first failure aged out
+    breaker.record(False)
+    assert breaker.state == OPEN
+
+    clock.now += 5
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == OPEN and breaker.retry_after() == 5
+
+
+def test_open_breaker_rejects_without_calling(clock):
+    breaker = CircuitBreaker("up", min_calls=1)
+    caller = ResilientCaller("up", breaker=breaker, max_workers=1)
+
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        caller.call(boom)
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        caller.call(calls.append, 1)
+    assert calls == []
+    snap = caller.snapshot()
+    assert (snap["failures"], snap["rejected"], snap["state"]) == (1, 1, OPEN)
+
+
+def test_deadline_raises_timeout_and_counts_a_failure():
+    release = threading.Event()
+    caller = ResilientCaller("slow", timeout_seconds=0.05, max_workers=1)
+    try:
+        with pytest.raises(TimeoutError):
+            caller.call(release.wait)
+    finally:
+        release.set()
+    snap = caller.snapshot()
+    assert (snap["timeouts"], snap["failures"], snap["successes"]) == (1, 1, 0)
+
+
+def test_hedges_once_the_first_attempt_outlives_the_p95():
+    caller = ResilientCaller("hedged", timeout_seconds=5, hedge=True, hedge_min_samples=3, max_workers=2)
+    for _ in range(3):
+        assert caller.call(lambda: "fast") == "fast"
+
+    release = threading.Event()
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        if len(attempts) == 1:
+            release.wait(5)  # the first attempt hangs
+            return "slow"
+        return "hedge"
+
+    try:
+        assert caller.call(fn) == "hedge"
+    finally:
+        release.set()
+    assert caller.snapshot()["hedged"] == 1
+
+
+def test_get_caller_reads_the_upstream_env(monkeypatch):
+    monkeypatch.setattr(resilience, "_CALLERS", {})
+    monkeypatch.setenv("TESTUP_TIMEOUT_SECONDS", "2.5")
+    monkeypatch.setenv("TESTUP_BREAKER_FAILURE_RATE", "0.25")
+    monkeypatch.setenv("TESTUP_BREAKER_MIN_CALLS", "3")
+    monkeypatch.setenv("TESTUP_BREAKER_COOLDOWN_SECONDS", "7")
+    monkeypatch.setenv("TESTUP_HEDGE", "1")
+    caller = resilience.get_caller("testup")
+    assert resilience.get_caller("testup") is caller
+    assert (caller.timeout_seconds, caller.hedge) == (2.5, True)
+    b = caller.breaker
+    assert (b.failure_rate, b.min_calls, b.window_seconds, b.cooldown_seconds) == (0.25, 3, 60.0, 7.0)
+    assert not resilience.get_caller("other").hedge
@@ -0,0 +1,90 @@
+# tests/test_search_cache.py
+import threading
+import time
+
+import pytest
+
+from backend import search_cache as search_cache_module
+from backend.search_cache import SearchCache, parse_class_ttls, query_class, search_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(search_cache_module, "time", clock)
+    return clock
+
+
+def _wait_idle(cache, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while cache.snapshot()["revalidating"]:
+        assert time.monotonic() < deadline, "revalidation did not finish"
+        time.sleep(0.005)
+
+
+def test_entries_are_fresh_then_stale_then_gone(clock):
+    cache = SearchCache(soft_ttl_seconds=10, hard_ttl_seconds=30)
+    cache.put("k", {"results": [1]})
+    assert cache.get("k") == ({"results": [1]}, 0.0, False)
+    clock.now += 10
+    assert cache.get("k") == ({"results": [1]}, 10.0, True)
+    clock.now += 20
+    assert cache.get("k") is None
+    snap = cache.snapshot()
+    assert (snap["hits"], snap["stale_hits"], snap["misses"], snap["entries"]) == (1, 1, 1, 0)
+
+
+def test_query_classes_have_their_own_ttls(clock):
+    cache = SearchCache(soft_ttl_seconds=10, hard_ttl_seconds=30, class_ttls=parse_class_ttls("paged=1:2"))
+    cache.put("plain", {}, "plain")
+    cache.put("paged", {}, "paged")
+    clock.now += 2
+    assert cache.get("plain")[2] is False
+    assert cache.get("paged") is None
+    assert query_class(page=2) == "paged"
+    assert query_class(job_type="Full-time") == "filtered"
+    assert query_class() == "plain"
+    assert search_key(" Data  Analyst ", "NYC") == search_key("data analyst", "nyc")
+
+
+def test_revalidation_runs_once_per_key():
+    cache = SearchCache()
+    cache.put("k", {"v": 1})
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return {"v": 2}
+
+    assert cache.revalidate("k", fetch)
+    assert not cache.revalidate("k", fetch)  # already refreshing
+    assert cache.revalidate("other", lambda: {"v": 3})
+    release.set()
+    _wait_idle(cache)
+    assert len(calls) == 1
+    assert cache.get("k")[0] == {"v": 2}
+    assert cache.revalidate("k", fetch)  # the next refresh may start again
+    _wait_idle(cache)
+
+
+def test_failed_revalidation_keeps_the_stale_entry():
+    cache = SearchCache()
+    cache.put("k", {"v": 1})
+
+    def fetch():
+        raise RuntimeError("provider down")
+
+    assert cache.revalidate("k", fetch)
+    _wait_idle(cache)
+    assert cache.get("k")[0] == {"v": 1}
+    assert cache.snapshot()["revalidation_failures"] == 1
@@ -0,0 +1,87 @@
+# tests/test_singleflight.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.singleflight import AsyncSingleFlight, SingleFlight, make_key
+
+
+def _run_concurrently(n, target):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    calls, results = [], []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        return "page"
+
+    _run_concurrently(5, lambda: results.append(flight.do("k", fn, timeout=5)))
+    assert results == ["page"] * 5
+    assert len(calls) == 1
+    assert flight.snapshot() == {"leaders": 1, "shared": 4, "follower_timeouts": 0, "in_flight": 0}
+
+
+def test_followers_get_the_leaders_exception():
+    flight = SingleFlight("test")
+    errors = []
+
+    def fn():
+        time.sleep(0.1)
+        raise RuntimeError("upstream down")
+
+    def call():
+        try:
+            flight.do("k", fn, timeout=5)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    _run_concurrently(3, call)
+    assert errors == ["upstream down"] * 3
+
+
+def test_nothing_is_cached_after_the_call():
+    flight = SingleFlight("test")
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+
+
+def test_follower_timeout():
+    flight = SingleFlight("test")
+    leader = threading.Thread(target=flight.do, args=("k", lambda: time.sleep(0.3)))
+    leader.start()
+    time.sleep(0.05)
+    with pytest.raises(TimeoutError):
+        flight.do("k", lambda: None, timeout=0.01)
+    leader.join()
+    assert flight.snapshot()["follower_timeouts"] == 1
+
+
+def test_async_calls_share_one_execution():
+    flight = AsyncSingleFlight("test")
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "page"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", fn, timeout=5) for _ in range(4)))
+
+    assert asyncio.run(main()) == ["page"] * 4
+    assert len(calls) == 1
+
+
+def test_make_key_ignores_dict_order():
+    assert make_key("u", {"a": 1, "b": 2}) == make_key("u", {"b": 2, "a": 1})
+    assert make_key("u", {"a": 1}) != make_key("u", {"a": 2})
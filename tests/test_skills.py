@@ -0,0 +1,64 @@
+# tests/test_skills.py
+import json
+
+from backend.skills import SkillExtractor, json_list, skill_extractor, skill_label, skill_match, term_vector
+
+
+def test_extract_matches_whole_words_in_order_of_appearance():
+    e = SkillExtractor(["r", "sql", "power bi", "python"])
+    assert e.extract("Strong SQL and Python; R for stats") == ["sql", "python", "r"]
+    # "r" inside words and "sql" inside "mysql" are not skills of their own
+    assert e.extract("Our remote team uses mysqlx") == []
+    assert e.extract("Power\nBI dashboards") == ["power bi"]
+
+
+def test_taxonomy_aliases_map_to_the_canonical_skill():
+    e = SkillExtractor(["sql"], {"sql": ["sql", "postgresql"], "power bi": ["power bi", "powerbi"]})
+    assert e.extract("PostgreSQL and PowerBI") == ["sql", "power bi"]
+    assert e.skills == {"sql", "power bi"}
+
+
+def test_ambiguous_words_only_match_their_qualified_forms():
+    text = "Let us go rest and spark joy at the node; the rest is history."
+    assert skill_extractor.extract(text) == []
+    assert skill_extractor.extract("Golang, REST APIs, PySpark and Node.js") == ["go", "rest", "spark", "node"]
+
+
+def test_canonical_maps_typed_skill_names():
+    assert skill_extractor.canonical("PowerBI") == "power bi"
+    assert skill_extractor.canonical("Python3") == "python"
+    assert skill_extractor.canonical("Go") == "go"
+    assert skill_extractor.canonical("basket weaving") is None
+
+
+def test_skill_match_scores_matches_and_lists_gaps():
+    score, matched, gaps = skill_match(["python", "sql", "tableau"], {"python", "sql"})
+    assert (score, matched, gaps) == (74, ["python", "sql"], ["tableau"])
+    assert skill_match([], set())[0] == 60
+    assert skill_match(["a"] * 10, {"a"})[0] == 99
+
+
+def test_json_list_reads_columns_from_either_driver():
+    assert json_list(json.dumps(["sql"])) == ["sql"]
+    assert json_list(b'["sql"]') == ["sql"]
+    assert json_list(["sql"]) == ["sql"]
+    assert json_list(None) is None
+    assert json_list("not json") is None
+
+
+def test_skill_label_and_term_vector():
+    assert [skill_label(s) for s in ("sql", "r", "power bi")] == ["SQL", "R", "Power Bi"]
+    vec = term_vector("python python sql and the team")
+    assert set(vec) == {"python", "sql"}
+    assert abs(sum(v * v for v in vec.values()) - 1.0) < 1e-3
+
+
+def test_plain_prose_does_not_read_as_skills():
+    text = (
+        "Drivers must react quickly, excel at customer service, and load shipping containers. "
+        "Forecast demand; SAP not needed. Must have a valid r licence."
+    )
+    assert skill_extractor.extract(text) == []
+    assert skill_extractor.extract("ReactJS, MS Excel, Docker, demand forecasting, RStudio and SAP ERP") == [
+        "react", "excel", "docker", "forecast", "r", "sap",
+    ]
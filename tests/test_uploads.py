@@ -0,0 +1,96 @@
+# tests/test_uploads.py
+import codecs
+import hashlib
+import io
+import zipfile
+
+import pytest
+
+from backend.uploads import DOCX, OCTET, PDF, TEXT, SpooledUpload, UploadRejected, resolve_type, sniff
+
+ALLOWED = (PDF, DOCX, TEXT)
+
+
+def _zip(names):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        for name in names:
+            z.writestr(name, "<xml/>")
+    return buf.getvalue()
+
+
+def _upload(data: bytes, max_memory: int = 1 << 20) -> SpooledUpload:
+    upload = SpooledUpload(max_memory=max_memory)
+    for i in range(0, len(data), 1000):
+        upload.write(data[i:i + 1000])
+    return upload
+
+
+def test_sniff_recognizes_pdf_docx_and_text():
+    assert sniff(b"%PDF-1.7\n...") == PDF
+    docx = _zip(["[Content_Types].xml", "word/document.xml"])
+    assert sniff(docx[:16], io.BytesIO(docx)) == DOCX
+    assert sniff("Jane Doe — Data Analyst\n".encode("utf-8")) == TEXT
+
+
+def test_sniff_rejects_other_zips_and_binary():
+    other = _zip(["xl/workbook.xml"])
+    assert sniff(other[:16], io.BytesIO(other)) == OCTET
+    assert sniff(b"PK\x03\x04 truncated", io.BytesIO(b"PK\x03\x04 truncated")) == OCTET
+    assert sniff(b"\x7fELF\x02\x01\x00\x00") == OCTET
+
+
+def test_sniff_accepts_a_character_cut_at_the_end_of_the_sample():
+    head = "résumé ".encode("utf-8") * 10 + "é".encode("utf-8")[:1]
+    assert sniff(head) == TEXT
+
+
+def test_resolve_type_trusts_bytes_over_generic_declarations():
+    upload = _upload(b"%PDF-1.4 resume")
+    assert resolve_type("application/octet-stream", upload, ALLOWED) == PDF
+    assert resolve_type("application/pdf; charset=binary", upload, ALLOWED) == PDF
+    with pytest.raises(UploadRejected):
+        resolve_type(DOCX, upload, ALLOWED)
+    with pytest.raises(UploadRejected):
+        resolve_type(None, _upload(b"\x00\x01\x02"), ALLOWED)
+    with pytest.raises(UploadRejected):
+        resolve_type(None, upload, (DOCX,))
+
+
+def test_spooled_upload_spills_to_disk_and_hashes_as_it_goes():
+    data = b"0123456789" * 500
+    upload = _upload(data, max_memory=1024)
+    assert upload.spilled and upload.size == len(data)
+    assert upload.sha256 == hashlib.sha256(data).hexdigest()
+    assert upload.open().read() == data
+    assert upload.text() == data.decode()
+
+
+def test_from_stream_copies_a_buffered_file():
+    upload = SpooledUpload.from_stream(io.BytesIO(b"plain text resume"))
+    assert upload.sniffed == TEXT
+    assert upload.text() == "plain text resume"
+
+
+def test_legacy_and_utf16_text_files_are_text():
+    cp1252 = "Jos\xe9 \x96 r\xe9sum\xe9 \x93quoted\x94\r\n".encode("latin-1")
+    assert sniff(cp1252) == TEXT
+    assert _upload(cp1252).text() == "José – résumé “quoted”\n"
+    utf16 = "Jane Doe\nSQL".encode("utf-16")
+    assert sniff(utf16) == TEXT
+    assert resolve_type("text/plain", _upload(utf16), ALLOWED) == TEXT
+    assert _upload(utf16).text() == "Jane Doe\nSQL"
+    assert _upload(codecs.BOM_UTF8 + b"Jane").text() == "Jane"
+
+
+def test_8bit_bytes_with_control_characters_are_binary():
+    assert sniff(b"\xff\xd8\xff\xe0\x01\x02JFIF") == OCTET
+
+
+def test_type_mismatch_only_for_pdf_docx_text_contradictions():
+    text = _upload(b"Jane Doe, data analyst")
+    assert resolve_type("text/markdown", text, ALLOWED) == TEXT
+    with pytest.raises(UploadRejected):
+        resolve_type(PDF, text, ALLOWED)
+    with pytest.raises(UploadRejected):
+        resolve_type("text/plain", _upload(b"%PDF-1.4 resume"), ALLOWED)